@@ -8,6 +8,7 @@ import sys
 # Add parent directory to path
 sys.path.insert(0, os.path.realpath(os.path.join(os.path.dirname(__file__), '..')))
 
+from app.config import settings
 from app.database import Base
 from app.models import *  # Import all models
 
@@ -15,6 +16,9 @@ from app.models import *  # Import all models
 # access to the values within the .ini file in use.
 config = context.config
 
+# Migrate the database the app is configured for (DATABASE_URL / .env) rather than the alembic.ini default
+config.set_main_option("sqlalchemy.url", settings.DATABASE_URL.replace("%", "%%"))
+
 # Interpret the config file for Python logging.
 # This line sets up loggers basically.
 if config.config_file_name is not None:
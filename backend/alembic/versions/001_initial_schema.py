@@ -7,6 +7,7 @@ Create Date: 2024-01-01 00:00:00.000000
 """
 from alembic import op
 import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
 
 
 # revision identifiers, used by Alembic.
@@ -17,7 +18,7 @@ depends_on = None
 
 
 def upgrade() -> None:
-    # Create enum types
+    # Create enum types (the columns below reference them with create_type=False)
     op.execute("CREATE TYPE userrole AS ENUM ('admin', 'client')")
     op.execute("CREATE TYPE projectstatus AS ENUM ('active', 'completed', 'on_hold', 'cancelled')")
     op.execute("CREATE TYPE bookingstatus AS ENUM ('pending', 'confirmed', 'cancelled', 'completed')")
@@ -31,7 +32,7 @@ def upgrade() -> None:
         sa.Column('email', sa.String(), nullable=False),
         sa.Column('hashed_password', sa.String(), nullable=False),
         sa.Column('full_name', sa.String(), nullable=False),
-        sa.Column('role', sa.Enum('admin', 'client', name='userrole'), nullable=False),
+        sa.Column('role', postgresql.ENUM('admin', 'client', name='userrole', create_type=False), nullable=False),
         sa.Column('is_active', sa.Boolean(), nullable=True, server_default='true'),
         sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=True),
         sa.Column('updated_at', sa.DateTime(timezone=True), nullable=True),
@@ -46,7 +47,7 @@ def upgrade() -> None:
         sa.Column('id', sa.Integer(), nullable=False),
         sa.Column('name', sa.String(), nullable=False),
         sa.Column('description', sa.Text(), nullable=True),
-        sa.Column('status', sa.Enum('active', 'completed', 'on_hold', 'cancelled', name='projectstatus'), nullable=False),
+        sa.Column('status', postgresql.ENUM('active', 'completed', 'on_hold', 'cancelled', name='projectstatus', create_type=False), nullable=False),
         sa.Column('start_date', sa.DateTime(timezone=True), nullable=True),
         sa.Column('end_date', sa.DateTime(timezone=True), nullable=True),
         sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=True),
@@ -105,7 +106,7 @@ def upgrade() -> None:
         sa.Column('description', sa.String(), nullable=True),
         sa.Column('start_time', sa.DateTime(timezone=True), nullable=False),
         sa.Column('end_time', sa.DateTime(timezone=True), nullable=False),
-        sa.Column('status', sa.Enum('pending', 'confirmed', 'cancelled', 'completed', name='bookingstatus'), nullable=False),
+        sa.Column('status', postgresql.ENUM('pending', 'confirmed', 'cancelled', 'completed', name='bookingstatus', create_type=False), nullable=False),
         sa.Column('google_event_id', sa.String(), nullable=True),
         sa.Column('meeting_link', sa.String(), nullable=True),
         sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=True),
@@ -142,8 +143,8 @@ def upgrade() -> None:
         sa.Column('project_id', sa.Integer(), nullable=False),
         sa.Column('title', sa.String(), nullable=False),
         sa.Column('description', sa.Text(), nullable=False),
-        sa.Column('type', sa.Enum('improvement', 'revision', 'bug', 'question', name='requesttype'), nullable=False),
-        sa.Column('status', sa.Enum('open', 'in_progress', 'completed', 'cancelled', name='requeststatus'), nullable=False),
+        sa.Column('type', postgresql.ENUM('improvement', 'revision', 'bug', 'question', name='requesttype', create_type=False), nullable=False),
+        sa.Column('status', postgresql.ENUM('open', 'in_progress', 'completed', 'cancelled', name='requeststatus', create_type=False), nullable=False),
         sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=True),
         sa.Column('updated_at', sa.DateTime(timezone=True), nullable=True),
         sa.ForeignKeyConstraint(['user_id'], ['users.id'], ondelete='CASCADE'),
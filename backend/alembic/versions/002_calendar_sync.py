@@ -0,0 +1,44 @@
+"""calendar sync
+
+Revision ID: 002
+Revises: 001
+Create Date: 2026-10-19 00:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '002'
+down_revision = '001'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_index(op.f('ix_bookings_google_event_id'), 'bookings', ['google_event_id'], unique=False)
+    
+    # Calendar Sync State table
+    op.create_table(
+        'calendar_sync_state',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('calendar_id', sa.String(), nullable=False),
+        sa.Column('sync_token', sa.String(), nullable=True),
+        sa.Column('channel_id', sa.String(), nullable=True),
+        sa.Column('channel_resource_id', sa.String(), nullable=True),
+        sa.Column('channel_token', sa.String(), nullable=True),
+        sa.Column('channel_expires_at', sa.DateTime(timezone=True), nullable=True),
+        sa.Column('last_synced_at', sa.DateTime(timezone=True), nullable=True),
+        sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=True),
+        sa.Column('updated_at', sa.DateTime(timezone=True), nullable=True),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('calendar_id')
+    )
+    op.create_index(op.f('ix_calendar_sync_state_id'), 'calendar_sync_state', ['id'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index(op.f('ix_calendar_sync_state_id'), table_name='calendar_sync_state')
+    op.drop_table('calendar_sync_state')
+    op.drop_index(op.f('ix_bookings_google_event_id'), table_name='bookings')
@@ -0,0 +1,24 @@
+"""request messages cursor index
+
+Revision ID: 003
+Revises: 002
+Create Date: 2026-10-19 00:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '003'
+down_revision = '002'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_index('ix_request_messages_request_id_id', 'request_messages', ['request_id', 'id'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_request_messages_request_id_id', table_name='request_messages')
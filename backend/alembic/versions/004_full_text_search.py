@@ -0,0 +1,76 @@
+"""full text search
+
+Revision ID: 004
+Revises: 003
+Create Date: 2026-10-19 00:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision = '004'
+down_revision = '003'
+branch_labels = None
+depends_on = None
+
+SEARCH_CONFIG = 'portuguese'
+
+# table -> [(column, weight)]
+SEARCH_COLUMNS = {
+    'requests': [('title', 'A'), ('description', 'B')],
+    'request_messages': [('message', 'B')],
+    'files': [('name', 'A'), ('description', 'B')],
+    'recordings': [('title', 'A'), ('description', 'B')],
+}
+
+
+def _vector(columns, prefix=''):
+    return " || ".join(
+        f"setweight(to_tsvector('{SEARCH_CONFIG}', coalesce({prefix}{column}, '')), '{weight}')"
+        for column, weight in columns
+    )
+
+
+def upgrade() -> None:
+    for table, columns in SEARCH_COLUMNS.items():
+        op.add_column(table, sa.Column('search_vector', postgresql.TSVECTOR(), nullable=True))
+        
+        op.execute(f"""
+            CREATE OR REPLACE FUNCTION {table}_search_vector_update() RETURNS trigger AS $$
+            BEGIN
+                NEW.search_vector := {_vector(columns, 'NEW.')};
+                RETURN NEW;
+            END
+            $$ LANGUAGE plpgsql
+        """)
+        op.execute(f"""
+            CREATE TRIGGER {table}_search_vector_trigger
+            BEFORE INSERT OR UPDATE OF {', '.join(column for column, _ in columns)} ON {table}
+            FOR EACH ROW EXECUTE FUNCTION {table}_search_vector_update()
+        """)
+        
+        # Backfill existing rows
+        op.execute(f"UPDATE {table} SET search_vector = {_vector(columns)}")
+    
+    # Build GIN indexes without blocking writes on large tables
+    with op.get_context().autocommit_block():
+        for table in SEARCH_COLUMNS:
+            op.create_index(
+                f'ix_{table}_search_vector',
+                table,
+                ['search_vector'],
+                unique=False,
+                postgresql_using='gin',
+                postgresql_concurrently=True
+            )
+
+
+def downgrade() -> None:
+    for table in SEARCH_COLUMNS:
+        op.drop_index(f'ix_{table}_search_vector', table_name=table)
+        op.execute(f"DROP TRIGGER IF EXISTS {table}_search_vector_trigger ON {table}")
+        op.execute(f"DROP FUNCTION IF EXISTS {table}_search_vector_update()")
+        op.drop_column(table, 'search_vector')
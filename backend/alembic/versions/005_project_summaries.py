@@ -0,0 +1,62 @@
+"""project summaries
+
+Revision ID: 005
+Revises: 004
+Create Date: 2026-10-19 00:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '005'
+down_revision = '004'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_index(op.f('ix_files_project_id'), 'files', ['project_id'], unique=False)
+    op.create_index(op.f('ix_recordings_project_id'), 'recordings', ['project_id'], unique=False)
+    op.create_index(op.f('ix_requests_project_id'), 'requests', ['project_id'], unique=False)
+    op.create_index('ix_bookings_user_id_start_time', 'bookings', ['user_id', 'start_time'], unique=False)
+    
+    # Project Summaries table
+    op.create_table(
+        'project_summaries',
+        sa.Column('project_id', sa.Integer(), nullable=False),
+        sa.Column('file_count', sa.Integer(), nullable=False),
+        sa.Column('recording_count', sa.Integer(), nullable=False),
+        sa.Column('total_bytes', sa.BigInteger(), nullable=False),
+        sa.Column('open_request_count', sa.Integer(), nullable=False),
+        sa.Column('in_progress_request_count', sa.Integer(), nullable=False),
+        sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=True),
+        sa.ForeignKeyConstraint(['project_id'], ['projects.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('project_id')
+    )
+    
+    # Backfill; afterwards rows are refreshed by the application on commit
+    op.execute("""
+        INSERT INTO project_summaries (
+            project_id, file_count, recording_count, total_bytes,
+            open_request_count, in_progress_request_count, updated_at
+        )
+        SELECT p.id,
+               (SELECT count(*) FROM files f WHERE f.project_id = p.id),
+               (SELECT count(*) FROM recordings rc WHERE rc.project_id = p.id),
+               (SELECT coalesce(sum(f.file_size_bytes), 0) FROM files f WHERE f.project_id = p.id)
+                 + (SELECT coalesce(sum(rc.file_size_bytes), 0) FROM recordings rc WHERE rc.project_id = p.id),
+               (SELECT count(*) FROM requests r WHERE r.project_id = p.id AND lower(r.status::text) = 'open'),
+               (SELECT count(*) FROM requests r WHERE r.project_id = p.id AND lower(r.status::text) = 'in_progress'),
+               now()
+        FROM projects p
+    """)
+
+
+def downgrade() -> None:
+    op.drop_table('project_summaries')
+    op.drop_index('ix_bookings_user_id_start_time', table_name='bookings')
+    op.drop_index(op.f('ix_requests_project_id'), table_name='requests')
+    op.drop_index(op.f('ix_recordings_project_id'), table_name='recordings')
+    op.drop_index(op.f('ix_files_project_id'), table_name='files')
@@ -0,0 +1,49 @@
+"""analytics rollups
+
+Revision ID: 006
+Revises: 005
+Create Date: 2026-10-19 00:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '006'
+down_revision = '005'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Range scans for time-bucketed aggregates
+    op.create_index(op.f('ix_requests_created_at'), 'requests', ['created_at'], unique=False)
+    op.create_index(op.f('ix_files_created_at'), 'files', ['created_at'], unique=False)
+    op.create_index(op.f('ix_recordings_created_at'), 'recordings', ['created_at'], unique=False)
+    op.create_index(op.f('ix_availability_slots_start_time'), 'availability_slots', ['start_time'], unique=False)
+    op.create_index(op.f('ix_bookings_start_time'), 'bookings', ['start_time'], unique=False)
+    
+    # Analytics Rollups table
+    op.create_table(
+        'analytics_rollups',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('metric', sa.String(), nullable=False),
+        sa.Column('granularity', sa.String(), nullable=False),
+        sa.Column('bucket_start', sa.DateTime(timezone=True), nullable=False),
+        sa.Column('data', sa.JSON(), nullable=False),
+        sa.Column('computed_at', sa.DateTime(timezone=True), nullable=False),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('metric', 'granularity', 'bucket_start')
+    )
+    op.create_index(op.f('ix_analytics_rollups_id'), 'analytics_rollups', ['id'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index(op.f('ix_analytics_rollups_id'), table_name='analytics_rollups')
+    op.drop_table('analytics_rollups')
+    op.drop_index(op.f('ix_bookings_start_time'), table_name='bookings')
+    op.drop_index(op.f('ix_availability_slots_start_time'), table_name='availability_slots')
+    op.drop_index(op.f('ix_recordings_created_at'), table_name='recordings')
+    op.drop_index(op.f('ix_files_created_at'), table_name='files')
+    op.drop_index(op.f('ix_requests_created_at'), table_name='requests')
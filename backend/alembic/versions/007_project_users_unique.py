@@ -0,0 +1,41 @@
+"""project users unique pair
+
+Revision ID: 007
+Revises: 006
+Create Date: 2026-10-19 00:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '007'
+down_revision = '006'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # A membership without a project or user means nothing; the columns become NOT NULL below
+    op.execute("DELETE FROM project_users WHERE project_id IS NULL OR user_id IS NULL")
+    op.alter_column('project_users', 'project_id', existing_type=sa.Integer(), nullable=False)
+    op.alter_column('project_users', 'user_id', existing_type=sa.Integer(), nullable=False)
+
+    # Drop duplicate associations left by earlier collection rewrites before enforcing the pair
+    op.execute("""
+        DELETE FROM project_users a
+        USING project_users b
+        WHERE a.ctid > b.ctid
+          AND a.project_id = b.project_id
+          AND a.user_id = b.user_id
+    """)
+    op.create_unique_constraint('uq_project_users_project_id_user_id', 'project_users', ['project_id', 'user_id'])
+    op.create_index(op.f('ix_project_users_user_id'), 'project_users', ['user_id'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index(op.f('ix_project_users_user_id'), table_name='project_users')
+    op.drop_constraint('uq_project_users_project_id_user_id', 'project_users', type_='unique')
+    op.alter_column('project_users', 'user_id', existing_type=sa.Integer(), nullable=True)
+    op.alter_column('project_users', 'project_id', existing_type=sa.Integer(), nullable=True)
@@ -0,0 +1,28 @@
+"""user invites
+
+Revision ID: 008
+Revises: 007
+Create Date: 2026-10-19 00:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '008'
+down_revision = '007'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column('users', sa.Column('invite_token_hash', sa.String(), nullable=True))
+    op.add_column('users', sa.Column('invite_expires_at', sa.DateTime(timezone=True), nullable=True))
+    op.create_index(op.f('ix_users_invite_token_hash'), 'users', ['invite_token_hash'], unique=True)
+
+
+def downgrade() -> None:
+    op.drop_index(op.f('ix_users_invite_token_hash'), table_name='users')
+    op.drop_column('users', 'invite_expires_at')
+    op.drop_column('users', 'invite_token_hash')
@@ -0,0 +1,40 @@
+"""lowercase enum labels
+
+Revision ID: 011
+Revises: 010
+Create Date: 2026-10-19 00:00:00.000000
+
+"""
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = '011'
+down_revision = '010'
+branch_labels = None
+depends_on = None
+
+ENUM_TYPES = ('userrole', 'projectstatus', 'bookingstatus', 'requesttype', 'requeststatus')
+
+
+def upgrade() -> None:
+    # Databases built by Base.metadata.create_all got the member names ('ADMIN') as labels;
+    # the models now store values ('admin') like the types created in 001. No-op elsewhere.
+    for type_name in ENUM_TYPES:
+        op.execute(f"""
+            DO $$
+            DECLARE label text;
+            BEGIN
+                FOR label IN
+                    SELECT e.enumlabel FROM pg_enum e JOIN pg_type t ON t.oid = e.enumtypid
+                    WHERE t.typname = '{type_name}' AND e.enumlabel <> lower(e.enumlabel)
+                LOOP
+                    EXECUTE format('ALTER TYPE {type_name} RENAME VALUE %L TO %L', label, lower(label));
+                END LOOP;
+            END $$;
+        """)
+
+
+def downgrade() -> None:
+    # Labels created by 001 were always lowercase
+    pass
@@ -0,0 +1,39 @@
+"""upload content hash, uploader and idempotency key
+
+Revision ID: 012
+Revises: 011
+Create Date: 2026-10-19 00:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '012'
+down_revision = '011'
+branch_labels = None
+depends_on = None
+
+TABLES = ('files', 'recordings')
+
+
+def upgrade() -> None:
+    # Files and Recordings: existing rows have no hash or uploader, so they are never matched for deduplication or replay
+    for table in TABLES:
+        op.add_column(table, sa.Column('content_sha256', sa.String(length=64), nullable=True))
+        op.add_column(table, sa.Column('user_id', sa.Integer(), nullable=True))
+        op.add_column(table, sa.Column('idempotency_key', sa.String(), nullable=True))
+        op.create_foreign_key(f'{table}_user_id_fkey', table, 'users', ['user_id'], ['id'], ondelete='SET NULL')
+        op.create_index(op.f(f'ix_{table}_content_sha256'), table, ['content_sha256'], unique=False)
+        op.create_index(f'ix_{table}_user_id_idempotency_key', table, ['user_id', 'idempotency_key'], unique=True)
+
+
+def downgrade() -> None:
+    for table in TABLES:
+        op.drop_index(f'ix_{table}_user_id_idempotency_key', table_name=table)
+        op.drop_index(op.f(f'ix_{table}_content_sha256'), table_name=table)
+        op.drop_constraint(f'{table}_user_id_fkey', table, type_='foreignkey')
+        op.drop_column(table, 'idempotency_key')
+        op.drop_column(table, 'user_id')
+        op.drop_column(table, 'content_sha256')
@@ -1,18 +1,49 @@
-from fastapi import FastAPI
+from contextlib import asynccontextmanager
+from fastapi import FastAPI, Response
 from fastapi.middleware.cors import CORSMiddleware
 from app.config import settings
 from app.database import engine, Base
-from app.routers import auth, projects, recordings, bookings, files, requests
+from app.middleware.metrics import MetricsMiddleware
+from app.middleware.query_inspector import QueryInspectorMiddleware
+from app.middleware.rate_limit import RateLimitMiddleware
+from app.routers import auth, projects, recordings, bookings, files, requests, calendar, realtime, search, dashboard, analytics, health
+from app.services.google_calendar import google_calendar_service
+from app.services.realtime import realtime_service
+from app.services.sharepoint import sharepoint_service
+from app.utils.metrics import CONTENT_TYPE_LATEST, render_metrics
+from app.utils.security import shutdown_hash_pool
+from app.utils.tracing import setup_tracing, shutdown_tracing
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Migrations (alembic upgrade head) own the schema; create_all is only for throwaway local databases
+    if settings.DB_CREATE_ALL:
+        Base.metadata.create_all(bind=engine)
+    await realtime_service.start()
+    yield
+    await realtime_service.stop()
+    await google_calendar_service.close()
+    await sharepoint_service.close()
+    shutdown_hash_pool()
+    shutdown_tracing()
 
-# Create database tables
-Base.metadata.create_all(bind=engine)
 
 app = FastAPI(
     title="Blink Customers Platform",
     description="Portal do Cliente para Consultoria e Projetos",
-    version="1.0.0"
+    version="1.0.0",
+    lifespan=lifespan
 )
 
+# N+1 and slow query reports (development/staging)
+if settings.QUERY_INSPECTOR_ENABLED:
+    app.add_middleware(QueryInspectorMiddleware)
+
+# Rate limiting (added before CORS so 429 responses still carry CORS headers)
+if settings.RATE_LIMIT_ENABLED:
+    app.add_middleware(RateLimitMiddleware)
+
 # CORS middleware
 app.add_middleware(
     CORSMiddleware,
@@ -22,6 +53,13 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Metrics (outermost, so rate-limited and CORS preflight responses are measured too)
+if settings.METRICS_ENABLED:
+    app.add_middleware(MetricsMiddleware)
+
+# Tracing (no-op unless TRACING_ENABLED)
+setup_tracing(app, engine)
+
 # Include routers
 app.include_router(auth.router)
 app.include_router(projects.router)
@@ -29,6 +67,12 @@ app.include_router(recordings.router)
 app.include_router(bookings.router)
 app.include_router(files.router)
 app.include_router(requests.router)
+app.include_router(calendar.router)
+app.include_router(realtime.router)
+app.include_router(search.router)
+app.include_router(dashboard.router)
+app.include_router(analytics.router)
+app.include_router(health.router)
 
 
 @app.get("/")
@@ -40,6 +84,7 @@ def root():
     }
 
 
-@app.get("/health")
-def health_check():
-    return {"status": "healthy"}
+if settings.METRICS_ENABLED:
+    @app.get("/metrics", include_in_schema=False)
+    def metrics():
+        return Response(render_metrics(), headers={"Content-Type": CONTENT_TYPE_LATEST})
@@ -0,0 +1,47 @@
+import time
+from app.utils.metrics import (
+    DB_QUERIES_PER_REQUEST,
+    DB_QUERY_SECONDS_PER_REQUEST,
+    HTTP_REQUEST_DURATION,
+    HTTP_REQUESTS_IN_PROGRESS,
+    QueryStats,
+    current_query_stats,
+)
+
+
+class MetricsMiddleware:
+    """Request latency, in-flight count and per-request database load, labelled by route template"""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            return await self.app(scope, receive, send)
+
+        method = scope["method"]
+        status_code = 500  # Unless the app manages to start a response
+
+        async def send_with_status(message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        stats = QueryStats()
+        token = current_query_stats.set(stats)
+        in_progress = HTTP_REQUESTS_IN_PROGRESS.labels(method)
+        in_progress.inc()
+        started = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            duration = time.perf_counter() - started
+            in_progress.dec()
+            current_query_stats.reset(token)
+            # The router records the matched route in the scope; raw paths would explode label cardinality
+            route = scope.get("route")
+            template = getattr(route, "path", None) or "unmatched"
+            HTTP_REQUEST_DURATION.labels(method, template, str(status_code)).observe(duration)
+            DB_QUERIES_PER_REQUEST.labels(method, template).observe(stats.count)
+            DB_QUERY_SECONDS_PER_REQUEST.labels(method, template).observe(stats.seconds)
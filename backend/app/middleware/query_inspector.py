@@ -0,0 +1,139 @@
+import os
+import re
+import time
+import traceback
+from contextvars import ContextVar
+from typing import Dict, List, Optional, Tuple
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from app.config import settings
+
+APP_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+_PARAMETER = re.compile(r"%\(\w+\)s|\?|\$\d+")
+_LITERAL = re.compile(r"'(?:[^']|'')*'|\b\d+(?:\.\d+)?\b")
+_LIST = re.compile(r"\(\s*\?(?:\s*,\s*\?)*\s*\)")
+_SPACE = re.compile(r"\s+")
+
+
+class QueryBudgetExceeded(Exception):
+    """A request ran more SQL statements than QUERY_INSPECTOR_BUDGET allows"""
+
+
+def normalize(statement: str) -> str:
+    """Statement shape: parameters and literals become ?, IN lists collapse, whitespace is squeezed"""
+    shape = _PARAMETER.sub("?", statement)
+    shape = _LITERAL.sub("?", shape)
+    shape = _LIST.sub("(...)", shape)
+    return _SPACE.sub(" ", shape).strip()
+
+
+def _app_stack() -> List[str]:
+    """Application frames leading to the current statement, innermost last"""
+    frames = [frame for frame in traceback.extract_stack() if frame.filename != __file__]
+    app_frames = [frame for frame in frames if frame.filename.startswith(APP_DIR)]
+    if not app_frames:
+        # e.g. a lazy load triggered while FastAPI serializes the response model
+        app_frames = [frame for frame in frames if f"{os.sep}sqlalchemy{os.sep}" not in frame.filename][-3:]
+    return [
+        f"{os.path.relpath(frame.filename, os.path.dirname(APP_DIR))}:{frame.lineno} in {frame.name}"
+        if frame.filename.startswith(APP_DIR) else f"{frame.filename}:{frame.lineno} in {frame.name}"
+        for frame in app_frames
+    ]
+
+
+class QueryLog:
+    def __init__(self, budget: Optional[int]):
+        self.budget = budget
+        self.count = 0
+        self.seconds = 0.0
+        # shape -> [executions, seconds, stack captured when the shape became suspicious]
+        self.shapes: Dict[str, list] = {}
+        self.slow: List[Tuple[float, str, List[str]]] = []
+
+
+current_query_log: ContextVar[Optional[QueryLog]] = ContextVar("current_query_log", default=None)
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    log = current_query_log.get()
+    if log is None:
+        return
+    if log.budget is not None and log.count >= log.budget:
+        raise QueryBudgetExceeded(f"Query budget of {log.budget} exceeded by: {normalize(statement)}")
+    context._inspector_started = time.perf_counter()
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    log = current_query_log.get()
+    if log is None:
+        return
+    duration = time.perf_counter() - context._inspector_started
+    log.count += 1
+    log.seconds += duration
+
+    shape = normalize(statement)
+    entry = log.shapes.setdefault(shape, [0, 0.0, None])
+    entry[0] += 1
+    entry[1] += duration
+    # The execution that crosses the threshold is inside the loop issuing them
+    if entry[0] == settings.QUERY_INSPECTOR_N_PLUS_ONE_THRESHOLD:
+        entry[2] = _app_stack()
+
+    if duration * 1000 >= settings.QUERY_INSPECTOR_SLOW_MS:
+        log.slow.append((duration, shape, _app_stack()))
+
+
+_installed = False
+
+
+def _install() -> None:
+    global _installed
+    if not _installed:
+        event.listen(Engine, "before_cursor_execute", _before_cursor_execute)
+        event.listen(Engine, "after_cursor_execute", _after_cursor_execute)
+        _installed = True
+
+
+class QueryInspectorMiddleware:
+    """Development/staging aid: reports N+1 patterns and slow statements per request, with route and stack"""
+
+    def __init__(self, app):
+        self.app = app
+        _install()
+
+    def _report(self, method: str, route: str, log: QueryLog) -> None:
+        repeated = [
+            (shape, entry) for shape, entry in log.shapes.items()
+            if entry[0] >= settings.QUERY_INSPECTOR_N_PLUS_ONE_THRESHOLD
+        ]
+        if not repeated and not log.slow:
+            return
+
+        lines = [f"[query-inspector] {method} {route}: {log.count} queries in {log.seconds * 1000:.1f} ms"]
+        for shape, (executions, seconds, stack) in sorted(repeated, key=lambda item: -item[1][0]):
+            lines.append(f"  N+1 suspect: {executions}x ({seconds * 1000:.1f} ms) {shape}")
+            lines.extend(f"    at {frame}" for frame in stack or [])
+        for duration, shape, stack in log.slow:
+            lines.append(f"  slow: {duration * 1000:.1f} ms {shape}")
+            lines.extend(f"    at {frame}" for frame in stack)
+        print("\n".join(lines))
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            return await self.app(scope, receive, send)
+
+        log = QueryLog(settings.QUERY_INSPECTOR_BUDGET)
+        token = current_query_log.set(log)
+
+        async def send_with_count(message):
+            if message["type"] == "http.response.start":
+                message = {**message, "headers": [*message.get("headers", []), (b"x-query-count", str(log.count).encode())]}
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_count)
+        finally:
+            current_query_log.reset(token)
+            route = getattr(scope.get("route"), "path", None) or scope["path"]
+            self._report(scope["method"], route, log)
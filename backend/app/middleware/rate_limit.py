@@ -0,0 +1,163 @@
+import json
+import math
+import re
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import List, Optional, Tuple
+from starlette.concurrency import run_in_threadpool
+from sqlalchemy import text
+from app.config import settings
+from app.database import engine
+from app.services.sharepoint import sharepoint_service
+from app.utils.security import decode_token
+
+
+@dataclass(frozen=True)
+class RateLimitRule:
+    name: str
+    methods: Tuple[str, ...]
+    pattern: re.Pattern
+    per_minute: int
+    by_ip: bool = False  # Unauthenticated routes are keyed on the client IP only
+    uses_sharepoint: bool = False  # Rejected early while Graph is throttling us or unavailable
+
+    @property
+    def rate(self) -> float:
+        return self.per_minute / 60
+
+
+def default_rules() -> List[RateLimitRule]:
+    """First matching rule wins; the last one covers every other route except probes and metrics"""
+    return [
+        RateLimitRule("login", ("POST",), re.compile(r"^/auth/login$"), settings.RATE_LIMIT_LOGIN_PER_MINUTE, by_ip=True),
+        RateLimitRule(
+            "upload", ("POST",), re.compile(r"^/(files|recordings)$"),
+            settings.RATE_LIMIT_UPLOAD_PER_MINUTE, uses_sharepoint=True
+        ),
+        RateLimitRule(
+            "download", ("GET",), re.compile(r"^/(files|recordings)/\d+/download-url$"),
+            settings.RATE_LIMIT_DOWNLOAD_PER_MINUTE, uses_sharepoint=True
+        ),
+        RateLimitRule(
+            "default", ("GET", "POST", "PUT", "PATCH", "DELETE"), re.compile(r"^/(?!health|metrics)"),
+            settings.RATE_LIMIT_DEFAULT_PER_MINUTE
+        ),
+    ]
+
+
+class MemoryBackend:
+    """Per-worker token buckets; bounded so idle principals are evicted"""
+
+    def __init__(self, max_keys: int = 100000):
+        self._buckets: "OrderedDict[str, Tuple[float, float]]" = OrderedDict()
+        self._max_keys = max_keys
+
+    async def acquire(self, key: str, capacity: int, rate: float) -> float:
+        """Take one token; returns 0 if allowed, else seconds until a token is available"""
+        now = time.monotonic()
+        tokens, updated = self._buckets.pop(key, (capacity, now))
+        tokens = min(capacity, tokens + (now - updated) * rate)
+        wait = 0.0
+        if tokens >= 1:
+            tokens -= 1
+        else:
+            wait = (1 - tokens) / rate
+        self._buckets[key] = (tokens, now)
+        if len(self._buckets) > self._max_keys:
+            self._buckets.popitem(last=False)
+        return wait
+
+
+class PostgresBackend:
+    """Token buckets shared by all workers; one atomic upsert per request"""
+
+    ACQUIRE = text("""
+        INSERT INTO rate_limit_buckets AS b (key, tokens, updated_at)
+        VALUES (:key, :capacity - 1, now())
+        ON CONFLICT (key) DO UPDATE SET
+            tokens = LEAST(:capacity, b.tokens + EXTRACT(EPOCH FROM now() - b.updated_at) * :rate) - 1,
+            updated_at = now()
+        WHERE LEAST(:capacity, b.tokens + EXTRACT(EPOCH FROM now() - b.updated_at) * :rate) >= 1
+        RETURNING tokens
+    """)
+
+    # Buckets refill completely within a minute, so older rows carry no state
+    PRUNE = text("DELETE FROM rate_limit_buckets WHERE updated_at < now() - interval '5 minutes'")
+    PRUNE_EVERY = 1000
+
+    def __init__(self):
+        self._calls = 0
+
+    def _acquire(self, key: str, capacity: int, rate: float) -> bool:
+        self._calls += 1
+        with engine.connect() as conn:
+            allowed = conn.execute(self.ACQUIRE, {"key": key, "capacity": capacity, "rate": rate}).first() is not None
+            if self._calls % self.PRUNE_EVERY == 0:
+                conn.execute(self.PRUNE)
+            conn.commit()
+        return allowed
+
+    async def acquire(self, key: str, capacity: int, rate: float) -> float:
+        """Take one token; returns 0 if allowed, else an estimate of seconds until one is available"""
+        allowed = await run_in_threadpool(self._acquire, key, capacity, rate)
+        return 0.0 if allowed else 1 / rate
+
+
+class RateLimitMiddleware:
+    """Token-bucket admission control keyed on (rule, user ID or client IP)"""
+
+    def __init__(self, app, rules: Optional[List[RateLimitRule]] = None, backend=None):
+        self.app = app
+        self.rules = rules or default_rules()
+        self.backend = backend or (PostgresBackend() if settings.RATE_LIMIT_BACKEND == "postgres" else MemoryBackend())
+
+    def _match(self, method: str, path: str) -> Optional[RateLimitRule]:
+        for rule in self.rules:
+            if method in rule.methods and rule.pattern.match(path):
+                return rule
+        return None
+
+    def _principal(self, scope, rule: RateLimitRule) -> str:
+        if not rule.by_ip:
+            for name, value in scope["headers"]:
+                if name == b"authorization" and value[:7].lower() == b"bearer ":
+                    payload = decode_token(value[7:].decode("latin-1"))
+                    if payload and payload.get("sub"):
+                        return f"user:{payload['sub']}"
+                    break
+        client = scope.get("client")
+        return f"ip:{client[0] if client else 'unknown'}"
+
+    async def _reject(self, send, retry_after: float, detail: str) -> None:
+        body = json.dumps({"detail": detail}).encode()
+        await send({
+            "type": "http.response.start",
+            "status": 429,
+            "headers": [
+                (b"content-type", b"application/json"),
+                (b"content-length", str(len(body)).encode()),
+                (b"retry-after", str(max(1, math.ceil(retry_after))).encode()),
+            ],
+        })
+        await send({"type": "http.response.body", "body": body})
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            return await self.app(scope, receive, send)
+
+        rule = self._match(scope["method"], scope["path"])
+        if rule is None:
+            return await self.app(scope, receive, send)
+
+        # Graph told us to back off or the breaker is open: fail fast instead of tying up a worker and a DB connection
+        if rule.uses_sharepoint:
+            throttled = sharepoint_service.throttle_remaining()
+            if throttled > 0:
+                return await self._reject(send, throttled, "SharePoint is unavailable, try again later")
+
+        wait = await self.backend.acquire(f"{rule.name}:{self._principal(scope, rule)}", rule.per_minute, rule.rate)
+        if wait > 0:
+            return await self._reject(send, wait, "Too many requests")
+
+        await self.app(scope, receive, send)
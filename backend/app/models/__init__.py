@@ -4,6 +4,11 @@ from app.models.recording import Recording
 from app.models.booking import Booking, AvailabilitySlot
 from app.models.file import File
 from app.models.request import Request, RequestMessage
+from app.models.calendar_sync import CalendarSyncState
+from app.models.dashboard import ProjectSummary
+from app.models.analytics import AnalyticsRollup
+from app.models.refresh_token import RefreshTokenFamily
+from app.models.rate_limit import RateLimitBucket
 
 __all__ = [
     "User",
@@ -14,4 +19,9 @@ __all__ = [
     "File",
     "Request",
     "RequestMessage",
+    "CalendarSyncState",
+    "ProjectSummary",
+    "AnalyticsRollup",
+    "RefreshTokenFamily",
+    "RateLimitBucket",
 ]
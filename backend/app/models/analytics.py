@@ -0,0 +1,15 @@
+from sqlalchemy import Column, Integer, String, DateTime, JSON, UniqueConstraint
+from app.database import Base
+
+
+class AnalyticsRollup(Base):
+    """Cached aggregate for one metric and time bucket"""
+    __tablename__ = "analytics_rollups"
+    __table_args__ = (UniqueConstraint("metric", "granularity", "bucket_start"),)
+
+    id = Column(Integer, primary_key=True, index=True)
+    metric = Column(String, nullable=False)  # requests, bookings or storage
+    granularity = Column(String, nullable=False)  # day, week or month
+    bucket_start = Column(DateTime(timezone=True), nullable=False)
+    data = Column(JSON, nullable=False)
+    computed_at = Column(DateTime(timezone=True), nullable=False)
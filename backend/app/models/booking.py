@@ -1,8 +1,8 @@
-from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, Enum, Boolean
+from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, Enum, Boolean, Index
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 import enum
-from app.database import Base
+from app.database import Base, enum_values
 
 
 class BookingStatus(str, enum.Enum):
@@ -17,7 +17,7 @@ class AvailabilitySlot(Base):
     __tablename__ = "availability_slots"
 
     id = Column(Integer, primary_key=True, index=True)
-    start_time = Column(DateTime(timezone=True), nullable=False)
+    start_time = Column(DateTime(timezone=True), nullable=False, index=True)
     end_time = Column(DateTime(timezone=True), nullable=False)
     is_available = Column(Boolean, default=True)
     created_at = Column(DateTime(timezone=True), server_default=func.now())
@@ -28,16 +28,20 @@ class AvailabilitySlot(Base):
 
 class Booking(Base):
     __tablename__ = "bookings"
+    __table_args__ = (
+        # Serves "next booking" lookups (WHERE user_id = ? AND start_time >= ? ORDER BY start_time)
+        Index("ix_bookings_user_id_start_time", "user_id", "start_time"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=False)
     slot_id = Column(Integer, ForeignKey("availability_slots.id", ondelete="SET NULL"))
     title = Column(String, nullable=False)
     description = Column(String)
-    start_time = Column(DateTime(timezone=True), nullable=False)
+    start_time = Column(DateTime(timezone=True), nullable=False, index=True)
     end_time = Column(DateTime(timezone=True), nullable=False)
-    status = Column(Enum(BookingStatus), nullable=False, default=BookingStatus.PENDING)
-    google_event_id = Column(String)  # Google Calendar event ID
+    status = Column(Enum(BookingStatus, values_callable=enum_values), nullable=False, default=BookingStatus.PENDING)
+    google_event_id = Column(String, index=True)  # Google Calendar event ID
     meeting_link = Column(String)  # Google Meet or other meeting link
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), onupdate=func.now())
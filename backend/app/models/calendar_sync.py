@@ -0,0 +1,19 @@
+from sqlalchemy import Column, Integer, String, DateTime
+from sqlalchemy.sql import func
+from app.database import Base
+
+
+class CalendarSyncState(Base):
+    """Incremental sync cursor and push channel for a Google calendar"""
+    __tablename__ = "calendar_sync_state"
+
+    id = Column(Integer, primary_key=True, index=True)
+    calendar_id = Column(String, unique=True, nullable=False)
+    sync_token = Column(String)  # nextSyncToken from the last events.list
+    channel_id = Column(String)  # events.watch channel
+    channel_resource_id = Column(String)
+    channel_token = Column(String)  # Echoed back in X-Goog-Channel-Token
+    channel_expires_at = Column(DateTime(timezone=True))
+    last_synced_at = Column(DateTime(timezone=True))
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    updated_at = Column(DateTime(timezone=True), onupdate=func.now())
@@ -0,0 +1,16 @@
+from sqlalchemy import Column, Integer, BigInteger, DateTime, ForeignKey
+from sqlalchemy.sql import func
+from app.database import Base
+
+
+class ProjectSummary(Base):
+    """Per-project dashboard counters, adjusted by each write's deltas on commit"""
+    __tablename__ = "project_summaries"
+
+    project_id = Column(Integer, ForeignKey("projects.id", ondelete="CASCADE"), primary_key=True)
+    file_count = Column(Integer, nullable=False, default=0)
+    recording_count = Column(Integer, nullable=False, default=0)
+    total_bytes = Column(BigInteger, nullable=False, default=0)  # Files and recordings
+    open_request_count = Column(Integer, nullable=False, default=0)
+    in_progress_request_count = Column(Integer, nullable=False, default=0)
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
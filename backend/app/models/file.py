@@ -1,22 +1,35 @@
-from sqlalchemy import Column, Integer, String, DateTime, ForeignKey
+from sqlalchemy import Column, Index, Integer, String, DateTime, ForeignKey
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 from app.database import Base
+from app.models.search import search_vector_column, search_vector_index, register_search_trigger
 
 
 class File(Base):
     __tablename__ = "files"
+    __table_args__ = (
+        search_vector_index("files"),
+        # Idempotency-Keys are per uploader: one user's key never matches another's upload
+        Index("ix_files_user_id_idempotency_key", "user_id", "idempotency_key", unique=True),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
-    project_id = Column(Integer, ForeignKey("projects.id", ondelete="CASCADE"), nullable=False)
+    project_id = Column(Integer, ForeignKey("projects.id", ondelete="CASCADE"), nullable=False, index=True)
     name = Column(String, nullable=False)
     description = Column(String)
     sharepoint_file_id = Column(String)  # Microsoft Graph file ID
     sharepoint_url = Column(String)  # Direct link to file in SharePoint
     file_size_bytes = Column(Integer)
     mime_type = Column(String)
-    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    content_sha256 = Column(String(64), index=True)  # Hex SHA-256 of the uploaded bytes, for deduplication
+    user_id = Column(Integer, ForeignKey("users.id", ondelete="SET NULL"))  # Uploader
+    idempotency_key = Column(String)  # Idempotency-Key of the upload request
+    created_at = Column(DateTime(timezone=True), server_default=func.now(), index=True)
     updated_at = Column(DateTime(timezone=True), onupdate=func.now())
+    search_vector = search_vector_column()  # Maintained by trigger
 
     # Relationships
     project = relationship("Project", back_populates="files")
+
+
+register_search_trigger(File.__table__, [("name", "A"), ("description", "B")])
@@ -1,8 +1,8 @@
-from sqlalchemy import Column, Integer, String, Text, DateTime, Table, ForeignKey, Enum
+from sqlalchemy import Column, Integer, String, Text, DateTime, Table, ForeignKey, Enum, UniqueConstraint
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 import enum
-from app.database import Base
+from app.database import Base, enum_values
 
 
 class ProjectStatus(str, enum.Enum):
@@ -16,8 +16,9 @@ class ProjectStatus(str, enum.Enum):
 project_users = Table(
     "project_users",
     Base.metadata,
-    Column("project_id", Integer, ForeignKey("projects.id", ondelete="CASCADE")),
-    Column("user_id", Integer, ForeignKey("users.id", ondelete="CASCADE")),
+    Column("project_id", Integer, ForeignKey("projects.id", ondelete="CASCADE"), nullable=False),
+    Column("user_id", Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=False, index=True),
+    UniqueConstraint("project_id", "user_id", name="uq_project_users_project_id_user_id"),
 )
 
 
@@ -27,14 +28,15 @@ class Project(Base):
     id = Column(Integer, primary_key=True, index=True)
     name = Column(String, nullable=False, index=True)
     description = Column(Text)
-    status = Column(Enum(ProjectStatus), nullable=False, default=ProjectStatus.ACTIVE)
+    status = Column(Enum(ProjectStatus, values_callable=enum_values), nullable=False, default=ProjectStatus.ACTIVE)
     start_date = Column(DateTime(timezone=True))
     end_date = Column(DateTime(timezone=True))
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), onupdate=func.now())
 
     # Relationships
-    users = relationship("User", secondary=project_users, back_populates="projects")
-    recordings = relationship("Recording", back_populates="project", cascade="all, delete-orphan")
-    files = relationship("File", back_populates="project", cascade="all, delete-orphan")
-    requests = relationship("Request", back_populates="project", cascade="all, delete-orphan")
+    # passive_deletes: children are removed by the ON DELETE CASCADE foreign keys, not loaded and deleted one by one
+    users = relationship("User", secondary=project_users, back_populates="projects", passive_deletes=True)
+    recordings = relationship("Recording", back_populates="project", cascade="all, delete-orphan", passive_deletes=True)
+    files = relationship("File", back_populates="project", cascade="all, delete-orphan", passive_deletes=True)
+    requests = relationship("Request", back_populates="project", cascade="all, delete-orphan", passive_deletes=True)
@@ -0,0 +1,11 @@
+from sqlalchemy import Column, String, Float, DateTime
+from app.database import Base
+
+
+class RateLimitBucket(Base):
+    """Shared token bucket used by the postgres rate limit backend"""
+    __tablename__ = "rate_limit_buckets"
+
+    key = Column(String, primary_key=True)  # rule:principal
+    tokens = Column(Float, nullable=False)
+    updated_at = Column(DateTime(timezone=True), nullable=False, index=True)
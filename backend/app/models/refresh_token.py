@@ -0,0 +1,16 @@
+from sqlalchemy import Column, Integer, String, DateTime, ForeignKey
+from sqlalchemy.sql import func
+from app.database import Base
+
+
+class RefreshTokenFamily(Base):
+    """A login session; each refresh rotates current_jti and replaying an older one revokes the family"""
+    __tablename__ = "refresh_token_families"
+
+    id = Column(String, primary_key=True)  # fid claim
+    user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=False, index=True)
+    current_jti = Column(String, nullable=False)  # Only refresh token still valid in this family
+    revoked_at = Column(DateTime(timezone=True), index=True)
+    revoked_reason = Column(String)  # logout or reuse
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    last_rotated_at = Column(DateTime(timezone=True), server_default=func.now())
@@ -1,8 +1,9 @@
-from sqlalchemy import Column, Integer, String, Text, DateTime, ForeignKey, Enum
+from sqlalchemy import Column, Integer, String, Text, DateTime, ForeignKey, Enum, Index
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 import enum
-from app.database import Base
+from app.database import Base, enum_values
+from app.models.search import search_vector_column, search_vector_index, register_search_trigger
 
 
 class RequestType(str, enum.Enum):
@@ -21,32 +22,52 @@ class RequestStatus(str, enum.Enum):
 
 class Request(Base):
     __tablename__ = "requests"
+    __table_args__ = (search_vector_index("requests"),)
 
     id = Column(Integer, primary_key=True, index=True)
     user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=False)
-    project_id = Column(Integer, ForeignKey("projects.id", ondelete="CASCADE"), nullable=False)
+    project_id = Column(Integer, ForeignKey("projects.id", ondelete="CASCADE"), nullable=False, index=True)
     title = Column(String, nullable=False)
     description = Column(Text, nullable=False)
-    type = Column(Enum(RequestType), nullable=False, default=RequestType.QUESTION)
-    status = Column(Enum(RequestStatus), nullable=False, default=RequestStatus.OPEN)
-    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    type = Column(Enum(RequestType, values_callable=enum_values), nullable=False, default=RequestType.QUESTION)
+    status = Column(Enum(RequestStatus, values_callable=enum_values), nullable=False, default=RequestStatus.OPEN)
+    created_at = Column(DateTime(timezone=True), server_default=func.now(), index=True)
     updated_at = Column(DateTime(timezone=True), onupdate=func.now())
+    search_vector = search_vector_column()  # Maintained by trigger
 
     # Relationships
     user = relationship("User", back_populates="requests")
     project = relationship("Project", back_populates="requests")
-    messages = relationship("RequestMessage", back_populates="request", cascade="all, delete-orphan")
+    messages = relationship(
+        "RequestMessage",
+        back_populates="request",
+        cascade="all, delete-orphan",
+        passive_deletes=True,
+        order_by="RequestMessage.id"
+    )
+
+
+register_search_trigger(Request.__table__, [("title", "A"), ("description", "B")])
 
 
 class RequestMessage(Base):
     __tablename__ = "request_messages"
+    __table_args__ = (
+        # Serves cursor pagination of a thread (WHERE request_id = ? AND id > ? ORDER BY id)
+        Index("ix_request_messages_request_id_id", "request_id", "id"),
+        search_vector_index("request_messages"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     request_id = Column(Integer, ForeignKey("requests.id", ondelete="CASCADE"), nullable=False)
     user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=False)
     message = Column(Text, nullable=False)
     created_at = Column(DateTime(timezone=True), server_default=func.now())
+    search_vector = search_vector_column()  # Maintained by trigger
 
     # Relationships
     request = relationship("Request", back_populates="messages")
     user = relationship("User")
+
+
+register_search_trigger(RequestMessage.__table__, [("message", "B")])
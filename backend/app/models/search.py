@@ -0,0 +1,46 @@
+from typing import List, Tuple
+from sqlalchemy import Column, DDL, Index, Text, event
+from sqlalchemy.dialects.postgresql import TSVECTOR
+from sqlalchemy.orm import deferred
+
+# Text search configuration used by the triggers and by queries; they must match
+SEARCH_CONFIG = "portuguese"
+
+
+def search_vector_column():
+    """tsvector column filled by a trigger; deferred so normal queries never load it"""
+    return deferred(Column(TSVECTOR().with_variant(Text(), "sqlite")))
+
+
+def search_vector_index(table_name: str) -> Index:
+    return Index(f"ix_{table_name}_search_vector", "search_vector", postgresql_using="gin")
+
+
+def search_trigger_sql(table_name: str, weighted_columns: List[Tuple[str, str]]) -> List[str]:
+    """Statements creating the trigger that keeps search_vector in sync with the weighted columns"""
+    vector = " || ".join(
+        f"setweight(to_tsvector('{SEARCH_CONFIG}', coalesce(NEW.{column}, '')), '{weight}')"
+        for column, weight in weighted_columns
+    )
+    columns = ", ".join(column for column, _ in weighted_columns)
+    return [
+        f"""
+        CREATE OR REPLACE FUNCTION {table_name}_search_vector_update() RETURNS trigger AS $$
+        BEGIN
+            NEW.search_vector := {vector};
+            RETURN NEW;
+        END
+        $$ LANGUAGE plpgsql
+        """,
+        f"""
+        CREATE TRIGGER {table_name}_search_vector_trigger
+        BEFORE INSERT OR UPDATE OF {columns} ON {table_name}
+        FOR EACH ROW EXECUTE FUNCTION {table_name}_search_vector_update()
+        """,
+    ]
+
+
+def register_search_trigger(table, weighted_columns: List[Tuple[str, str]]) -> None:
+    """Create the trigger whenever the table is created through metadata.create_all on Postgres"""
+    for statement in search_trigger_sql(table.name, weighted_columns):
+        event.listen(table, "after_create", DDL(statement).execute_if(dialect="postgresql"))
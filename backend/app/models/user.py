@@ -2,7 +2,7 @@ from sqlalchemy import Column, Integer, String, Boolean, DateTime, Enum
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 import enum
-from app.database import Base
+from app.database import Base, enum_values
 
 
 class UserRole(str, enum.Enum):
@@ -17,12 +17,14 @@ class User(Base):
     email = Column(String, unique=True, index=True, nullable=False)
     hashed_password = Column(String, nullable=False)
     full_name = Column(String, nullable=False)
-    role = Column(Enum(UserRole), nullable=False, default=UserRole.CLIENT)
+    role = Column(Enum(UserRole, values_callable=enum_values), nullable=False, default=UserRole.CLIENT)
     is_active = Column(Boolean, default=True)
+    invite_token_hash = Column(String, unique=True, index=True)  # SHA-256 of a pending invite token
+    invite_expires_at = Column(DateTime(timezone=True))
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), onupdate=func.now())
 
     # Relationships
-    projects = relationship("Project", secondary="project_users", back_populates="users")
+    projects = relationship("Project", secondary="project_users", back_populates="users", passive_deletes=True)
     bookings = relationship("Booking", back_populates="user")
     requests = relationship("Request", back_populates="user")
@@ -0,0 +1,82 @@
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from sqlalchemy.orm import Session
+from typing import List
+from datetime import datetime
+from app.database import get_db
+from app.models.user import User
+from app.schemas.analytics import RequestThroughput, BookingUtilization, ProjectStorage
+from app.utils.deps import require_admin
+from app.services.analytics import analytics_service
+
+router = APIRouter(prefix="/analytics", tags=["analytics"])
+
+GRANULARITY_PATTERN = "^(day|week|month)$"
+
+
+def _rollups(db: Session, metric: str, granularity: str, start: datetime, end: datetime, refresh: bool):
+    try:
+        buckets = analytics_service.buckets(granularity, start, end)
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
+    
+    if not buckets:
+        return []
+    
+    return analytics_service.get_rollups(db, metric, granularity, buckets, refresh=refresh)
+
+
+@router.get("/requests", response_model=List[RequestThroughput])
+def get_request_throughput(
+    granularity: str = Query("week", pattern=GRANULARITY_PATTERN),
+    start: datetime = None,
+    end: datetime = None,
+    refresh: bool = False,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(require_admin)
+):
+    """Requests created per time bucket by type and status (admin only)"""
+    return [
+        {"bucket_start": bucket_start, **row}
+        for bucket_start, rows in _rollups(db, "requests", granularity, start, end, refresh)
+        for row in rows
+    ]
+
+
+@router.get("/bookings", response_model=List[BookingUtilization])
+def get_booking_utilization(
+    granularity: str = Query("week", pattern=GRANULARITY_PATTERN),
+    start: datetime = None,
+    end: datetime = None,
+    refresh: bool = False,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(require_admin)
+):
+    """Availability slot utilization and bookings by status per time bucket (admin only)"""
+    return [
+        {
+            "bucket_start": bucket_start,
+            **stats,
+            "utilization": stats["booked_minutes"] / stats["slot_minutes"] if stats["slot_minutes"] else 0.0,
+        }
+        for bucket_start, stats in _rollups(db, "bookings", granularity, start, end, refresh)
+    ]
+
+
+@router.get("/storage", response_model=List[ProjectStorage])
+def get_project_storage(
+    granularity: str = Query("week", pattern=GRANULARITY_PATTERN),
+    start: datetime = None,
+    end: datetime = None,
+    refresh: bool = False,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(require_admin)
+):
+    """Files and recordings added per project and time bucket (admin only)"""
+    return [
+        {"bucket_start": bucket_start, **row}
+        for bucket_start, rows in _rollups(db, "storage", granularity, start, end, refresh)
+        for row in rows
+    ]
@@ -1,15 +1,30 @@
-from fastapi import APIRouter, Depends, HTTPException, status
-from fastapi.security import OAuth2PasswordRequestForm
+from datetime import datetime, timezone
+from fastapi import APIRouter, Depends, HTTPException, status, Request as HTTPRequest
+from fastapi.security import OAuth2PasswordRequestForm, HTTPAuthorizationCredentials
 from sqlalchemy.orm import Session
 from app.database import get_db
+from app.config import settings
 from app.models.user import User
-from app.schemas.user import UserCreate, User as UserSchema, Token
-from app.utils.security import verify_password, get_password_hash, create_access_token, create_refresh_token, decode_token
-from app.utils.deps import get_current_user
+from app.schemas.user import UserCreate, User as UserSchema, Token, UserImportResult, InviteAccept
+from app.utils.security import (
+    verify_password, get_password_hash, create_access_token, create_refresh_token, decode_token, hash_invite_token
+)
+from app.utils.deps import get_current_user, require_admin, security
+from app.services.user_import import user_import_service, parse_import
+from app.services.token_store import token_store, RefreshTokenError, RefreshTokenReused
 
 router = APIRouter(prefix="/auth", tags=["auth"])
 
 
+def _issue_tokens(user_id: int, fid: str, jti: str) -> dict:
+    """Token pair for a session; the access token carries the family so revocation applies to it too"""
+    return {
+        "access_token": create_access_token(data={"sub": str(user_id), "fid": fid}),
+        "refresh_token": create_refresh_token(data={"sub": str(user_id), "fid": fid, "jti": jti}),
+        "token_type": "bearer"
+    }
+
+
 @router.post("/register", response_model=UserSchema, status_code=status.HTTP_201_CREATED)
 def register(user_data: UserCreate, db: Session = Depends(get_db)):
     """Register a new user"""
@@ -36,6 +51,55 @@ def register(user_data: UserCreate, db: Session = Depends(get_db)):
     return db_user
 
 
+@router.post("/import", response_model=UserImportResult, status_code=status.HTTP_201_CREATED)
+async def import_users(
+    http_request: HTTPRequest,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(require_admin)
+):
+    """Bulk-create users from a JSON array or CSV (email, full_name, role, password) (admin only)"""
+    try:
+        rows = parse_import(await http_request.body(), http_request.headers.get("content-type", ""))
+    except (ValueError, UnicodeDecodeError) as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Invalid import: {str(e)}"
+        )
+    
+    if len(rows) > settings.USER_IMPORT_MAX_ROWS:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Import is limited to {settings.USER_IMPORT_MAX_ROWS} rows"
+        )
+    
+    return await user_import_service.import_users(db, rows)
+
+
+@router.post("/accept-invite", response_model=Token)
+def accept_invite(invite: InviteAccept, db: Session = Depends(get_db)):
+    """Set the password for an invited user and log them in"""
+    user = db.query(User).filter(User.invite_token_hash == hash_invite_token(invite.token)).first()
+    
+    expires_at = user.invite_expires_at if user else None
+    if expires_at is not None and expires_at.tzinfo is None:
+        expires_at = expires_at.replace(tzinfo=timezone.utc)  # SQLite drops the offset
+    
+    if expires_at is None or expires_at < datetime.now(timezone.utc):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid or expired invite"
+        )
+    
+    user.hashed_password = get_password_hash(invite.password)
+    user.is_active = True
+    user.invite_token_hash = None
+    user.invite_expires_at = None
+    db.commit()
+    
+    fid, jti = token_store.create_family(db, user.id)
+    return _issue_tokens(user.id, fid, jti)
+
+
 @router.post("/login", response_model=Token)
 def login(form_data: OAuth2PasswordRequestForm = Depends(), db: Session = Depends(get_db)):
     """Login with email and password"""
@@ -54,29 +118,36 @@ def login(form_data: OAuth2PasswordRequestForm = Depends(), db: Session = Depend
             detail="Inactive user"
         )
     
-    access_token = create_access_token(data={"sub": str(user.id)})
-    refresh_token = create_refresh_token(data={"sub": str(user.id)})
-    
-    return {
-        "access_token": access_token,
-        "refresh_token": refresh_token,
-        "token_type": "bearer"
-    }
+    fid, jti = token_store.create_family(db, user.id)
+    return _issue_tokens(user.id, fid, jti)
 
 
 @router.post("/refresh", response_model=Token)
 def refresh_token(refresh_token: str, db: Session = Depends(get_db)):
-    """Refresh access token using refresh token"""
+    """Rotate a refresh token; presenting an already used one revokes the whole session"""
     payload = decode_token(refresh_token)
     
-    if payload is None or payload.get("type") != "refresh":
+    if payload is None or payload.get("type") != "refresh" or not payload.get("fid") or not payload.get("jti"):
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Invalid refresh token"
         )
     
-    user_id = payload.get("sub")
-    user = db.query(User).filter(User.id == int(user_id)).first()
+    fid = payload["fid"]
+    try:
+        user_id, jti = token_store.rotate(db, fid, payload["jti"])
+    except RefreshTokenReused:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Refresh token reuse detected; session revoked"
+        )
+    except RefreshTokenError:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Invalid refresh token"
+        )
+    
+    user = db.query(User).filter(User.id == user_id).first()
     
     if not user or not user.is_active:
         raise HTTPException(
@@ -84,14 +155,21 @@ def refresh_token(refresh_token: str, db: Session = Depends(get_db)):
             detail="User not found or inactive"
         )
     
-    new_access_token = create_access_token(data={"sub": str(user.id)})
-    new_refresh_token = create_refresh_token(data={"sub": str(user.id)})
+    return _issue_tokens(user.id, fid, jti)
+
+
+@router.post("/logout", status_code=status.HTTP_204_NO_CONTENT)
+def logout(
+    credentials: HTTPAuthorizationCredentials = Depends(security),
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    """Revoke the current session's refresh and access tokens"""
+    payload = decode_token(credentials.credentials)
+    if payload.get("fid"):
+        token_store.revoke(db, payload["fid"], "logout")
     
-    return {
-        "access_token": new_access_token,
-        "refresh_token": new_refresh_token,
-        "token_type": "bearer"
-    }
+    return None
 
 
 @router.get("/me", response_model=UserSchema)
@@ -1,7 +1,7 @@
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from sqlalchemy.orm import Session, joinedload
 from typing import List
-from datetime import datetime
+from datetime import datetime, timedelta
 from app.database import get_db
 from app.models.user import User, UserRole
 from app.models.booking import Booking, BookingStatus, AvailabilitySlot
@@ -10,10 +10,17 @@ from app.schemas.booking import (
     BookingCreate,
     BookingUpdate,
     AvailabilitySlot as AvailabilitySlotSchema,
-    AvailabilitySlotCreate
+    AvailabilitySlotCreate,
+    FreeBusy,
+    BookingBulkCancel,
+    BookingBulkReschedule,
+    BookingBulkResult
 )
+from app.config import settings
 from app.utils.deps import get_current_user, require_admin
 from app.services.google_calendar import google_calendar_service
+from app.services.analytics import analytics_service
+from app.services.availability import availability_service
 
 router = APIRouter(prefix="/bookings", tags=["bookings"])
 
@@ -34,6 +41,7 @@ def create_availability_slot(
     db.add(db_slot)
     db.commit()
     db.refresh(db_slot)
+    availability_service.invalidate()
     
     return db_slot
 
@@ -56,6 +64,37 @@ def list_availability_slots(
     return query.order_by(AvailabilitySlot.start_time).all()
 
 
+@router.get("/availability", response_model=FreeBusy)
+def get_availability(
+    start: datetime,
+    end: datetime,
+    duration_minutes: int = Query(60, gt=0),
+    granularity_minutes: int = Query(None, gt=0),
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    """Free/busy search: open intervals within a window that fit the requested duration"""
+    if end <= start:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Window end must be after start"
+        )
+    
+    if end - start > timedelta(days=settings.AVAILABILITY_MAX_WINDOW_DAYS):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Window cannot exceed {settings.AVAILABILITY_MAX_WINDOW_DAYS} days"
+        )
+    
+    return availability_service.get_free_busy(
+        db,
+        window_start=start,
+        window_end=end,
+        duration_minutes=duration_minutes,
+        granularity_minutes=granularity_minutes
+    )
+
+
 @router.delete("/slots/{slot_id}", status_code=status.HTTP_204_NO_CONTENT)
 def delete_availability_slot(
     slot_id: int,
@@ -80,6 +119,7 @@ def delete_availability_slot(
     
     db.delete(slot)
     db.commit()
+    availability_service.invalidate()
     
     return None
 
@@ -114,40 +154,65 @@ async def create_booking(
             detail="Slot already booked"
         )
     
-    # Create booking
-    db_booking = Booking(
-        user_id=current_user.id,
-        slot_id=slot.id,
-        title=booking_data.title,
-        description=booking_data.description,
-        start_time=slot.start_time,
-        end_time=slot.end_time,
-        status=BookingStatus.CONFIRMED
-    )
-    
-    # Mark slot as unavailable
-    slot.is_available = False
-    
-    # Try to create Google Calendar event
+    # Claim the slot before awaiting Google: of concurrent requests, only one still finds it available
+    claimed = db.query(AvailabilitySlot).filter(
+        AvailabilitySlot.id == slot.id,
+        AvailabilitySlot.is_available == True
+    ).update({AvailabilitySlot.is_available: False}, synchronize_session=False)
+    # Bulk updates bypass the session events that keep analytics rollups current
+    analytics_service.mark_stale(db, "bookings", [slot.start_time])
+    db.commit()
+
+    if not claimed:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Slot already booked"
+        )
+
     try:
-        event = await google_calendar_service.create_event(
-            summary=booking_data.title,
-            description=booking_data.description or "",
+        # Create booking
+        db_booking = Booking(
+            user_id=current_user.id,
+            slot_id=slot.id,
+            title=booking_data.title,
+            description=booking_data.description,
             start_time=slot.start_time,
             end_time=slot.end_time,
-            attendee_emails=[current_user.email],
-            meeting_link=True
+            status=BookingStatus.CONFIRMED
         )
+
+        # Try to create Google Calendar event
+        try:
+            event = await google_calendar_service.create_event(
+                summary=booking_data.title,
+                description=booking_data.description or "",
+                start_time=slot.start_time,
+                end_time=slot.end_time,
+                attendee_emails=[current_user.email],
+                meeting_link=True
+            )
         
-        db_booking.google_event_id = event.get('id')
-        db_booking.meeting_link = event.get('hangoutLink')
-    except Exception as e:
-        # Log error but continue without calendar integration
-        print(f"Failed to create Google Calendar event: {e}")
+            db_booking.google_event_id = event.get('id')
+            db_booking.meeting_link = event.get('hangoutLink')
+        except Exception as e:
+            # Log error but continue without calendar integration
+            print(f"Failed to create Google Calendar event: {e}")
     
-    db.add(db_booking)
-    db.commit()
-    db.refresh(db_booking)
+        db.add(db_booking)
+        db.commit()
+        db.refresh(db_booking)
+    except BaseException:
+        # Cancelled or failed after the claim: give the slot back, or it stays unavailable with no booking
+        db.rollback()
+        db.query(AvailabilitySlot).filter(AvailabilitySlot.id == slot.id).update(
+            {AvailabilitySlot.is_available: True}, synchronize_session=False
+        )
+        analytics_service.mark_stale(db, "bookings", [slot.start_time])
+        db.commit()
+        availability_service.invalidate()
+        raise
+
+    availability_service.invalidate()
     
     return db_booking
 
@@ -166,6 +231,143 @@ def list_bookings(
     return bookings
 
 
+@router.post("/bulk-cancel", response_model=BookingBulkResult)
+async def bulk_cancel_bookings(
+    bulk_data: BookingBulkCancel,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(require_admin)
+):
+    """Cancel many bookings at once (admin only)"""
+    booking_ids = list(dict.fromkeys(bulk_data.booking_ids))
+    bookings = {
+        booking.id: booking
+        for booking in db.query(Booking)
+        .options(joinedload(Booking.slot))
+        .filter(Booking.id.in_(booking_ids))
+        .all()
+    }
+    
+    # Delete Google Calendar events in batches
+    event_ids = [b.google_event_id for b in bookings.values() if b.google_event_id]
+    calendar_errors = {}
+    if event_ids:
+        try:
+            calendar_errors = await google_calendar_service.delete_events(event_ids)
+        except Exception as e:
+            print(f"Failed to delete Google Calendar events: {e}")
+            calendar_errors = {event_id: str(e) for event_id in event_ids}
+    
+    results = []
+    for booking_id in booking_ids:
+        booking = bookings.get(booking_id)
+        if not booking:
+            results.append({"booking_id": booking_id, "success": False, "detail": "Booking not found"})
+            continue
+        
+        # Mark slot as available again
+        if booking.slot:
+            booking.slot.is_available = True
+        
+        db.delete(booking)
+        results.append({
+            "booking_id": booking_id,
+            "success": True,
+            "calendar_error": calendar_errors.get(booking.google_event_id)
+        })
+    
+    db.commit()
+    availability_service.invalidate()
+    
+    return {"results": results}
+
+
+@router.post("/bulk-reschedule", response_model=BookingBulkResult)
+async def bulk_reschedule_bookings(
+    bulk_data: BookingBulkReschedule,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(require_admin)
+):
+    """Move many bookings to new availability slots at once (admin only)"""
+    booking_ids = [item.booking_id for item in bulk_data.items]
+    slot_ids = [item.slot_id for item in bulk_data.items]
+    bookings = {
+        booking.id: booking
+        for booking in db.query(Booking)
+        .options(joinedload(Booking.slot))
+        .filter(Booking.id.in_(booking_ids))
+        .all()
+    }
+    slots = {
+        slot.id: slot
+        for slot in db.query(AvailabilitySlot)
+        .options(joinedload(AvailabilitySlot.booking))
+        .filter(AvailabilitySlot.id.in_(slot_ids))
+        .all()
+    }
+    
+    results = {}
+    moves = []
+    claimed_slots = set()
+    for item in bulk_data.items:
+        booking = bookings.get(item.booking_id)
+        slot = slots.get(item.slot_id)
+        detail = None
+        if not booking:
+            detail = "Booking not found"
+        elif item.booking_id in results:
+            detail = "Booking listed more than once"
+        elif not slot:
+            detail = "Availability slot not found"
+        elif not slot.is_available or slot.booking or slot.id in claimed_slots:
+            detail = "Slot is not available"
+        
+        if detail:
+            results.setdefault(item.booking_id, {"booking_id": item.booking_id, "success": False, "detail": detail})
+            continue
+        
+        claimed_slots.add(slot.id)
+        results[item.booking_id] = {"booking_id": item.booking_id, "success": True}
+        moves.append((booking, slot))
+    
+    # Move Google Calendar events in batches
+    changes = {
+        booking.google_event_id: (slot.start_time, slot.end_time)
+        for booking, slot in moves
+        if booking.google_event_id
+    }
+    calendar_errors = {}
+    if changes:
+        try:
+            calendar_errors = await google_calendar_service.reschedule_events(changes)
+        except Exception as e:
+            print(f"Failed to update Google Calendar events: {e}")
+            calendar_errors = {event_id: str(e) for event_id in changes}
+    
+    for booking, slot in moves:
+        calendar_error = calendar_errors.get(booking.google_event_id) if booking.google_event_id else None
+        if calendar_error:
+            # Keep the booking where attendees were told it is; the admin can retry the item
+            results[booking.id] = {
+                "booking_id": booking.id,
+                "success": False,
+                "detail": "Failed to update calendar event",
+                "calendar_error": calendar_error
+            }
+            continue
+        
+        if booking.slot:
+            booking.slot.is_available = True
+        slot.is_available = False
+        booking.slot = slot
+        booking.start_time = slot.start_time
+        booking.end_time = slot.end_time
+    
+    db.commit()
+    availability_service.invalidate()
+    
+    return {"results": list(results.values())}
+
+
 @router.get("/{booking_id}", response_model=BookingSchema)
 def get_booking(
     booking_id: int,
@@ -216,6 +418,7 @@ def update_booking(
     
     db.commit()
     db.refresh(booking)
+    availability_service.invalidate()
     
     return booking
 
@@ -255,5 +458,6 @@ async def cancel_booking(
     
     db.delete(booking)
     db.commit()
+    availability_service.invalidate()
     
     return None
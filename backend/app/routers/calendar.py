@@ -0,0 +1,79 @@
+from fastapi import APIRouter, BackgroundTasks, Depends, Header, HTTPException, Response, status
+from sqlalchemy.orm import Session
+from typing import Optional
+from app.database import get_db
+from app.models.user import User
+from app.schemas.calendar import CalendarSyncResult, CalendarSyncState, CalendarWatchCreate
+from app.utils.deps import require_admin
+from app.services.calendar_sync import calendar_sync_service
+
+router = APIRouter(prefix="/calendar", tags=["calendar"])
+
+
+@router.get("/sync", response_model=CalendarSyncState)
+def get_sync_state(
+    db: Session = Depends(get_db),
+    current_user: User = Depends(require_admin)
+):
+    """Get calendar sync cursor and push channel state (admin only)"""
+    state = calendar_sync_service.get_state(db)
+    db.commit()
+    return state
+
+
+@router.post("/sync", response_model=CalendarSyncResult)
+async def sync_calendar(
+    db: Session = Depends(get_db),
+    current_user: User = Depends(require_admin)
+):
+    """Pull calendar changes since the last sync and update bookings (admin only)"""
+    try:
+        return await calendar_sync_service.sync(db)
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_502_BAD_GATEWAY,
+            detail=f"Failed to sync calendar: {str(e)}"
+        )
+
+
+@router.post("/watch", response_model=CalendarSyncState)
+async def watch_calendar(
+    watch_data: CalendarWatchCreate,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(require_admin)
+):
+    """Open a push notification channel for calendar changes (admin only)"""
+    try:
+        return await calendar_sync_service.start_watch(db, watch_data.address)
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_502_BAD_GATEWAY,
+            detail=f"Failed to watch calendar: {str(e)}"
+        )
+
+
+@router.post("/webhook", status_code=status.HTTP_204_NO_CONTENT)
+def calendar_webhook(
+    background_tasks: BackgroundTasks,
+    x_goog_channel_id: Optional[str] = Header(None),
+    x_goog_channel_token: Optional[str] = Header(None),
+    x_goog_resource_state: Optional[str] = Header(None),
+    db: Session = Depends(get_db)
+):
+    """Receive Google Calendar push notifications and schedule an incremental sync"""
+    if not calendar_sync_service.verify_notification(db, x_goog_channel_id, x_goog_channel_token):
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Unknown notification channel"
+        )
+    
+    # The initial "sync" message only confirms the channel; changes arrive as "exists"
+    if x_goog_resource_state != "sync":
+        background_tasks.add_task(calendar_sync_service.run_background_sync)
+    
+    return Response(status_code=status.HTTP_204_NO_CONTENT)
@@ -0,0 +1,29 @@
+from fastapi import APIRouter, Depends, status
+from sqlalchemy.orm import Session
+from app.database import get_db
+from app.models.user import User
+from app.schemas.dashboard import DashboardSummary
+from app.utils.deps import get_current_user, require_admin
+from app.services.dashboard import dashboard_service
+
+router = APIRouter(prefix="/dashboard", tags=["dashboard"])
+
+
+@router.get("", response_model=DashboardSummary)
+def get_dashboard(
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    """Project cards (file/recording counts, storage, open requests) and the next booking"""
+    return dashboard_service.get_summary(db, current_user)
+
+
+@router.post("/rebuild", status_code=status.HTTP_204_NO_CONTENT)
+def rebuild_dashboard(
+    db: Session = Depends(get_db),
+    current_user: User = Depends(require_admin)
+):
+    """Recompute every project's summary counters from scratch (admin only)"""
+    dashboard_service.rebuild(db)
+    db.commit()
+    return None
@@ -0,0 +1,20 @@
+from fastapi import APIRouter, Response, status
+from app.services.health import health_service
+
+router = APIRouter(prefix="/health", tags=["health"])
+
+
+@router.get("")
+@router.get("/live")
+def liveness():
+    """The process is up and serving requests; never touches dependencies"""
+    return {"status": "healthy"}
+
+
+@router.get("/ready")
+async def readiness(response: Response):
+    """Whether the API can serve traffic: database, SharePoint token and Google credentials (cached briefly)"""
+    ready, checks = await health_service.readiness()
+    if not ready:
+        response.status_code = status.HTTP_503_SERVICE_UNAVAILABLE
+    return {"status": "ready" if ready else "not_ready", "checks": checks}
@@ -1,11 +1,15 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, status
+from sqlalchemy import delete
 from sqlalchemy.orm import Session
 from typing import List
 from app.database import get_db
 from app.models.user import User, UserRole
 from app.models.project import Project
-from app.schemas.project import Project as ProjectSchema, ProjectCreate, ProjectUpdate
+from app.schemas.project import Project as ProjectSchema, ProjectCreate, ProjectUpdate, ProjectMembersUpdate, ProjectMembersResult
 from app.utils.deps import get_current_user, require_admin
+from app.services.analytics import analytics_service
+from app.services.membership import membership_service
+from app.services.sharepoint import sharepoint_service
 
 router = APIRouter(prefix="/projects", tags=["projects"])
 
@@ -26,12 +30,13 @@ def create_project(
         end_date=project_data.end_date
     )
     
+    db.add(db_project)
+    db.flush()
+    
     # Add users to project
     if project_data.user_ids:
-        users = db.query(User).filter(User.id.in_(project_data.user_ids)).all()
-        db_project.users = users
+        membership_service.add_members(db, db_project.id, project_data.user_ids)
     
-    db.add(db_project)
     db.commit()
     db.refresh(db_project)
     
@@ -105,10 +110,9 @@ def update_project(
     if project_data.end_date is not None:
         project.end_date = project_data.end_date
     
-    # Update users
+    # Update users (only changed association rows are written)
     if project_data.user_ids is not None:
-        users = db.query(User).filter(User.id.in_(project_data.user_ids)).all()
-        project.users = users
+        membership_service.set_members(db, project.id, project_data.user_ids)
     
     db.commit()
     db.refresh(project)
@@ -116,22 +120,58 @@ def update_project(
     return project
 
 
+@router.patch("/{project_id}/members", response_model=ProjectMembersResult)
+def update_project_members(
+    project_id: int,
+    members: ProjectMembersUpdate,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(require_admin)
+):
+    """Add and remove project members by user ID (admin only)"""
+    project = db.query(Project.id).filter(Project.id == project_id).first()
+    
+    if not project:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Project not found"
+        )
+    
+    if set(members.add) & set(members.remove):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="A user cannot be both added and removed"
+        )
+    
+    removed = membership_service.remove_members(db, project_id, members.remove)
+    added = membership_service.add_members(db, project_id, members.add)
+    db.commit()
+    
+    return {"added": added, "removed": removed}
+
+
 @router.delete("/{project_id}", status_code=status.HTTP_204_NO_CONTENT)
 def delete_project(
     project_id: int,
+    background_tasks: BackgroundTasks,
     db: Session = Depends(get_db),
     current_user: User = Depends(require_admin)
 ):
-    """Delete a project (admin only)"""
-    project = db.query(Project).filter(Project.id == project_id).first()
+    """Delete a project and its SharePoint folders (admin only)"""
+    # Single DELETE; recordings, files, requests, messages and memberships go via ON DELETE CASCADE
+    result = db.execute(delete(Project).where(Project.id == project_id))
     
-    if not project:
+    if result.rowcount == 0:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Project not found"
         )
     
-    db.delete(project)
+    # The cascade removes rows from any bucket, unseen by the session events behind analytics rollups
+    analytics_service.mark_stale(db, "requests")
+    analytics_service.mark_stale(db, "storage")
     db.commit()
     
+    if sharepoint_service.is_configured():
+        background_tasks.add_task(sharepoint_service.delete_project_folders, project_id)
+    
     return None
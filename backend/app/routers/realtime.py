@@ -0,0 +1,37 @@
+from fastapi import APIRouter, Depends, Request as HTTPRequest
+from fastapi.responses import StreamingResponse
+from sqlalchemy.orm import Session
+from app.database import get_db
+from app.models.user import User, UserRole
+from app.utils.deps import get_stream_user, require_admin
+from app.services.realtime import realtime_service
+
+router = APIRouter(prefix="/realtime", tags=["realtime"])
+
+
+@router.get("/events")
+async def stream_user_events(
+    http_request: HTTPRequest,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_stream_user)
+):
+    """Stream events for all of the current user's requests (admins receive every request)"""
+    topics = [f"user:{current_user.id}"]
+    if current_user.role == UserRole.ADMIN:
+        topics.append(f"role:{UserRole.ADMIN.value}")
+    
+    # Release the pooled connection now; the stream may stay open for hours
+    db.close()
+    
+    subscription = realtime_service.subscribe("user", topics)
+    return StreamingResponse(
+        realtime_service.stream(http_request, subscription),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+
+@router.get("/stats")
+def get_realtime_stats(current_user: User = Depends(require_admin)):
+    """Connection counts and backpressure counters for this worker (admin only)"""
+    return realtime_service.stats()
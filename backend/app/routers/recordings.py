@@ -1,27 +1,46 @@
-from fastapi import APIRouter, Depends, HTTPException, status, UploadFile, File
+import math
+from fastapi import APIRouter, Depends, Header, HTTPException, Response, status, UploadFile, File
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import Session
-from typing import List
+from typing import List, Optional
 from app.database import get_db
 from app.models.user import User, UserRole
 from app.models.project import Project
 from app.models.recording import Recording
-from app.schemas.recording import Recording as RecordingSchema, RecordingCreate, RecordingUpdate
+from app.schemas.recording import Recording as RecordingSchema, RecordingUpdate
 from app.utils.deps import get_current_user, require_admin
+from app.services.graph_resilience import GraphUnavailable
 from app.services.sharepoint import sharepoint_service
+from app.services.upload_dedupe import upload_dedupe_service
 
 router = APIRouter(prefix="/recordings", tags=["recordings"])
 
 
+def _replay(db: Session, user_id: int, idempotency_key: str, project_id: int, content_sha256: str) -> Optional[Recording]:
+    """The recording created by the user's earlier request with this Idempotency-Key, if it was the same upload"""
+    existing = upload_dedupe_service.find_upload(db, Recording, user_id, idempotency_key)
+    if existing is None:
+        return None
+    if existing.project_id != project_id or existing.content_sha256 != content_sha256:
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail="Idempotency-Key was already used for a different upload"
+        )
+    return existing
+
+
 @router.post("", response_model=RecordingSchema, status_code=status.HTTP_201_CREATED)
 async def create_recording(
     project_id: int,
     title: str,
+    response: Response,
     description: str = None,
     file: UploadFile = File(...),
+    idempotency_key: Optional[str] = Header(None, max_length=255),
     db: Session = Depends(get_db),
     current_user: User = Depends(require_admin)
 ):
-    """Upload a new recording (admin only)"""
+    """Upload a new recording (admin only); retries with the same Idempotency-Key return the first result"""
     # Check if project exists
     project = db.query(Project).filter(Project.id == project_id).first()
     if not project:
@@ -32,14 +51,25 @@ async def create_recording(
     
     # Read file content
     file_content = await file.read()
+    content_sha256 = await upload_dedupe_service.content_hash(file_content)
+
+    if idempotency_key:
+        replayed = _replay(db, current_user.id, idempotency_key, project_id, content_sha256)
+        if replayed is not None:
+            response.headers["Idempotent-Replayed"] = "true"
+            return replayed
     
-    # Upload to SharePoint
+    # Upload to SharePoint (or reuse identical content already there, per UPLOAD_DEDUPE_MODE)
     try:
         folder_path = f"/recordings/project_{project_id}"
-        upload_result = await sharepoint_service.upload_file(
-            file_content=file_content,
+        upload_result = await upload_dedupe_service.store(
+            db,
+            Recording,
+            content=file_content,
+            content_sha256=content_sha256,
             file_name=file.filename,
-            folder_path=folder_path
+            folder_path=folder_path,
+            project_id=project_id
         )
         
         # Create recording record
@@ -49,7 +79,10 @@ async def create_recording(
             description=description,
             sharepoint_file_id=upload_result.get("id"),
             sharepoint_url=upload_result.get("webUrl"),
-            file_size_bytes=len(file_content)
+            file_size_bytes=len(file_content),
+            content_sha256=content_sha256,
+            user_id=current_user.id,
+            idempotency_key=idempotency_key
         )
         
         db.add(db_recording)
@@ -57,6 +90,25 @@ async def create_recording(
         db.refresh(db_recording)
         
         return db_recording
+    except IntegrityError:
+        # A concurrent retry with the same Idempotency-Key committed first; this request's item is not needed
+        db.rollback()
+        await upload_dedupe_service.discard(db, Recording, upload_result.get("id"))
+        replayed = _replay(db, current_user.id, idempotency_key, project_id, content_sha256) if idempotency_key else None
+        if replayed is None:
+            # e.g. the project was deleted meanwhile
+            raise HTTPException(
+                status_code=status.HTTP_409_CONFLICT,
+                detail="Upload conflicted with a concurrent change, retry it"
+            )
+        response.headers["Idempotent-Replayed"] = "true"
+        return replayed
+    except GraphUnavailable as e:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail=str(e),
+            headers={"Retry-After": str(max(1, math.ceil(e.retry_after)))}
+        )
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -149,6 +201,12 @@ async def get_recording_download_url(
     try:
         download_url = await sharepoint_service.get_download_url(recording.sharepoint_file_id)
         return {"download_url": download_url}
+    except GraphUnavailable as e:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail=str(e),
+            headers={"Retry-After": str(max(1, math.ceil(e.retry_after)))}
+        )
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -198,9 +256,9 @@ async def delete_recording(
             detail="Recording not found"
         )
     
-    # Delete from SharePoint
+    # Delete from SharePoint, unless another recording still uses the same item (deduplicated uploads)
     try:
-        if recording.sharepoint_file_id:
+        if recording.sharepoint_file_id and not upload_dedupe_service.is_shared(db, Recording, recording):
             await sharepoint_service.delete_file(recording.sharepoint_file_id)
     except Exception as e:
         # Log error but continue with database deletion
@@ -1,5 +1,7 @@
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi import Request as HTTPRequest
+from fastapi.responses import StreamingResponse
+from sqlalchemy.orm import Session, selectinload
 from typing import List
 from app.database import get_db
 from app.models.user import User, UserRole
@@ -12,11 +14,17 @@ from app.schemas.request import (
     RequestMessage as RequestMessageSchema,
     RequestMessageCreate
 )
-from app.utils.deps import get_current_user, require_admin
+from app.utils.deps import get_current_user, get_stream_user, require_admin
+from app.services.realtime import realtime_service
 
 router = APIRouter(prefix="/requests", tags=["requests"])
 
 
+def request_topics(request: Request) -> List[str]:
+    """Realtime topics that should hear about changes to a request"""
+    return [f"request:{request.id}", f"user:{request.user_id}", f"role:{UserRole.ADMIN.value}"]
+
+
 @router.post("", response_model=RequestSchema, status_code=status.HTTP_201_CREATED)
 def create_request(
     request_data: RequestCreate,
@@ -62,7 +70,8 @@ def list_requests(
     current_user: User = Depends(get_current_user)
 ):
     """List requests (admin sees all, users see only their own)"""
-    query = db.query(Request)
+    # Messages are part of the response: load them for all requests in one query
+    query = db.query(Request).options(selectinload(Request.messages))
     
     if project_id:
         # Check project access
@@ -161,6 +170,17 @@ def update_request(
     db.commit()
     db.refresh(request)
     
+    realtime_service.publish(request_topics(request), {
+        "type": "request.updated",
+        "request_id": request.id,
+        "request": {
+            "title": request.title,
+            "type": request.type.value,
+            "status": request.status.value,
+            "updated_at": request.updated_at,
+        },
+    })
+    
     return request
 
 
@@ -227,16 +247,69 @@ def add_message_to_request(
     db.commit()
     db.refresh(db_message)
     
+    realtime_service.publish(request_topics(request), {
+        "type": "message.created",
+        "request_id": request_id,
+        "message_id": db_message.id,
+        "message": RequestMessageSchema.model_validate(db_message).model_dump(mode="json"),
+    })
+    
     return db_message
 
 
 @router.get("/{request_id}/messages", response_model=List[RequestMessageSchema])
 def list_request_messages(
     request_id: int,
+    after_id: int = None,
+    before_id: int = None,
+    limit: int = Query(50, ge=1, le=500),
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user)
 ):
-    """List messages for a request"""
+    """List messages for a request, oldest first, in windows of at most `limit`
+    
+    - `after_id`: messages newer than this ID (fetch the delta since the last message seen)
+    - `before_id`: messages older than this ID (load earlier history)
+    - both: messages between them, oldest first
+    - neither: the most recent messages
+    """
+    request = db.query(Request).filter(Request.id == request_id).first()
+    
+    if not request:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Request not found"
+        )
+    
+    # Check access
+    if current_user.role != UserRole.ADMIN and request.user_id != current_user.id:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Not enough permissions"
+        )
+    
+    query = db.query(RequestMessage).filter(RequestMessage.request_id == request_id)
+    
+    if before_id is not None:
+        query = query.filter(RequestMessage.id < before_id)
+    
+    if after_id is not None:
+        query = query.filter(RequestMessage.id > after_id)
+        return query.order_by(RequestMessage.id).limit(limit).all()
+    
+    messages = query.order_by(RequestMessage.id.desc()).limit(limit).all()
+    messages.reverse()
+    return messages
+
+
+@router.get("/{request_id}/events")
+async def stream_request_events(
+    request_id: int,
+    http_request: HTTPRequest,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_stream_user)
+):
+    """Stream new messages and status changes for a request (Server-Sent Events)"""
     request = db.query(Request).filter(Request.id == request_id).first()
     
     if not request:
@@ -252,4 +325,12 @@ def list_request_messages(
             detail="Not enough permissions"
         )
     
-    return request.messages
+    # Release the pooled connection now; the stream may stay open for hours
+    db.close()
+    
+    subscription = realtime_service.subscribe("request", [f"request:{request_id}"])
+    return StreamingResponse(
+        realtime_service.stream(http_request, subscription),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
@@ -0,0 +1,60 @@
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from sqlalchemy.orm import Session
+from typing import List
+from app.database import get_db
+from app.models.user import User, UserRole
+from app.models.project import Project
+from app.schemas.search import SearchResult
+from app.utils.deps import get_current_user
+from app.services.search import search_service, SEARCH_KINDS
+
+router = APIRouter(prefix="/search", tags=["search"])
+
+
+@router.get("", response_model=List[SearchResult])
+def search(
+    q: str = Query(..., min_length=1, max_length=200),
+    types: str = ",".join(SEARCH_KINDS),
+    project_id: int = None,
+    limit: int = Query(20, ge=1, le=100),
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    """Full-text search across requests, messages, files and recordings"""
+    if db.get_bind().dialect.name != "postgresql":
+        raise HTTPException(
+            status_code=status.HTTP_501_NOT_IMPLEMENTED,
+            detail="Search requires PostgreSQL"
+        )
+    
+    kinds = [kind.strip() for kind in types.split(",") if kind.strip()]
+    invalid = [kind for kind in kinds if kind not in SEARCH_KINDS]
+    if not kinds or invalid:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"types must be a comma-separated subset of: {', '.join(SEARCH_KINDS)}"
+        )
+    
+    if project_id:
+        # Check project access
+        project = db.query(Project).filter(Project.id == project_id).first()
+        if not project:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Project not found"
+            )
+        
+        if current_user.role != UserRole.ADMIN and project not in current_user.projects:
+            raise HTTPException(
+                status_code=status.HTTP_403_FORBIDDEN,
+                detail="Not enough permissions"
+            )
+    
+    return search_service.search(
+        db,
+        current_user,
+        query=q,
+        kinds=kinds,
+        project_id=project_id,
+        limit=limit
+    )
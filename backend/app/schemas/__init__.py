@@ -1,15 +1,31 @@
-from app.schemas.user import User, UserCreate, UserUpdate, UserInDB, Token, TokenData
-from app.schemas.project import Project, ProjectCreate, ProjectUpdate
+from app.schemas.user import (
+    User, UserCreate, UserUpdate, UserInDB, Token, TokenData,
+    UserImportItem, UserImportCreated, UserImportSkipped, UserImportResult, InviteAccept,
+)
+from app.schemas.project import Project, ProjectCreate, ProjectUpdate, ProjectMembersUpdate, ProjectMembersResult
 from app.schemas.recording import Recording, RecordingCreate, RecordingUpdate
-from app.schemas.booking import Booking, BookingCreate, BookingUpdate, AvailabilitySlot, AvailabilitySlotCreate
+from app.schemas.booking import (
+    Booking, BookingCreate, BookingUpdate, AvailabilitySlot, AvailabilitySlotCreate, TimeInterval, FreeBusy,
+    BookingBulkCancel, BookingReschedule, BookingBulkReschedule, BookingBulkResultItem, BookingBulkResult,
+)
 from app.schemas.file import File, FileCreate, FileUpdate
 from app.schemas.request import Request, RequestCreate, RequestUpdate, RequestMessage, RequestMessageCreate
+from app.schemas.calendar import CalendarSyncResult, CalendarSyncState, CalendarWatchCreate
+from app.schemas.search import SearchResult
+from app.schemas.dashboard import ProjectSummary, DashboardSummary
+from app.schemas.analytics import RequestThroughput, BookingUtilization, ProjectStorage
 
 __all__ = [
     "User", "UserCreate", "UserUpdate", "UserInDB", "Token", "TokenData",
-    "Project", "ProjectCreate", "ProjectUpdate",
+    "UserImportItem", "UserImportCreated", "UserImportSkipped", "UserImportResult", "InviteAccept",
+    "Project", "ProjectCreate", "ProjectUpdate", "ProjectMembersUpdate", "ProjectMembersResult",
     "Recording", "RecordingCreate", "RecordingUpdate",
-    "Booking", "BookingCreate", "BookingUpdate", "AvailabilitySlot", "AvailabilitySlotCreate",
+    "Booking", "BookingCreate", "BookingUpdate", "AvailabilitySlot", "AvailabilitySlotCreate", "TimeInterval", "FreeBusy",
+    "BookingBulkCancel", "BookingReschedule", "BookingBulkReschedule", "BookingBulkResultItem", "BookingBulkResult",
     "File", "FileCreate", "FileUpdate",
     "Request", "RequestCreate", "RequestUpdate", "RequestMessage", "RequestMessageCreate",
+    "CalendarSyncResult", "CalendarSyncState", "CalendarWatchCreate",
+    "SearchResult",
+    "ProjectSummary", "DashboardSummary",
+    "RequestThroughput", "BookingUtilization", "ProjectStorage",
 ]
@@ -0,0 +1,31 @@
+from pydantic import BaseModel
+from typing import Dict
+from datetime import datetime
+from app.models.booking import BookingStatus
+from app.models.request import RequestType, RequestStatus
+
+
+class RequestThroughput(BaseModel):
+    bucket_start: datetime
+    type: RequestType
+    status: RequestStatus
+    count: int
+
+
+class BookingUtilization(BaseModel):
+    bucket_start: datetime
+    slot_count: int
+    slot_minutes: int
+    booked_slot_count: int
+    booked_minutes: int
+    utilization: float  # booked_minutes / slot_minutes
+    bookings_by_status: Dict[BookingStatus, int]
+
+
+class ProjectStorage(BaseModel):
+    bucket_start: datetime
+    project_id: int
+    file_count: int
+    file_bytes: int
+    recording_count: int
+    recording_bytes: int
@@ -1,5 +1,5 @@
-from pydantic import BaseModel
-from typing import Optional
+from pydantic import BaseModel, Field
+from typing import Optional, List
 from datetime import datetime
 from app.models.booking import BookingStatus
 
@@ -41,6 +41,30 @@ class BookingUpdate(BaseModel):
     status: Optional[BookingStatus] = None
 
 
+class BookingBulkCancel(BaseModel):
+    booking_ids: List[int] = Field(..., min_length=1, max_length=500)
+
+
+class BookingReschedule(BaseModel):
+    booking_id: int
+    slot_id: int
+
+
+class BookingBulkReschedule(BaseModel):
+    items: List[BookingReschedule] = Field(..., min_length=1, max_length=500)
+
+
+class BookingBulkResultItem(BaseModel):
+    booking_id: int
+    success: bool
+    detail: Optional[str] = None
+    calendar_error: Optional[str] = None
+
+
+class BookingBulkResult(BaseModel):
+    results: List[BookingBulkResultItem]
+
+
 class Booking(BookingBase):
     id: int
     user_id: int
@@ -53,3 +77,18 @@ class Booking(BookingBase):
 
     class Config:
         from_attributes = True
+
+
+class TimeInterval(BaseModel):
+    start: datetime
+    end: datetime
+
+
+class FreeBusy(BaseModel):
+    start: datetime
+    end: datetime
+    duration_minutes: int
+    granularity_minutes: Optional[int] = None
+    free: List[TimeInterval] = []
+    busy: List[TimeInterval] = []
+    start_times: List[datetime] = []
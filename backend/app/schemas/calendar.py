@@ -0,0 +1,24 @@
+from pydantic import BaseModel
+from typing import Optional
+from datetime import datetime
+
+
+class CalendarSyncResult(BaseModel):
+    queued: bool = False
+    full_sync: Optional[bool] = None
+    events: int = 0
+    bookings_updated: int = 0
+
+
+class CalendarSyncState(BaseModel):
+    calendar_id: str
+    channel_id: Optional[str] = None
+    channel_expires_at: Optional[datetime] = None
+    last_synced_at: Optional[datetime] = None
+
+    class Config:
+        from_attributes = True
+
+
+class CalendarWatchCreate(BaseModel):
+    address: Optional[str] = None
@@ -0,0 +1,22 @@
+from pydantic import BaseModel
+from typing import Optional, List
+from datetime import datetime
+from app.models.project import ProjectStatus
+from app.schemas.booking import Booking
+
+
+class ProjectSummary(BaseModel):
+    project_id: int
+    name: str
+    status: ProjectStatus
+    file_count: int
+    recording_count: int
+    total_bytes: int
+    open_request_count: int
+    in_progress_request_count: int
+    updated_at: Optional[datetime] = None
+
+
+class DashboardSummary(BaseModel):
+    projects: List[ProjectSummary]
+    next_booking: Optional[Booking] = None
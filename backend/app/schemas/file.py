@@ -23,6 +23,7 @@ class File(FileBase):
     sharepoint_file_id: Optional[str] = None
     sharepoint_url: Optional[str] = None
     file_size_bytes: Optional[int] = None
+    content_sha256: Optional[str] = None
     mime_type: Optional[str] = None
     created_at: datetime
     updated_at: Optional[datetime] = None
@@ -25,6 +25,16 @@ class ProjectUpdate(BaseModel):
     user_ids: Optional[List[int]] = None
 
 
+class ProjectMembersUpdate(BaseModel):
+    add: List[int] = []
+    remove: List[int] = []
+
+
+class ProjectMembersResult(BaseModel):
+    added: List[int]  # Users that were not already members
+    removed: List[int]  # Users that were members
+
+
 class Project(ProjectBase):
     id: int
     created_at: datetime
@@ -24,6 +24,7 @@ class Recording(RecordingBase):
     sharepoint_url: Optional[str] = None
     duration_seconds: Optional[int] = None
     file_size_bytes: Optional[int] = None
+    content_sha256: Optional[str] = None
     created_at: datetime
     updated_at: Optional[datetime] = None
 
@@ -0,0 +1,12 @@
+from pydantic import BaseModel
+from typing import Optional
+
+
+class SearchResult(BaseModel):
+    kind: str  # request, message, file or recording
+    id: int
+    project_id: int
+    request_id: Optional[int] = None
+    title: str
+    highlight: str  # HTML-escaped text with matches wrapped in <mark>
+    rank: float
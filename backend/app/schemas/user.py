@@ -1,5 +1,5 @@
 from pydantic import BaseModel, EmailStr
-from typing import Optional
+from typing import Optional, List
 from datetime import datetime
 from app.models.user import UserRole
 
@@ -36,6 +36,32 @@ class UserInDB(User):
     hashed_password: str
 
 
+class UserImportItem(UserBase):
+    password: Optional[str] = None  # Without a password the user gets an invite token
+
+
+class UserImportCreated(BaseModel):
+    id: int
+    email: EmailStr
+    invite_token: Optional[str] = None  # Shown once; deliver it to the user
+
+
+class UserImportSkipped(BaseModel):
+    row: int  # 1-based position in the upload
+    email: Optional[str] = None
+    reason: str
+
+
+class UserImportResult(BaseModel):
+    created: List[UserImportCreated]
+    skipped: List[UserImportSkipped]
+
+
+class InviteAccept(BaseModel):
+    token: str
+    password: str
+
+
 class Token(BaseModel):
     access_token: str
     refresh_token: str
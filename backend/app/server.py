@@ -0,0 +1,28 @@
+import os
+from uvicorn.workers import UvicornWorker as BaseUvicornWorker
+from app.config import settings
+
+
+def cpu_count() -> int:
+    """CPUs this process may run on (respects affinity/cpusets, unlike os.cpu_count())"""
+    if hasattr(os, "sched_getaffinity"):
+        return len(os.sched_getaffinity(0))
+    return os.cpu_count() or 1
+
+
+def worker_count() -> int:
+    if settings.SERVER_WORKERS:
+        return settings.SERVER_WORKERS
+    # Each worker keeps its own database pool, so the cap also bounds Postgres connections
+    return min(2 * cpu_count() + 1, settings.SERVER_MAX_WORKERS)
+
+
+class UvicornWorker(BaseUvicornWorker):
+    """Gunicorn worker running the app on uvloop + httptools"""
+
+    CONFIG_KWARGS = {
+        "loop": "uvloop",
+        "http": "httptools",
+        # On SIGTERM, in-flight requests (e.g. uploads) get this long before being cancelled
+        "timeout_graceful_shutdown": settings.SERVER_GRACEFUL_TIMEOUT_SECONDS,
+    }
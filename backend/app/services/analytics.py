@@ -0,0 +1,295 @@
+from collections import defaultdict
+from datetime import datetime, timedelta, timezone
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+from sqlalchemy import case, event, func, inspect, literal_column
+from sqlalchemy.orm import Session
+from app.config import settings
+from app.models.analytics import AnalyticsRollup
+from app.models.booking import AvailabilitySlot, Booking
+from app.models.file import File
+from app.models.recording import Recording
+from app.models.request import Request
+
+GRANULARITIES = ("day", "week", "month")
+
+_STALE_KEY = "analytics_stale_buckets"
+
+
+def _as_utc(value: datetime) -> datetime:
+    return value.replace(tzinfo=timezone.utc) if value.tzinfo is None else value.astimezone(timezone.utc)
+
+
+def bucket_floor(value: datetime, granularity: str) -> datetime:
+    """Start of the UTC bucket containing value; weeks start on Monday"""
+    value = _as_utc(value).replace(hour=0, minute=0, second=0, microsecond=0)
+    if granularity == "week":
+        value -= timedelta(days=value.weekday())
+    elif granularity == "month":
+        value = value.replace(day=1)
+    return value
+
+
+def bucket_next(value: datetime, granularity: str) -> datetime:
+    if granularity == "month":
+        return value.replace(year=value.year + value.month // 12, month=value.month % 12 + 1)
+    return value + timedelta(days=7 if granularity == "week" else 1)
+
+
+def _bucket_expr(db: Session, column, granularity: str):
+    """SQL expression truncating a timestamp column to its UTC bucket"""
+    if db.get_bind().dialect.name == "postgresql":
+        # Literal granularity so SELECT and GROUP BY render the identical expression
+        return func.date_trunc(literal_column(f"'{granularity}'"), func.timezone("UTC", column))
+    if granularity == "week":
+        return func.date(column, "weekday 0", "-6 days")
+    return func.strftime("%Y-%m-01" if granularity == "month" else "%Y-%m-%d", column)
+
+
+def _minutes_expr(db: Session, start, end):
+    if db.get_bind().dialect.name == "postgresql":
+        return func.extract("epoch", end - start) / 60
+    return (func.julianday(end) - func.julianday(start)) * 1440
+
+
+def _bucket_key(value) -> datetime:
+    if isinstance(value, str):
+        value = datetime.fromisoformat(value)
+    return _as_utc(value)
+
+
+def _requests_rollup(db: Session, granularity: str, start: datetime, end: datetime) -> Dict[datetime, list]:
+    """Requests created per bucket by type and (current) status"""
+    bucket = _bucket_expr(db, Request.created_at, granularity)
+    rows = (
+        db.query(bucket, Request.type, Request.status, func.count())
+        .filter(Request.created_at >= start, Request.created_at < end)
+        .group_by(bucket, Request.type, Request.status)
+        .all()
+    )
+    result = defaultdict(list)
+    for bucket_start, request_type, request_status, count in rows:
+        result[_bucket_key(bucket_start)].append({
+            "type": request_type.value,
+            "status": request_status.value,
+            "count": count,
+        })
+    return result
+
+
+def _empty_booking_stats() -> dict:
+    return {
+        "slot_count": 0,
+        "slot_minutes": 0,
+        "booked_slot_count": 0,
+        "booked_minutes": 0,
+        "bookings_by_status": {},
+    }
+
+
+def _bookings_rollup(db: Session, granularity: str, start: datetime, end: datetime) -> Dict[datetime, dict]:
+    """Slot capacity vs booked time per bucket, plus bookings by status"""
+    result = defaultdict(_empty_booking_stats)
+
+    bucket = _bucket_expr(db, AvailabilitySlot.start_time, granularity)
+    minutes = _minutes_expr(db, AvailabilitySlot.start_time, AvailabilitySlot.end_time)
+    booked = AvailabilitySlot.is_available == False  # noqa: E712
+    rows = (
+        db.query(
+            bucket,
+            func.count(),
+            func.coalesce(func.sum(minutes), 0),
+            func.count(case((booked, 1))),
+            func.coalesce(func.sum(case((booked, minutes), else_=0)), 0),
+        )
+        .filter(AvailabilitySlot.start_time >= start, AvailabilitySlot.start_time < end)
+        .group_by(bucket)
+        .all()
+    )
+    for bucket_start, slot_count, slot_minutes, booked_count, booked_minutes in rows:
+        stats = result[_bucket_key(bucket_start)]
+        stats["slot_count"] = slot_count
+        stats["slot_minutes"] = round(float(slot_minutes))
+        stats["booked_slot_count"] = booked_count
+        stats["booked_minutes"] = round(float(booked_minutes))
+
+    bucket = _bucket_expr(db, Booking.start_time, granularity)
+    rows = (
+        db.query(bucket, Booking.status, func.count())
+        .filter(Booking.start_time >= start, Booking.start_time < end)
+        .group_by(bucket, Booking.status)
+        .all()
+    )
+    for bucket_start, booking_status, count in rows:
+        result[_bucket_key(bucket_start)]["bookings_by_status"][booking_status.value] = count
+
+    return result
+
+
+def _storage_rollup(db: Session, granularity: str, start: datetime, end: datetime) -> Dict[datetime, list]:
+    """Files and recordings added per bucket and project"""
+    per_project = defaultdict(lambda: {"file_count": 0, "file_bytes": 0, "recording_count": 0, "recording_bytes": 0})
+    for model, prefix in ((File, "file"), (Recording, "recording")):
+        bucket = _bucket_expr(db, model.created_at, granularity)
+        rows = (
+            db.query(bucket, model.project_id, func.count(), func.coalesce(func.sum(model.file_size_bytes), 0))
+            .filter(model.created_at >= start, model.created_at < end)
+            .group_by(bucket, model.project_id)
+            .all()
+        )
+        for bucket_start, project_id, count, size in rows:
+            stats = per_project[(_bucket_key(bucket_start), project_id)]
+            stats[f"{prefix}_count"] = count
+            stats[f"{prefix}_bytes"] = int(size)
+
+    result = defaultdict(list)
+    for (bucket_start, project_id), stats in sorted(per_project.items()):
+        result[bucket_start].append({"project_id": project_id, **stats})
+    return result
+
+
+# metric -> (aggregate over [start, end), value for a bucket without rows)
+METRICS: Dict[str, Tuple[Callable, Callable]] = {
+    "requests": (_requests_rollup, list),
+    "bookings": (_bookings_rollup, _empty_booking_stats),
+    "storage": (_storage_rollup, list),
+}
+
+# model -> (metric aggregating it, timestamp attribute its rows are bucketed by)
+BUCKETED_BY = {
+    Request: ("requests", "created_at"),
+    AvailabilitySlot: ("bookings", "start_time"),
+    Booking: ("bookings", "start_time"),
+    File: ("storage", "created_at"),
+    Recording: ("storage", "created_at"),
+}
+
+
+class AnalyticsService:
+    def buckets(self, granularity: str, start: Optional[datetime], end: Optional[datetime], default_count: int = 12) -> List[datetime]:
+        """Bucket starts covering [start, end); defaults to the last default_count buckets including the current one"""
+        # Buckets are inclusive of a partially covered last bucket
+        end = _as_utc(end) if end else datetime.now(timezone.utc)
+        stop = bucket_floor(end, granularity)
+        if stop < end:
+            stop = bucket_next(stop, granularity)
+        if start:
+            current = bucket_floor(start, granularity)
+        else:
+            current = stop
+            for _ in range(default_count):
+                current = bucket_floor(current - timedelta(days=1), granularity)
+
+        buckets = []
+        while current < stop:
+            buckets.append(current)
+            if len(buckets) > settings.ANALYTICS_MAX_BUCKETS:
+                raise ValueError(f"Range exceeds {settings.ANALYTICS_MAX_BUCKETS} buckets")
+            current = bucket_next(current, granularity)
+        return buckets
+
+    def _is_fresh(self, rollup: AnalyticsRollup, granularity: str, now: datetime) -> bool:
+        computed_at = _as_utc(rollup.computed_at)
+        # Closed when computed: kept until a write to its rows deletes it. Open (current or future): reuse for a short TTL
+        bucket_end = bucket_next(_as_utc(rollup.bucket_start), granularity)
+        return computed_at >= bucket_end or computed_at >= now - timedelta(seconds=settings.ANALYTICS_OPEN_BUCKET_TTL_SECONDS)
+
+    def mark_stale(self, session: Session, metric: str, timestamps: Optional[Iterable[datetime]] = None) -> None:
+        """Drop the metric's rollups for the buckets containing timestamps (all of them if None) when session commits"""
+        stale = session.info.setdefault(_STALE_KEY, defaultdict(set))
+        if timestamps is None:
+            stale[metric].add(None)
+        else:
+            stale[metric].update(_as_utc(value) for value in timestamps if value is not None)
+
+    def invalidate(self, db: Session, stale: Dict[str, set]) -> None:
+        for metric, timestamps in stale.items():
+            query = db.query(AnalyticsRollup).filter(AnalyticsRollup.metric == metric)
+            if None not in timestamps:
+                # A bucket start of any granularity; the odd extra match is only recomputed
+                starts = {bucket_floor(value, granularity) for value in timestamps for granularity in GRANULARITIES}
+                query = query.filter(AnalyticsRollup.bucket_start.in_(starts))
+            query.delete(synchronize_session=False)
+
+    def _store(self, db: Session, metric: str, granularity: str, values: Dict[datetime, object], now: datetime) -> None:
+        if db.get_bind().dialect.name == "postgresql":
+            from sqlalchemy.dialects.postgresql import insert
+        else:
+            from sqlalchemy.dialects.sqlite import insert
+
+        statement = insert(AnalyticsRollup).values([
+            {"metric": metric, "granularity": granularity, "bucket_start": bucket_start, "data": data, "computed_at": now}
+            for bucket_start, data in values.items()
+        ])
+        statement = statement.on_conflict_do_update(
+            index_elements=["metric", "granularity", "bucket_start"],
+            set_={"data": statement.excluded.data, "computed_at": statement.excluded.computed_at}
+        )
+        db.execute(statement)
+        db.commit()
+
+    def get_rollups(
+        self,
+        db: Session,
+        metric: str,
+        granularity: str,
+        buckets: List[datetime],
+        refresh: bool = False
+    ) -> List[Tuple[datetime, object]]:
+        """Cached rollups for the buckets, recomputing only missing or stale ones in a single aggregate"""
+        aggregate, empty = METRICS[metric]
+        now = datetime.now(timezone.utc)
+
+        cached = {}
+        if not refresh:
+            rollups = (
+                db.query(AnalyticsRollup)
+                .filter(
+                    AnalyticsRollup.metric == metric,
+                    AnalyticsRollup.granularity == granularity,
+                    AnalyticsRollup.bucket_start >= buckets[0],
+                    AnalyticsRollup.bucket_start <= buckets[-1]
+                )
+                .all()
+            )
+            cached = {
+                _as_utc(rollup.bucket_start): rollup.data
+                for rollup in rollups
+                if self._is_fresh(rollup, granularity, now)
+            }
+
+        stale = [bucket_start for bucket_start in buckets if bucket_start not in cached]
+        if stale:
+            computed = aggregate(db, granularity, stale[0], bucket_next(stale[-1], granularity))
+            values = {bucket_start: computed.get(bucket_start) or empty() for bucket_start in stale}
+            self._store(db, metric, granularity, values, now)
+            cached.update(values)
+
+        return [(bucket_start, cached[bucket_start]) for bucket_start in buckets]
+
+
+@event.listens_for(Session, "after_flush")
+def _collect_stale_buckets(session, flush_context):
+    for obj in (*session.new, *session.dirty, *session.deleted):
+        bucketed = BUCKETED_BY.get(type(obj))
+        if bucketed:
+            metric, attribute = bucketed
+            # History covers rows moved between buckets (old and new timestamp); status changes keep the unchanged one
+            history = inspect(obj).attrs[attribute].history
+            analytics_service.mark_stale(session, metric, (*history.added, *history.unchanged, *history.deleted))
+
+
+@event.listens_for(Session, "before_commit")
+def _invalidate_stale_rollups(session):
+    session.flush()
+    stale = session.info.pop(_STALE_KEY, None)
+    if stale:
+        analytics_service.invalidate(session, stale)
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_stale_buckets(session):
+    session.info.pop(_STALE_KEY, None)
+
+
+# Singleton instance
+analytics_service = AnalyticsService()
@@ -0,0 +1,162 @@
+import threading
+import time
+from collections import OrderedDict
+from datetime import datetime, timedelta, timezone
+from typing import Dict, List, Optional, Tuple
+from sqlalchemy.orm import Session
+from app.config import settings
+from app.models.booking import Booking, BookingStatus, AvailabilitySlot
+
+Interval = Tuple[datetime, datetime]
+
+
+def _as_utc(value: datetime) -> datetime:
+    """Treat naive datetimes as UTC so they compare against timestamptz columns"""
+    if value.tzinfo is None:
+        return value.replace(tzinfo=timezone.utc)
+    return value.astimezone(timezone.utc)
+
+
+def _merge(intervals: List[Interval]) -> List[Interval]:
+    """Merge overlapping or touching intervals"""
+    merged: List[Interval] = []
+    for start, end in sorted(intervals):
+        if merged and start <= merged[-1][1]:
+            if end > merged[-1][1]:
+                merged[-1] = (merged[-1][0], end)
+        else:
+            merged.append((start, end))
+    return merged
+
+
+def sweep_free_intervals(
+    slots: List[Interval],
+    busy: List[Interval],
+    window_start: datetime,
+    window_end: datetime
+) -> List[Interval]:
+    """Compute open intervals inside the window in a single sweep over slot and busy edges"""
+    events: Dict[datetime, List[int]] = {}
+    for intervals, index in ((slots, 0), (busy, 1)):
+        for start, end in intervals:
+            start, end = max(start, window_start), min(end, window_end)
+            if start >= end:
+                continue
+            events.setdefault(start, [0, 0])[index] += 1
+            events.setdefault(end, [0, 0])[index] -= 1
+
+    free: List[Interval] = []
+    open_slots = open_busy = 0
+    edges = sorted(events)
+    for current, following in zip(edges, edges[1:] + [None]):
+        open_slots += events[current][0]
+        open_busy += events[current][1]
+        if following is None or open_slots <= 0 or open_busy > 0:
+            continue
+        if free and free[-1][1] == current:
+            free[-1] = (free[-1][0], following)
+        else:
+            free.append((current, following))
+    return free
+
+
+def candidate_start_times(
+    free: List[Interval],
+    duration: timedelta,
+    granularity: timedelta
+) -> List[datetime]:
+    """List start times, aligned to the granularity, at which a meeting of the given duration fits"""
+    step = granularity.total_seconds()
+    starts: List[datetime] = []
+    for start, end in free:
+        offset = start.timestamp() % step
+        cursor = start if offset == 0 else start + timedelta(seconds=step - offset)
+        while cursor + duration <= end:
+            starts.append(cursor)
+            cursor += granularity
+    return starts
+
+
+class AvailabilityService:
+    def __init__(self):
+        self.ttl_seconds = settings.AVAILABILITY_CACHE_TTL_SECONDS
+        self.max_entries = settings.AVAILABILITY_CACHE_MAX_ENTRIES
+        # LRU: windows are chosen by clients, so the number of distinct keys is unbounded
+        self._cache: "OrderedDict[tuple, Tuple[int, float, dict]]" = OrderedDict()
+        self._version = 0
+        self._lock = threading.Lock()
+
+    def invalidate(self) -> None:
+        """Drop cached windows after a slot or booking changes"""
+        with self._lock:
+            self._version += 1
+            self._cache.clear()
+
+    def get_free_busy(
+        self,
+        db: Session,
+        window_start: datetime,
+        window_end: datetime,
+        duration_minutes: int,
+        granularity_minutes: Optional[int] = None
+    ) -> dict:
+        """Return free and busy intervals for a window, served from cache when nothing changed"""
+        window_start, window_end = _as_utc(window_start), _as_utc(window_end)
+        key = (window_start, window_end, duration_minutes, granularity_minutes)
+
+        with self._lock:
+            version = self._version
+            cached = self._cache.get(key)
+            if cached:
+                self._cache.move_to_end(key)
+        if cached and cached[0] == version and time.monotonic() - cached[1] < self.ttl_seconds:
+            return cached[2]
+
+        slot_rows = db.query(AvailabilitySlot.start_time, AvailabilitySlot.end_time).filter(
+            AvailabilitySlot.is_available == True,
+            AvailabilitySlot.start_time < window_end,
+            AvailabilitySlot.end_time > window_start
+        ).all()
+        booking_rows = db.query(Booking.start_time, Booking.end_time).filter(
+            Booking.status == BookingStatus.CONFIRMED,
+            Booking.start_time < window_end,
+            Booking.end_time > window_start
+        ).all()
+
+        slots = [(_as_utc(start), _as_utc(end)) for start, end in slot_rows]
+        busy = _merge([
+            (max(_as_utc(start), window_start), min(_as_utc(end), window_end))
+            for start, end in booking_rows
+        ])
+
+        duration = timedelta(minutes=duration_minutes)
+        free = [
+            (start, end)
+            for start, end in sweep_free_intervals(slots, busy, window_start, window_end)
+            if end - start >= duration
+        ]
+        start_times = []
+        if granularity_minutes:
+            start_times = candidate_start_times(free, duration, timedelta(minutes=granularity_minutes))
+
+        result = {
+            "start": window_start,
+            "end": window_end,
+            "duration_minutes": duration_minutes,
+            "granularity_minutes": granularity_minutes,
+            "free": [{"start": start, "end": end} for start, end in free],
+            "busy": [{"start": start, "end": end} for start, end in busy],
+            "start_times": start_times,
+        }
+
+        with self._lock:
+            if self._version == version:
+                self._cache[key] = (version, time.monotonic(), result)
+                self._cache.move_to_end(key)
+                while len(self._cache) > self.max_entries:
+                    self._cache.popitem(last=False)
+        return result
+
+
+# Singleton instance
+availability_service = AvailabilityService()
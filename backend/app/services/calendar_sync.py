@@ -0,0 +1,204 @@
+import asyncio
+import secrets
+import uuid
+from datetime import datetime, timedelta, timezone
+from typing import Optional
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session, joinedload
+from starlette.concurrency import run_in_threadpool
+from app.config import settings
+from app.database import SessionLocal
+from app.models.booking import Booking, BookingStatus
+from app.models.calendar_sync import CalendarSyncState
+from app.services.availability import availability_service
+from app.services.google_calendar import google_calendar_service, SyncTokenExpired
+
+# Fetch-and-apply rounds before leaving the changes to the syncs that keep moving the cursor
+SYNC_ATTEMPTS = 3
+
+
+def _event_time(value: Optional[dict]) -> Optional[datetime]:
+    """Parse an event start/end; all-day events (no dateTime) are ignored"""
+    if not value or "dateTime" not in value:
+        return None
+    return datetime.fromisoformat(value["dateTime"].replace("Z", "+00:00"))
+
+
+class CalendarSyncService:
+    def __init__(self):
+        self.calendar_id = settings.GOOGLE_CALENDAR_ID
+        self._lock = asyncio.Lock()
+        self._pending = False
+
+    def get_state(self, db: Session, lock: bool = False) -> CalendarSyncState:
+        """Get (or create) the sync state row for the configured calendar"""
+        query = db.query(CalendarSyncState).filter(CalendarSyncState.calendar_id == self.calendar_id)
+        if lock:
+            query = query.with_for_update()
+        state = query.first()
+        if not state:
+            try:
+                # Savepoint: a worker creating the row concurrently must not abort this transaction
+                with db.begin_nested():
+                    state = CalendarSyncState(calendar_id=self.calendar_id)
+                    db.add(state)
+            except IntegrityError:
+                state = query.first()
+        return state
+
+    def apply_changes(self, db: Session, events: list) -> int:
+        """Reconcile changed Google events with Booking rows; returns the number of bookings updated"""
+        changes = {event["id"]: event for event in events if event.get("id")}
+        if not changes:
+            return 0
+
+        bookings = (
+            db.query(Booking)
+            .options(joinedload(Booking.slot))
+            .filter(Booking.google_event_id.in_(list(changes)))
+            .all()
+        )
+
+        updated = 0
+        for booking in bookings:
+            event = changes[booking.google_event_id]
+            if event.get("status") == "cancelled":
+                if booking.status != BookingStatus.CANCELLED:
+                    booking.status = BookingStatus.CANCELLED
+                    if booking.slot:
+                        # Detach it too, or the freed slot still counts as booked in create_booking
+                        booking.slot.is_available = True
+                        booking.slot = None
+                    updated += 1
+                continue
+
+            start_time = _event_time(event.get("start"))
+            end_time = _event_time(event.get("end"))
+            changed = False
+            if start_time and start_time != booking.start_time:
+                booking.start_time = start_time
+                changed = True
+            if end_time and end_time != booking.end_time:
+                booking.end_time = end_time
+                changed = True
+            if event.get("summary") and event["summary"] != booking.title:
+                booking.title = event["summary"]
+                changed = True
+            if event.get("hangoutLink") and event["hangoutLink"] != booking.meeting_link:
+                booking.meeting_link = event["hangoutLink"]
+                changed = True
+            updated += changed
+        return updated
+
+    def _read_token(self, db: Session) -> Optional[str]:
+        state = self.get_state(db)
+        token = state.sync_token
+        db.commit()
+        return token
+
+    def _apply_delta(self, db: Session, expected_token: Optional[str], events: list, next_token: str) -> Optional[int]:
+        """Apply a delta fetched from expected_token and advance the cursor; None if another sync already moved it"""
+        # Short row lock, never held across Google calls: compare and set the cursor so each delta is applied once
+        state = self.get_state(db, lock=True)
+        if state.sync_token != expected_token:
+            db.rollback()
+            return None
+        updated = self.apply_changes(db, events)
+        state.sync_token = next_token
+        state.last_synced_at = datetime.now(timezone.utc)
+        db.commit()
+        return updated
+
+    async def _sync_once(self, db: Session) -> dict:
+        # Database work runs in the threadpool so a sync never blocks the event loop
+        for _ in range(SYNC_ATTEMPTS):
+            token = await run_in_threadpool(self._read_token, db)
+            full_sync = token is None
+            try:
+                events, next_token = await google_calendar_service.list_event_changes(token)
+            except SyncTokenExpired:
+                full_sync = True
+                events, next_token = await google_calendar_service.list_event_changes(None)
+
+            updated = await run_in_threadpool(self._apply_delta, db, token, events, next_token)
+            if updated is None:
+                # Fetch again from the cursor the other sync stored; it may not have seen the latest changes
+                continue
+            if updated:
+                availability_service.invalidate()
+            return {"full_sync": full_sync, "events": len(events), "bookings_updated": updated}
+
+        # Other workers keep advancing the cursor; their syncs cover these changes
+        return {"queued": True}
+
+    async def sync(self, db: Optional[Session] = None) -> dict:
+        """Pull changes since the stored sync token and apply them; bursts of calls coalesce into one rerun"""
+        if self._lock.locked():
+            self._pending = True
+            return {"queued": True}
+
+        async with self._lock:
+            own_session = db is None
+            db = db or SessionLocal()
+            try:
+                result = await self._sync_once(db)
+                while self._pending:
+                    self._pending = False
+                    result = await self._sync_once(db)
+                return result
+            except Exception:
+                await run_in_threadpool(db.rollback)
+                raise
+            finally:
+                if own_session:
+                    db.close()
+
+    async def run_background_sync(self) -> None:
+        """Entry point for background tasks; failures are logged, not raised"""
+        try:
+            await self.sync()
+        except Exception as e:
+            print(f"Failed to sync Google Calendar: {e}")
+
+    def verify_notification(self, db: Session, channel_id: Optional[str], token: Optional[str]) -> bool:
+        """Check that a push notification belongs to our active channel"""
+        state = self.get_state(db)
+        return bool(
+            state.channel_id
+            and channel_id == state.channel_id
+            and token
+            and secrets.compare_digest(token, state.channel_token or "")
+        )
+
+    async def start_watch(self, db: Session, address: Optional[str] = None) -> CalendarSyncState:
+        """Open a push channel (replacing any existing one) pointing at the webhook address"""
+        address = address or settings.GOOGLE_WEBHOOK_URL
+        if not address:
+            raise ValueError("GOOGLE_WEBHOOK_URL is not configured")
+
+        state = self.get_state(db)
+        if state.channel_id and state.channel_resource_id:
+            try:
+                await google_calendar_service.stop_channel(state.channel_id, state.channel_resource_id)
+            except Exception as e:
+                print(f"Failed to stop previous calendar channel: {e}")
+
+        channel_id = str(uuid.uuid4())
+        token = secrets.token_urlsafe(32)
+        ttl = settings.GOOGLE_WEBHOOK_CHANNEL_TTL_SECONDS
+        channel = await google_calendar_service.watch_events(channel_id, address, token, ttl)
+
+        state.channel_id = channel_id
+        state.channel_token = token
+        state.channel_resource_id = channel.get("resourceId")
+        if channel.get("expiration"):
+            state.channel_expires_at = datetime.fromtimestamp(int(channel["expiration"]) / 1000, tz=timezone.utc)
+        else:
+            state.channel_expires_at = datetime.now(timezone.utc) + timedelta(seconds=ttl)
+        db.commit()
+        db.refresh(state)
+        return state
+
+
+# Singleton instance
+calendar_sync_service = CalendarSyncService()
@@ -0,0 +1,249 @@
+from collections import Counter, defaultdict
+from datetime import datetime, timezone
+from typing import Dict, Iterable, Optional
+from sqlalchemy import Select, event, func, inspect, select, case
+from sqlalchemy.orm import Session
+from app.models.booking import Booking, BookingStatus
+from app.models.dashboard import ProjectSummary
+from app.models.file import File
+from app.models.project import Project, project_users
+from app.models.recording import Recording
+from app.models.request import Request, RequestStatus
+from app.models.user import User, UserRole
+
+# Models whose writes change a project's dashboard counters -> attributes their contribution depends on
+SUMMARY_MODELS = {
+    File: ("project_id", "file_size_bytes"),
+    Recording: ("project_id", "file_size_bytes"),
+    Request: ("project_id", "status"),
+}
+
+COUNTERS = ("file_count", "recording_count", "total_bytes", "open_request_count", "in_progress_request_count")
+
+_DELTAS_KEY = "dashboard_summary_deltas"
+
+
+def _summary_select(project_ids: Iterable[int]):
+    """Aggregate counters for the given projects; each subquery uses the project_id index"""
+    file_stats = (
+        select(File.project_id, func.count().label("count"), func.coalesce(func.sum(File.file_size_bytes), 0).label("bytes"))
+        .where(File.project_id.in_(project_ids))
+        .group_by(File.project_id)
+        .subquery()
+    )
+    recording_stats = (
+        select(Recording.project_id, func.count().label("count"), func.coalesce(func.sum(Recording.file_size_bytes), 0).label("bytes"))
+        .where(Recording.project_id.in_(project_ids))
+        .group_by(Recording.project_id)
+        .subquery()
+    )
+    request_stats = (
+        select(
+            Request.project_id,
+            func.count(case((Request.status == RequestStatus.OPEN, 1))).label("open"),
+            func.count(case((Request.status == RequestStatus.IN_PROGRESS, 1))).label("in_progress"),
+        )
+        .where(Request.project_id.in_(project_ids))
+        .group_by(Request.project_id)
+        .subquery()
+    )
+    return (
+        select(
+            Project.id.label("project_id"),
+            func.coalesce(file_stats.c.count, 0).label("file_count"),
+            func.coalesce(recording_stats.c.count, 0).label("recording_count"),
+            (func.coalesce(file_stats.c.bytes, 0) + func.coalesce(recording_stats.c.bytes, 0)).label("total_bytes"),
+            func.coalesce(request_stats.c.open, 0).label("open_request_count"),
+            func.coalesce(request_stats.c.in_progress, 0).label("in_progress_request_count"),
+            func.now().label("updated_at"),
+        )
+        .outerjoin(file_stats, file_stats.c.project_id == Project.id)
+        .outerjoin(recording_stats, recording_stats.c.project_id == Project.id)
+        .outerjoin(request_stats, request_stats.c.project_id == Project.id)
+        .where(Project.id.in_(project_ids))
+    )
+
+
+class DashboardService:
+    def apply_deltas(self, db: Session, deltas: Dict[int, Counter]) -> None:
+        """Add per-project counter deltas to the summary rows, creating missing ones"""
+        rows = [
+            {"project_id": project_id, **{counter: changes[counter] for counter in COUNTERS}}
+            for project_id, changes in sorted(deltas.items())
+            if any(changes.values())
+        ]
+        if not rows:
+            return
+
+        if db.get_bind().dialect.name == "postgresql":
+            from sqlalchemy.dialects.postgresql import insert
+        else:
+            from sqlalchemy.dialects.sqlite import insert
+
+        # Relative updates: concurrent writers only wait on the summary row for their own upsert
+        statement = insert(ProjectSummary).values(rows)
+        statement = statement.on_conflict_do_update(
+            index_elements=[ProjectSummary.project_id],
+            set_={
+                **{counter: getattr(ProjectSummary, counter) + statement.excluded[counter] for counter in COUNTERS},
+                "updated_at": func.now(),
+            }
+        )
+        db.execute(statement)
+
+    def rebuild(self, db: Session, project_ids: Optional[Iterable[int]] = None) -> None:
+        """Recompute summary rows from scratch for the given projects (all projects when omitted)"""
+        if project_ids is None:
+            project_ids = select(Project.id)
+        else:
+            project_ids = sorted(set(project_ids))
+            if not project_ids:
+                return
+
+        if db.get_bind().dialect.name == "postgresql":
+            from sqlalchemy.dialects.postgresql import insert
+            if not isinstance(project_ids, Select):
+                # Serialize rebuilds per project so they cannot overwrite each other's counts;
+                # NO KEY UPDATE does not block inserts referencing the project
+                db.execute(
+                    select(Project.id)
+                    .where(Project.id.in_(project_ids))
+                    .order_by(Project.id)
+                    .with_for_update(key_share=True)
+                )
+        else:
+            from sqlalchemy.dialects.sqlite import insert
+
+        source = _summary_select(project_ids)
+        statement = insert(ProjectSummary).from_select([c.name for c in source.selected_columns], source)
+        statement = statement.on_conflict_do_update(
+            index_elements=[ProjectSummary.project_id],
+            set_={
+                column: statement.excluded[column]
+                for column in (
+                    "file_count", "recording_count", "total_bytes",
+                    "open_request_count", "in_progress_request_count", "updated_at",
+                )
+            }
+        )
+        db.execute(statement)
+
+    def get_summary(self, db: Session, user: User) -> dict:
+        """Project cards and next booking for the user's dashboard"""
+        query = (
+            db.query(Project, ProjectSummary)
+            .outerjoin(ProjectSummary, ProjectSummary.project_id == Project.id)
+            .order_by(Project.name)
+        )
+        if user.role != UserRole.ADMIN:
+            query = query.join(project_users, project_users.c.project_id == Project.id).filter(
+                project_users.c.user_id == user.id
+            )
+
+        projects = []
+        for project, summary in query.all():
+            projects.append({
+                "project_id": project.id,
+                "name": project.name,
+                "status": project.status,
+                "file_count": summary.file_count if summary else 0,
+                "recording_count": summary.recording_count if summary else 0,
+                "total_bytes": summary.total_bytes if summary else 0,
+                "open_request_count": summary.open_request_count if summary else 0,
+                "in_progress_request_count": summary.in_progress_request_count if summary else 0,
+                "updated_at": summary.updated_at if summary else None,
+            })
+
+        # Bookings belong to users, not projects, so the next one is per user
+        next_booking = (
+            db.query(Booking)
+            .filter(
+                Booking.user_id == user.id,
+                Booking.start_time >= datetime.now(timezone.utc),
+                Booking.status.in_([BookingStatus.PENDING, BookingStatus.CONFIRMED])
+            )
+            .order_by(Booking.start_time)
+            .first()
+        )
+
+        return {"projects": projects, "next_booking": next_booking}
+
+
+def _contribution(obj, old: bool) -> Optional[tuple]:
+    """(project_id, counters) a row adds to its project, before (old) or after this flush"""
+    values = {}
+    for attribute in SUMMARY_MODELS[type(obj)]:
+        history = inspect(obj).attrs[attribute].history
+        current = (history.deleted if old else history.added) or history.unchanged
+        values[attribute] = current[0] if current else None
+    if values["project_id"] is None:
+        return None
+
+    if isinstance(obj, Request):
+        counters = {
+            "open_request_count": int(values["status"] == RequestStatus.OPEN),
+            "in_progress_request_count": int(values["status"] == RequestStatus.IN_PROGRESS),
+        }
+    else:
+        prefix = "file" if isinstance(obj, File) else "recording"
+        counters = {f"{prefix}_count": 1, "total_bytes": values["file_size_bytes"] or 0}
+    return values["project_id"], counters
+
+
+def _add_contribution(deltas: Dict[int, Counter], contribution: Optional[tuple], sign: int) -> None:
+    if contribution:
+        project_id, counters = contribution
+        deltas[project_id].update({counter: sign * value for counter, value in counters.items()})
+
+
+def _track_old_values(model, attribute):
+    # Load the previous value when an expired attribute is set, so the old contribution is known
+    event.listen(getattr(model, attribute), "set", lambda target, value, oldvalue, initiator: None, active_history=True)
+
+
+for _model, _attributes in SUMMARY_MODELS.items():
+    for _attribute in _attributes:
+        _track_old_values(_model, _attribute)
+
+
+@event.listens_for(Session, "before_flush")
+def _load_deleted_contributions(session, flush_context, instances):
+    # After the flush a deleted row can no longer load what it contributed
+    for obj in session.deleted:
+        for attribute in SUMMARY_MODELS.get(type(obj), ()):
+            getattr(obj, attribute)
+
+
+@event.listens_for(Session, "after_flush")
+def _collect_summary_deltas(session, flush_context):
+    deltas = session.info.setdefault(_DELTAS_KEY, defaultdict(Counter))
+    for obj in (*session.new, *session.dirty, *session.deleted):
+        if type(obj) not in SUMMARY_MODELS or (obj in session.dirty and not session.is_modified(obj)):
+            continue
+        # A moved or changed row takes back what it added before and adds its new contribution
+        if obj not in session.new:
+            _add_contribution(deltas, _contribution(obj, old=True), -1)
+        if obj not in session.deleted:
+            _add_contribution(deltas, _contribution(obj, old=False), 1)
+    for obj in session.deleted:
+        if isinstance(obj, Project):
+            # Its summary row goes with it
+            deltas.pop(obj.id, None)
+
+
+@event.listens_for(Session, "before_commit")
+def _apply_summary_deltas(session):
+    # Flush first so the summaries include this transaction's writes and commit with them
+    session.flush()
+    deltas = session.info.pop(_DELTAS_KEY, None)
+    if deltas:
+        dashboard_service.apply_deltas(session, deltas)
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_summary_deltas(session):
+    session.info.pop(_DELTAS_KEY, None)
+
+
+# Singleton instance
+dashboard_service = DashboardService()
@@ -1,30 +1,112 @@
-from google.oauth2.credentials import Credentials
-from google.auth.transport.requests import Request
-from googleapiclient.discovery import build
-from googleapiclient.errors import HttpError
+import asyncio
+import json
+import time
+import uuid
+import httpx
+from collections import OrderedDict
 from datetime import datetime
-from typing import Optional, List
+from typing import Optional, List, Dict, Tuple, Union
+from urllib.parse import quote, urlencode, urlsplit
 from app.config import settings
+from app.utils.metrics import observe_outbound
+from app.utils.tracing import span
+
+# Google rejects batch requests with more than 50 calls
+BATCH_LIMIT = 50
+
+
+class SyncTokenExpired(Exception):
+    """Google invalidated the stored sync token (HTTP 410); a full sync is required"""
 
 
 class GoogleCalendarService:
-    def __init__(self):
+    def __init__(self, transport: Optional[httpx.AsyncBaseTransport] = None):
         self.calendar_id = settings.GOOGLE_CALENDAR_ID
-        self.credentials = None
-        
-    def _get_service(self):
-        """Get Google Calendar service"""
-        # In production, you'd implement OAuth flow to get user credentials
-        # For now, this is a placeholder that would need proper OAuth implementation
-        if not self.credentials:
-            # You'll need to implement proper OAuth flow
-            # This is just a skeleton
+        self.client_id = settings.GOOGLE_CLIENT_ID
+        self.client_secret = settings.GOOGLE_CLIENT_SECRET
+        self.refresh_token = settings.GOOGLE_REFRESH_TOKEN
+        self.api_url = f"{settings.GOOGLE_API_URL}/calendar/v3"
+        self.batch_url = f"{settings.GOOGLE_API_URL}/batch/calendar/v3"
+        self.token_url = settings.GOOGLE_TOKEN_URL
+        self._transport = transport
+        self._client: Optional[httpx.AsyncClient] = None
+        self._access_token: Optional[str] = None
+        self._token_expires_at = 0.0
+        self._token_lock = asyncio.Lock()
+        self._event_cache: "OrderedDict[str, dict]" = OrderedDict()
+        self._pending_updates: Dict[str, dict] = {}
+
+    def _get_client(self) -> httpx.AsyncClient:
+        """Get the shared HTTP client (connections are pooled and kept alive across calls)"""
+        if self._client is None:
+            self._client = httpx.AsyncClient(
+                transport=self._transport,
+                timeout=settings.GOOGLE_HTTP_TIMEOUT_SECONDS,
+                limits=httpx.Limits(
+                    max_connections=settings.GOOGLE_HTTP_MAX_CONNECTIONS,
+                    max_keepalive_connections=settings.GOOGLE_HTTP_MAX_CONNECTIONS,
+                ),
+            )
+        return self._client
+
+    async def close(self) -> None:
+        """Close pooled connections"""
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+    def is_configured(self) -> bool:
+        return bool(self.client_id and self.client_secret and self.refresh_token)
+
+    async def _get_access_token(self) -> str:
+        """Get an OAuth access token, refreshing it without blocking the event loop"""
+        if self._access_token and time.monotonic() < self._token_expires_at:
+            return self._access_token
+
+        if not self.refresh_token:
+            # In production, you'd implement OAuth flow to get user credentials
             raise NotImplementedError(
                 "Google Calendar OAuth flow needs to be implemented. "
-                "Store credentials in database per admin user."
+                "Set GOOGLE_REFRESH_TOKEN for the calendar owner."
             )
-        
-        return build('calendar', 'v3', credentials=self.credentials)
+
+        with span("google_calendar.get_access_token"):
+            async with self._token_lock:
+                if self._access_token and time.monotonic() < self._token_expires_at:
+                    return self._access_token
+
+                response = await self._get_client().post(self.token_url, data={
+                    "grant_type": "refresh_token",
+                    "refresh_token": self.refresh_token,
+                    "client_id": self.client_id,
+                    "client_secret": self.client_secret,
+                })
+                if response.status_code != 200:
+                    raise Exception(f"Failed to refresh Google access token: {response.text}")
+
+                result = response.json()
+                self._access_token = result["access_token"]
+                # Refresh a minute early so in-flight calls never carry an expired token
+                self._token_expires_at = time.monotonic() + result.get("expires_in", 3600) - 60
+                return self._access_token
+
+    def _events_url(self, event_id: Optional[str] = None) -> str:
+        url = f"{self.api_url}/calendars/{quote(self.calendar_id, safe='')}/events"
+        if event_id:
+            url = f"{url}/{quote(event_id, safe='')}"
+        return url
+
+    # Measured per HTTP call (batches included): public methods may coalesce, page or batch several, or make none
+    @observe_outbound("google_calendar", "request")
+    async def _request(self, method: str, url: str, **kwargs) -> httpx.Response:
+        """Send an authorized request to the Calendar API"""
+        token = await self._get_access_token()
+        headers = {"Authorization": f"Bearer {token}"}
+        headers.update(kwargs.pop("headers", {}))
+
+        response = await self._get_client().request(method, url, headers=headers, **kwargs)
+        response.raise_for_status()
+        return response
 
     async def create_event(
         self,
@@ -36,8 +118,6 @@ class GoogleCalendarService:
         meeting_link: bool = True
     ) -> dict:
         """Create a calendar event"""
-        service = self._get_service()
-        
         event = {
             'summary': summary,
             'description': description,
@@ -50,10 +130,10 @@ class GoogleCalendarService:
                 'timeZone': 'America/Sao_Paulo',
             },
         }
-        
+
         if attendee_emails:
             event['attendees'] = [{'email': email} for email in attendee_emails]
-        
+
         if meeting_link:
             event['conferenceData'] = {
                 'createRequest': {
@@ -61,19 +141,72 @@ class GoogleCalendarService:
                     'conferenceSolutionKey': {'type': 'hangoutsMeet'}
                 }
             }
-        
+
         try:
-            created_event = service.events().insert(
-                calendarId=self.calendar_id,
-                body=event,
-                conferenceDataVersion=1 if meeting_link else 0,
-                sendUpdates='all'
-            ).execute()
-            
-            return created_event
-        except HttpError as error:
+            response = await self._request(
+                "POST",
+                self._events_url(),
+                params={
+                    'conferenceDataVersion': 1 if meeting_link else 0,
+                    'sendUpdates': 'all',
+                },
+                json=event
+            )
+            return self._remember(response.json())
+        except httpx.HTTPError as error:
             raise Exception(f"Failed to create calendar event: {error}")
 
+    def _remember(self, event: dict) -> dict:
+        """Cache an event by ID with its etag; cancelled events are dropped"""
+        event_id = event.get('id')
+        if not event_id:
+            return event
+        if event.get('status') == 'cancelled':
+            self._event_cache.pop(event_id, None)
+            return event
+        self._event_cache[event_id] = event
+        self._event_cache.move_to_end(event_id)
+        while len(self._event_cache) > settings.GOOGLE_EVENT_CACHE_SIZE:
+            self._event_cache.popitem(last=False)
+        return event
+
+    def _forget(self, event_id: str) -> None:
+        self._event_cache.pop(event_id, None)
+
+    async def _patch_event(self, event_id: str, fields: dict) -> dict:
+        """PATCH only the fields that differ from the cached copy, refetching once on an etag conflict"""
+        url = self._events_url(event_id)
+        cached = self._event_cache.get(event_id)
+        for attempt in range(2):
+            body = fields if cached is None else {k: v for k, v in fields.items() if cached.get(k) != v}
+            if cached is not None and not body:
+                return cached
+
+            headers = {'If-Match': cached['etag']} if cached and cached.get('etag') else {}
+            try:
+                response = await self._request(
+                    "PATCH",
+                    url,
+                    params={'sendUpdates': 'all'},
+                    headers=headers,
+                    json=body
+                )
+                return self._remember(response.json())
+            except httpx.HTTPStatusError as error:
+                if error.response.status_code != 412 or attempt:
+                    raise
+                # Someone else changed the event; refetch and diff against the fresh copy
+                self._forget(event_id)
+                cached = self._remember((await self._request("GET", url)).json())
+
+    async def _flush_update(self, event_id: str) -> None:
+        await asyncio.sleep(settings.GOOGLE_UPDATE_COALESCE_SECONDS)
+        pending = self._pending_updates.pop(event_id)
+        try:
+            pending['future'].set_result(await self._patch_event(event_id, pending['fields']))
+        except Exception as error:
+            pending['future'].set_exception(error)
+
     async def update_event(
         self,
         event_id: str,
@@ -82,54 +215,47 @@ class GoogleCalendarService:
         start_time: Optional[datetime] = None,
         end_time: Optional[datetime] = None
     ) -> dict:
-        """Update a calendar event"""
-        service = self._get_service()
-        
+        """Update a calendar event; rapid updates to the same event are merged into one PATCH"""
+        fields = {}
+        if summary:
+            fields['summary'] = summary
+        if description:
+            fields['description'] = description
+        if start_time:
+            fields['start'] = {
+                'dateTime': start_time.isoformat(),
+                'timeZone': 'America/Sao_Paulo',
+            }
+        if end_time:
+            fields['end'] = {
+                'dateTime': end_time.isoformat(),
+                'timeZone': 'America/Sao_Paulo',
+            }
+
+        pending = self._pending_updates.get(event_id)
+        if pending is None:
+            pending = {'fields': fields, 'future': asyncio.get_running_loop().create_future()}
+            self._pending_updates[event_id] = pending
+            pending['task'] = asyncio.ensure_future(self._flush_update(event_id))
+        else:
+            pending['fields'].update(fields)
+
         try:
-            # Get existing event
-            event = service.events().get(
-                calendarId=self.calendar_id,
-                eventId=event_id
-            ).execute()
-            
-            # Update fields
-            if summary:
-                event['summary'] = summary
-            if description:
-                event['description'] = description
-            if start_time:
-                event['start'] = {
-                    'dateTime': start_time.isoformat(),
-                    'timeZone': 'America/Sao_Paulo',
-                }
-            if end_time:
-                event['end'] = {
-                    'dateTime': end_time.isoformat(),
-                    'timeZone': 'America/Sao_Paulo',
-                }
-            
-            updated_event = service.events().update(
-                calendarId=self.calendar_id,
-                eventId=event_id,
-                body=event,
-                sendUpdates='all'
-            ).execute()
-            
-            return updated_event
-        except HttpError as error:
+            # Shield so one caller disconnecting doesn't cancel the update for the others
+            return await asyncio.shield(pending['future'])
+        except httpx.HTTPError as error:
             raise Exception(f"Failed to update calendar event: {error}")
 
     async def delete_event(self, event_id: str) -> None:
         """Delete a calendar event"""
-        service = self._get_service()
-        
         try:
-            service.events().delete(
-                calendarId=self.calendar_id,
-                eventId=event_id,
-                sendUpdates='all'
-            ).execute()
-        except HttpError as error:
+            await self._request(
+                "DELETE",
+                self._events_url(event_id),
+                params={'sendUpdates': 'all'}
+            )
+            self._forget(event_id)
+        except httpx.HTTPError as error:
             raise Exception(f"Failed to delete calendar event: {error}")
 
     async def list_events(
@@ -139,22 +265,211 @@ class GoogleCalendarService:
         max_results: int = 100
     ) -> List[dict]:
         """List calendar events"""
-        service = self._get_service()
-        
+        params = {
+            'maxResults': max_results,
+            'singleEvents': 'true',
+            'orderBy': 'startTime',
+        }
+        if time_min:
+            params['timeMin'] = time_min.isoformat()
+        if time_max:
+            params['timeMax'] = time_max.isoformat()
+
         try:
-            events_result = service.events().list(
-                calendarId=self.calendar_id,
-                timeMin=time_min.isoformat() if time_min else None,
-                timeMax=time_max.isoformat() if time_max else None,
-                maxResults=max_results,
-                singleEvents=True,
-                orderBy='startTime'
-            ).execute()
-            
-            return events_result.get('items', [])
-        except HttpError as error:
+            response = await self._request("GET", self._events_url(), params=params)
+            return [self._remember(item) for item in response.json().get('items', [])]
+        except httpx.HTTPError as error:
             raise Exception(f"Failed to list calendar events: {error}")
 
+    async def list_event_changes(self, sync_token: Optional[str] = None) -> Tuple[List[dict], str]:
+        """List events changed since the sync token (all events when None), returning the next sync token"""
+        params = {'maxResults': 250}
+        if sync_token:
+            params['syncToken'] = sync_token
+        else:
+            params['showDeleted'] = 'true'
+
+        items: List[dict] = []
+        try:
+            while True:
+                response = await self._request("GET", self._events_url(), params=params)
+                page = response.json()
+                items.extend(self._remember(item) for item in page.get('items', []))
+                if page.get('nextPageToken'):
+                    params['pageToken'] = page['nextPageToken']
+                    continue
+                return items, page['nextSyncToken']
+        except httpx.HTTPStatusError as error:
+            if error.response.status_code == 410:
+                raise SyncTokenExpired()
+            raise Exception(f"Failed to sync calendar events: {error}")
+        except httpx.HTTPError as error:
+            raise Exception(f"Failed to sync calendar events: {error}")
+
+    async def watch_events(self, channel_id: str, address: str, token: str, ttl_seconds: int) -> dict:
+        """Open a push notification channel for changes to the calendar's events"""
+        try:
+            response = await self._request(
+                "POST",
+                f"{self._events_url()}/watch",
+                json={
+                    'id': channel_id,
+                    'type': 'web_hook',
+                    'address': address,
+                    'token': token,
+                    'params': {'ttl': str(ttl_seconds)},
+                }
+            )
+            return response.json()
+        except httpx.HTTPError as error:
+            raise Exception(f"Failed to watch calendar events: {error}")
+
+    async def stop_channel(self, channel_id: str, resource_id: str) -> None:
+        """Stop a push notification channel"""
+        try:
+            await self._request(
+                "POST",
+                f"{self.api_url}/channels/stop",
+                json={'id': channel_id, 'resourceId': resource_id}
+            )
+        except httpx.HTTPError as error:
+            raise Exception(f"Failed to stop calendar channel: {error}")
+
+    async def _batch_chunk(self, calls: List[dict]) -> List[Tuple[int, Optional[dict]]]:
+        """Send up to BATCH_LIMIT calls as one multipart/mixed batch request"""
+        boundary = f"batch_{uuid.uuid4().hex}"
+        parts = []
+        for index, call in enumerate(calls):
+            target = urlsplit(call["url"]).path
+            if call.get("params"):
+                target = f"{target}?{urlencode(call['params'])}"
+            part = (
+                f"--{boundary}\r\n"
+                "Content-Type: application/http\r\n"
+                f"Content-ID: <item-{index}>\r\n\r\n"
+                f"{call['method']} {target} HTTP/1.1\r\n"
+            )
+            if call.get("json") is not None:
+                part += f"Content-Type: application/json\r\n\r\n{json.dumps(call['json'])}\r\n"
+            else:
+                part += "\r\n"
+            parts.append(part)
+        parts.append(f"--{boundary}--\r\n")
+
+        response = await self._request(
+            "POST",
+            self.batch_url,
+            headers={"Content-Type": f"multipart/mixed; boundary={boundary}"},
+            content="".join(parts).encode()
+        )
+        return _parse_batch_response(response, len(calls))
+
+    async def batch(self, calls: List[dict]) -> List[Union[Tuple[int, Optional[dict]], Exception]]:
+        """Run calls ({method, url, params, json}) through the batch endpoint, returning (status, body) per call"""
+        chunks = [calls[i:i + BATCH_LIMIT] for i in range(0, len(calls), BATCH_LIMIT)]
+        # Other chunks are applied even if one fails, so a failed chunk gives its error to its own calls only
+        results = await asyncio.gather(*(self._batch_chunk(chunk) for chunk in chunks), return_exceptions=True)
+        items = []
+        for chunk, result in zip(chunks, results):
+            if isinstance(result, BaseException) and not isinstance(result, Exception):
+                raise result
+            items.extend([result] * len(chunk) if isinstance(result, Exception) else result)
+        return items
+
+    async def delete_events(self, event_ids: List[str]) -> Dict[str, Optional[str]]:
+        """Delete many calendar events in batches; maps each event ID to an error message or None"""
+        calls = [
+            {"method": "DELETE", "url": self._events_url(event_id), "params": {"sendUpdates": "all"}}
+            for event_id in event_ids
+        ]
+        results = await self.batch(calls)
+
+        errors = {}
+        for event_id, result in zip(event_ids, results):
+            if isinstance(result, Exception):
+                errors[event_id] = f"Failed to delete calendar event: {result}"
+                continue
+            status_code, body = result
+            # 404/410 mean the event is already gone, which is what we wanted
+            if status_code < 300 or status_code in (404, 410):
+                self._forget(event_id)
+                errors[event_id] = None
+            else:
+                errors[event_id] = f"Failed to delete calendar event: {status_code} {_batch_error(body)}"
+        return errors
+
+    async def reschedule_events(
+        self,
+        changes: Dict[str, Tuple[datetime, datetime]]
+    ) -> Dict[str, Optional[str]]:
+        """Move many calendar events in batches; maps each event ID to an error message or None"""
+        event_ids = list(changes)
+        calls = [
+            {
+                "method": "PATCH",
+                "url": self._events_url(event_id),
+                "params": {"sendUpdates": "all"},
+                "json": {
+                    "start": {"dateTime": changes[event_id][0].isoformat(), "timeZone": "America/Sao_Paulo"},
+                    "end": {"dateTime": changes[event_id][1].isoformat(), "timeZone": "America/Sao_Paulo"},
+                },
+            }
+            for event_id in event_ids
+        ]
+        results = await self.batch(calls)
+
+        errors = {}
+        for event_id, result in zip(event_ids, results):
+            if isinstance(result, Exception):
+                # The chunk may or may not have been applied, so the cached etag can't be trusted
+                self._forget(event_id)
+                errors[event_id] = f"Failed to update calendar event: {result}"
+                continue
+            status_code, body = result
+            if status_code < 300:
+                if body:
+                    self._remember(body)
+                else:
+                    self._forget(event_id)
+                errors[event_id] = None
+            else:
+                self._forget(event_id)
+                errors[event_id] = f"Failed to update calendar event: {status_code} {_batch_error(body)}"
+        return errors
+
+
+def _batch_error(body: Optional[dict]) -> str:
+    if not body:
+        return ""
+    return body.get("error", {}).get("message", "")
+
+
+def _parse_batch_response(response: httpx.Response, expected: int) -> List[Tuple[int, Optional[dict]]]:
+    """Split a multipart/mixed batch response into (status, body) tuples ordered by Content-ID"""
+    content_type = response.headers.get("content-type", "")
+    boundary = content_type.split("boundary=", 1)[-1].strip('"')
+    results: List[Tuple[int, Optional[dict]]] = [(500, None)] * expected
+
+    for part in response.text.replace("\r\n", "\n").split(f"--{boundary}"):
+        part = part.strip("\n")
+        if not part or part == "--":
+            continue
+        outer_headers, _, inner = part.partition("\n\n")
+        content_id = ""
+        for line in outer_headers.split("\n"):
+            if line.lower().startswith("content-id:"):
+                content_id = line.split(":", 1)[1].strip().strip("<>")
+        if not content_id.startswith("response-item-"):
+            continue
+        index = int(content_id.rsplit("-", 1)[1])
+
+        status_line, _, rest = inner.partition("\n")
+        status_code = int(status_line.split()[1])
+        _, _, body = rest.partition("\n\n")
+        body = body.strip()
+        results[index] = (status_code, json.loads(body) if body else None)
+    return results
+
 
 # Singleton instance
 google_calendar_service = GoogleCalendarService()
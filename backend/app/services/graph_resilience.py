@@ -0,0 +1,226 @@
+import asyncio
+import random
+import time
+from collections import deque
+from typing import Awaitable, Callable, Dict, Optional
+import httpx
+from prometheus_client import Counter, Gauge
+from app.config import settings
+
+GRAPH_RETRIES = Counter(
+    "graph_retries_total", "Microsoft Graph requests retried", ["tenant", "reason"]
+)
+GRAPH_THROTTLE_SECONDS = Counter(
+    "graph_throttle_seconds_total", "Time spent backing off because Microsoft Graph throttled us", ["tenant"]
+)
+GRAPH_CONCURRENCY_LIMIT = Gauge(
+    "graph_concurrency_limit", "Current adaptive limit on concurrent Microsoft Graph requests", ["tenant"],
+    multiprocess_mode="liveall"
+)
+GRAPH_CIRCUIT_STATE = Gauge(
+    "graph_circuit_state", "Microsoft Graph circuit breaker state (0 closed, 1 half-open, 2 open)", ["tenant"],
+    multiprocess_mode="liveall"
+)
+GRAPH_CIRCUIT_OPENED = Counter(
+    "graph_circuit_opened_total", "Times the Microsoft Graph circuit breaker opened", ["tenant"]
+)
+
+# Throttling responses; Graph sends Retry-After with both
+THROTTLE_STATUSES = (429, 503)
+RETRYABLE_STATUSES = (429, 500, 502, 503, 504)
+
+
+class GraphUnavailable(Exception):
+    """Graph is throttling us or failing; retry_after is a hint in seconds for the client"""
+
+    def __init__(self, message: str, retry_after: float):
+        super().__init__(message)
+        self.retry_after = retry_after
+
+
+def _retry_after(response: Optional[httpx.Response]) -> Optional[float]:
+    if response is None:
+        return None
+    try:
+        value = float(response.headers.get("Retry-After", ""))
+    except ValueError:
+        return None
+    return value if value >= 0 else None
+
+
+class AdaptiveConcurrency:
+    """AIMD limit on in-flight requests: +1 per limit's worth of successes, halved on throttling"""
+
+    def __init__(self, tenant: str):
+        self.tenant = tenant
+        self.limit = float(settings.GRAPH_CONCURRENCY_INITIAL)
+        self._in_flight = 0
+        self._waiters: deque = deque()
+        self._next_decrease = 0.0
+        GRAPH_CONCURRENCY_LIMIT.labels(tenant).set(self.limit)
+
+    async def acquire(self) -> None:
+        while self._in_flight >= int(self.limit):
+            waiter = asyncio.get_running_loop().create_future()
+            self._waiters.append(waiter)
+            try:
+                await waiter
+            finally:
+                if waiter in self._waiters:
+                    self._waiters.remove(waiter)
+        self._in_flight += 1
+
+    def release(self) -> None:
+        self._in_flight -= 1
+        self._wake()
+
+    def _wake(self) -> None:
+        free = int(self.limit) - self._in_flight
+        while free > 0 and self._waiters:
+            waiter = self._waiters.popleft()
+            if not waiter.done():
+                waiter.set_result(None)
+                free -= 1
+
+    def on_success(self) -> None:
+        self.limit = min(float(settings.GRAPH_CONCURRENCY_MAX), self.limit + 1 / self.limit)
+        GRAPH_CONCURRENCY_LIMIT.labels(self.tenant).set(self.limit)
+        self._wake()
+
+    def on_throttle(self, retry_after: Optional[float]) -> None:
+        now = time.monotonic()
+        # Requests in flight together are throttled together: decrease once per throttling window
+        if now < self._next_decrease:
+            return
+        self.limit = max(float(settings.GRAPH_CONCURRENCY_MIN), self.limit / 2)
+        self._next_decrease = now + max(retry_after or 0, settings.GRAPH_BACKOFF_BASE_SECONDS)
+        GRAPH_CONCURRENCY_LIMIT.labels(self.tenant).set(self.limit)
+
+
+class CircuitBreaker:
+    """Opens after consecutive failures, then lets a single probe through once the reset time has passed"""
+
+    CLOSED, HALF_OPEN, OPEN = 0, 1, 2
+
+    def __init__(self, tenant: str):
+        self.tenant = tenant
+        self.state = self.CLOSED
+        self._failures = 0
+        self._open_until = 0.0
+        self._probing = False
+        GRAPH_CIRCUIT_STATE.labels(tenant).set(self.state)
+
+    def _set_state(self, state: int) -> None:
+        self.state = state
+        GRAPH_CIRCUIT_STATE.labels(self.tenant).set(state)
+
+    def remaining(self) -> float:
+        """Seconds until an open breaker allows a probe (0 when closed or half-open)"""
+        return max(0.0, self._open_until - time.monotonic()) if self.state == self.OPEN else 0.0
+
+    def before_request(self) -> None:
+        if self.state == self.OPEN:
+            remaining = self.remaining()
+            if remaining > 0:
+                raise GraphUnavailable("SharePoint is unavailable, try again later", remaining)
+            self._set_state(self.HALF_OPEN)
+        if self.state == self.HALF_OPEN:
+            if self._probing:
+                raise GraphUnavailable("SharePoint is unavailable, try again later", settings.GRAPH_BACKOFF_BASE_SECONDS)
+            self._probing = True
+
+    def cancel_probe(self) -> None:
+        """The request ended without a verdict on Graph's health (e.g. it was cancelled)"""
+        self._probing = False
+
+    def record_success(self) -> None:
+        self._failures = 0
+        self._probing = False
+        if self.state != self.CLOSED:
+            self._set_state(self.CLOSED)
+
+    def record_failure(self, retry_after: Optional[float] = None) -> None:
+        self._failures += 1
+        self._probing = False
+        if self.state == self.HALF_OPEN or self._failures >= settings.GRAPH_BREAKER_FAILURE_THRESHOLD:
+            if self.state != self.OPEN:
+                GRAPH_CIRCUIT_OPENED.labels(self.tenant).inc()
+            self._open_until = time.monotonic() + max(retry_after or 0, settings.GRAPH_BREAKER_RESET_SECONDS)
+            self._set_state(self.OPEN)
+
+
+class GraphResilience:
+    """Retries, adaptive concurrency and circuit breaking for one tenant's Graph traffic"""
+
+    def __init__(self, tenant: str):
+        self.tenant = tenant
+        self.concurrency = AdaptiveConcurrency(tenant)
+        self.breaker = CircuitBreaker(tenant)
+        self._throttled_until = 0.0
+
+    def throttle_remaining(self) -> float:
+        """Seconds until Graph accepts requests again, per its Retry-After or the open breaker"""
+        return max(self._throttled_until - time.monotonic(), self.breaker.remaining(), 0.0)
+
+    def _backoff(self, attempt: int) -> float:
+        # Full jitter keeps retrying workers from synchronizing
+        return random.uniform(0, min(settings.GRAPH_BACKOFF_MAX_SECONDS, settings.GRAPH_BACKOFF_BASE_SECONDS * 2 ** attempt))
+
+    async def send(self, request: Callable[[], Awaitable[httpx.Response]]) -> httpx.Response:
+        """Send a request, retrying throttled and transient failures; non-retryable responses are returned as is"""
+        for attempt in range(settings.GRAPH_MAX_RETRIES + 1):
+            # Slot first: nothing may await between claiming the half-open probe and the try that cancels it
+            await self.concurrency.acquire()
+            try:
+                self.breaker.before_request()
+            except GraphUnavailable:
+                self.concurrency.release()
+                raise
+            response, error = None, None
+            try:
+                response = await request()
+            except httpx.TransportError as e:
+                error = e
+            except BaseException:
+                self.breaker.cancel_probe()
+                raise
+            finally:
+                self.concurrency.release()
+
+            if response is not None and response.status_code not in RETRYABLE_STATUSES:
+                self.breaker.record_success()
+                self.concurrency.on_success()
+                return response
+
+            retry_after = _retry_after(response)
+            throttled = response is not None and response.status_code in THROTTLE_STATUSES
+            if throttled:
+                reason = "throttled"
+                self.concurrency.on_throttle(retry_after)
+                if retry_after:
+                    self._throttled_until = max(self._throttled_until, time.monotonic() + retry_after)
+            else:
+                reason = "transport" if error is not None else "server_error"
+            self.breaker.record_failure(retry_after)
+
+            delay = retry_after if retry_after is not None else self._backoff(attempt)
+            # Don't hold the caller for longer than a client would reasonably wait
+            if attempt == settings.GRAPH_MAX_RETRIES or delay > settings.GRAPH_BACKOFF_MAX_SECONDS:
+                detail = f"HTTP {response.status_code}" if response is not None else str(error) or type(error).__name__
+                raise GraphUnavailable(f"SharePoint is unavailable ({detail}), try again later", max(delay, self.throttle_remaining()))
+
+            GRAPH_RETRIES.labels(self.tenant, reason).inc()
+            if throttled:
+                GRAPH_THROTTLE_SECONDS.labels(self.tenant).inc(delay)
+            await asyncio.sleep(delay)
+
+
+_policies: Dict[str, GraphResilience] = {}
+
+
+def for_tenant(tenant_id: Optional[str]) -> GraphResilience:
+    """Graph throttles per tenant, so tenants share nothing but this registry"""
+    tenant = tenant_id or "default"
+    if tenant not in _policies:
+        _policies[tenant] = GraphResilience(tenant)
+    return _policies[tenant]
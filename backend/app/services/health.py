@@ -0,0 +1,81 @@
+import asyncio
+import time
+from typing import Awaitable, Callable, Dict, Optional, Tuple
+from sqlalchemy import text
+from starlette.concurrency import run_in_threadpool
+from app.config import settings
+from app.database import engine
+from app.services.google_calendar import google_calendar_service
+from app.services.sharepoint import sharepoint_service
+
+
+def _check_database() -> None:
+    # Checks a connection out of the same pool requests use
+    with engine.connect() as conn:
+        conn.execute(text("SELECT 1"))
+
+
+async def _probe_database() -> Optional[str]:
+    await run_in_threadpool(_check_database)
+    return None
+
+
+async def _probe_sharepoint() -> Optional[str]:
+    if not sharepoint_service.is_configured():
+        return "not configured"
+    # Served from the MSAL token cache; only reaches Entra ID when the token is close to expiry
+    await run_in_threadpool(sharepoint_service._get_access_token)
+    return None
+
+
+async def _probe_google_calendar() -> Optional[str]:
+    if not google_calendar_service.is_configured():
+        return "not configured"
+    await google_calendar_service._get_access_token()
+    return None
+
+
+# name -> probe returning a note (None when nothing to add); raising means the dependency is down
+PROBES: Dict[str, Callable[[], Awaitable[Optional[str]]]] = {
+    "database": _probe_database,
+    "sharepoint": _probe_sharepoint,
+    "google_calendar": _probe_google_calendar,
+}
+
+
+class HealthService:
+    def __init__(self):
+        # name -> (monotonic expiry, result)
+        self._cache: Dict[str, Tuple[float, dict]] = {}
+        self._lock = asyncio.Lock()
+
+    async def _run(self, name: str) -> dict:
+        started = time.perf_counter()
+        try:
+            note = await asyncio.wait_for(PROBES[name](), timeout=settings.HEALTH_PROBE_TIMEOUT_SECONDS)
+        except asyncio.TimeoutError:
+            result = {"status": "error", "error": f"Timed out after {settings.HEALTH_PROBE_TIMEOUT_SECONDS}s"}
+        except Exception as e:
+            result = {"status": "error", "error": str(e) or type(e).__name__}
+        else:
+            result = {"status": "skipped", "detail": note} if note else {"status": "ok"}
+        result["latency_ms"] = round((time.perf_counter() - started) * 1000, 1)
+        return result
+
+    async def readiness(self) -> Tuple[bool, Dict[str, dict]]:
+        """Probe results, each reused for HEALTH_CACHE_SECONDS; ready unless a probe failed"""
+        # One caller refreshes expired probes while concurrent callers wait for its results
+        async with self._lock:
+            now = time.monotonic()
+            expired = [name for name in PROBES if self._cache.get(name, (0.0, None))[0] <= now]
+            if expired:
+                results = await asyncio.gather(*(self._run(name) for name in expired))
+                expires_at = time.monotonic() + settings.HEALTH_CACHE_SECONDS
+                for name, result in zip(expired, results):
+                    self._cache[name] = (expires_at, result)
+            checks = {name: self._cache[name][1] for name in PROBES}
+        return all(check["status"] != "error" for check in checks.values()), checks
+
+
+# Singleton instance
+health_service = HealthService()
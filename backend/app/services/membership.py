@@ -0,0 +1,58 @@
+from typing import Iterable, List
+from sqlalchemy import delete, literal, select
+from sqlalchemy.orm import Session
+from app.models.project import project_users
+from app.models.user import User
+
+
+class MembershipService:
+    """Set-based writes to project_users that touch only the rows that change"""
+
+    def _insert(self, db: Session):
+        if db.get_bind().dialect.name == "postgresql":
+            from sqlalchemy.dialects.postgresql import insert
+        else:
+            from sqlalchemy.dialects.sqlite import insert
+        return insert(project_users)
+
+    def add_members(self, db: Session, project_id: int, user_ids: Iterable[int]) -> List[int]:
+        """Add existing users to a project; returns the IDs that were not already members"""
+        user_ids = sorted(set(user_ids))
+        if not user_ids:
+            return []
+
+        # INSERT ... SELECT skips unknown IDs; the unique pair makes existing members a no-op
+        source = select(literal(project_id), User.id).where(User.id.in_(user_ids))
+        statement = (
+            self._insert(db)
+            .from_select(["project_id", "user_id"], source)
+            .on_conflict_do_nothing(index_elements=["project_id", "user_id"])
+            .returning(project_users.c.user_id)
+        )
+        return sorted(db.execute(statement).scalars().all())
+
+    def remove_members(self, db: Session, project_id: int, user_ids: Iterable[int]) -> List[int]:
+        """Remove users from a project; returns the IDs that were members"""
+        user_ids = sorted(set(user_ids))
+        if not user_ids:
+            return []
+
+        statement = (
+            delete(project_users)
+            .where(project_users.c.project_id == project_id, project_users.c.user_id.in_(user_ids))
+            .returning(project_users.c.user_id)
+        )
+        return sorted(db.execute(statement).scalars().all())
+
+    def set_members(self, db: Session, project_id: int, user_ids: Iterable[int]) -> None:
+        """Make the membership exactly user_ids, writing only the difference"""
+        user_ids = sorted(set(user_ids))
+        statement = delete(project_users).where(project_users.c.project_id == project_id)
+        if user_ids:
+            statement = statement.where(project_users.c.user_id.notin_(user_ids))
+        db.execute(statement)
+        self.add_members(db, project_id, user_ids)
+
+
+# Singleton instance
+membership_service = MembershipService()
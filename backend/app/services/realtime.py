@@ -0,0 +1,181 @@
+import asyncio
+import json
+from typing import Dict, List, Optional, Set
+from sqlalchemy import text
+from app.config import settings
+from app.database import engine
+
+# Postgres caps NOTIFY payloads at 8000 bytes
+NOTIFY_CHANNEL = "blink_events"
+NOTIFY_PAYLOAD_LIMIT = 7500
+
+
+class Subscription:
+    """A single streaming client; events are buffered up to REALTIME_QUEUE_SIZE"""
+
+    def __init__(self, kind: str, topics: List[str]):
+        self.kind = kind
+        self.topics = topics
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize=settings.REALTIME_QUEUE_SIZE)
+        self.overflowed = False
+
+
+class RealtimeService:
+    def __init__(self):
+        self._subscriptions: Dict[str, Set[Subscription]] = {}
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._listener_task: Optional[asyncio.Task] = None
+        self.stats_counters = {
+            "events_published": 0,
+            "events_delivered": 0,
+            "events_dropped": 0,
+            "slow_consumers_disconnected": 0,
+        }
+
+    @property
+    def uses_notify(self) -> bool:
+        return engine.dialect.name == "postgresql"
+
+    async def start(self) -> None:
+        """Start the LISTEN loop so events published by any worker reach this worker's clients"""
+        self._loop = asyncio.get_running_loop()
+        if self.uses_notify and self._listener_task is None:
+            self._listener_task = asyncio.create_task(self._listen())
+
+    async def stop(self) -> None:
+        """Stop the LISTEN loop"""
+        if self._listener_task is not None:
+            self._listener_task.cancel()
+            try:
+                await self._listener_task
+            except asyncio.CancelledError:
+                pass
+            self._listener_task = None
+
+    def _connect_listener(self):
+        import psycopg2
+        url = engine.url.set(drivername="postgresql").render_as_string(hide_password=False)
+        conn = psycopg2.connect(url)
+        conn.set_isolation_level(psycopg2.extensions.ISOLATION_LEVEL_AUTOCOMMIT)
+        conn.cursor().execute(f"LISTEN {NOTIFY_CHANNEL}")
+        return conn
+
+    async def _listen(self) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            try:
+                conn = await asyncio.to_thread(self._connect_listener)
+            except Exception as e:
+                print(f"Failed to start realtime listener: {e}")
+                await asyncio.sleep(5)
+                continue
+
+            readable = asyncio.Event()
+            loop.add_reader(conn.fileno(), readable.set)
+            try:
+                while True:
+                    await readable.wait()
+                    readable.clear()
+                    conn.poll()
+                    while conn.notifies:
+                        self._dispatch(conn.notifies.pop(0).payload)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                print(f"Realtime listener connection lost: {e}")
+            finally:
+                loop.remove_reader(conn.fileno())
+                conn.close()
+            await asyncio.sleep(1)
+
+    def publish(self, topics: List[str], event: dict) -> None:
+        """Publish a committed change to topics; with Postgres it fans out to every worker through NOTIFY"""
+        payload = json.dumps({"topics": topics, "event": event}, default=str)
+        if len(payload.encode()) > NOTIFY_PAYLOAD_LIMIT:
+            # Too large for NOTIFY: clients refetch using the IDs in the event
+            event = {key: value for key, value in event.items() if not isinstance(value, dict)}
+            event["truncated"] = True
+            payload = json.dumps({"topics": topics, "event": event}, default=str)
+
+        self.stats_counters["events_published"] += 1
+        if self.uses_notify:
+            # Separate short transaction so the caller's session and loaded objects are untouched
+            try:
+                with engine.connect() as conn:
+                    conn.execute(text("SELECT pg_notify(:channel, :payload)"), {"channel": NOTIFY_CHANNEL, "payload": payload})
+                    conn.commit()
+            except Exception as e:
+                print(f"Failed to publish realtime event: {e}")
+        elif self._loop is not None:
+            # Handlers run in the threadpool; hand the event to the loop that owns the queues
+            self._loop.call_soon_threadsafe(self._dispatch, payload)
+
+    def _dispatch(self, payload: str) -> None:
+        message = json.loads(payload)
+        event = message["event"]
+        for topic in message["topics"]:
+            for subscription in list(self._subscriptions.get(topic, ())):
+                if subscription.overflowed:
+                    continue
+                try:
+                    subscription.queue.put_nowait(event)
+                    self.stats_counters["events_delivered"] += 1
+                except asyncio.QueueFull:
+                    # Slow consumer: stop buffering and let the stream tell the client to resync
+                    subscription.overflowed = True
+                    self.stats_counters["events_dropped"] += 1
+                    self.stats_counters["slow_consumers_disconnected"] += 1
+
+    def subscribe(self, kind: str, topics: List[str]) -> Subscription:
+        """Register a streaming client for the given topics"""
+        subscription = Subscription(kind, topics)
+        for topic in topics:
+            self._subscriptions.setdefault(topic, set()).add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription) -> None:
+        for topic in subscription.topics:
+            subscribers = self._subscriptions.get(topic)
+            if subscribers is not None:
+                subscribers.discard(subscription)
+                if not subscribers:
+                    del self._subscriptions[topic]
+
+    async def stream(self, request, subscription: Subscription):
+        """Yield Server-Sent Events for a subscription until the client disconnects"""
+        try:
+            yield "retry: 3000\n\n"
+            while True:
+                if subscription.overflowed:
+                    yield "event: resync\ndata: {}\n\n"
+                    return
+                try:
+                    event = await asyncio.wait_for(
+                        subscription.queue.get(),
+                        timeout=settings.REALTIME_HEARTBEAT_SECONDS
+                    )
+                except asyncio.TimeoutError:
+                    if await request.is_disconnected():
+                        return
+                    yield ": keepalive\n\n"
+                    continue
+                yield f"event: {event['type']}\ndata: {json.dumps(event, default=str)}\n\n"
+        finally:
+            self.unsubscribe(subscription)
+
+    def stats(self) -> dict:
+        """Connection counts and backpressure counters for this worker"""
+        subscriptions = {s for subscribers in self._subscriptions.values() for s in subscribers}
+        connections: Dict[str, int] = {}
+        for subscription in subscriptions:
+            connections[subscription.kind] = connections.get(subscription.kind, 0) + 1
+        return {
+            "connections": connections,
+            "max_queue_depth": max((s.queue.qsize() for s in subscriptions), default=0),
+            "listener_running": self._listener_task is not None and not self._listener_task.done(),
+            **self.stats_counters,
+        }
+
+
+# Singleton instance
+realtime_service = RealtimeService()
@@ -0,0 +1,118 @@
+import html
+from typing import List, Optional
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+from app.models.search import SEARCH_CONFIG
+from app.models.user import User, UserRole
+
+SEARCH_KINDS = ("request", "message", "file", "recording")
+
+# Control characters mark highlights so the surrounding text can be HTML-escaped safely
+_START, _STOP = "\x02", "\x03"
+
+_HEADLINE_OPTIONS = f"StartSel={_START}, StopSel={_STOP}, MaxFragments=2, MaxWords=20, MinWords=5"
+
+
+class SearchService:
+    def _branches(self, kinds: List[str], restricted: bool, project_id: Optional[int]) -> List[str]:
+        """One ranked, limited SELECT per kind, each able to use its GIN index"""
+        project_filter = "AND {alias}.project_id = :project_id" if project_id is not None else ""
+        member_filter = (
+            "AND {alias}.project_id IN (SELECT project_id FROM project_users WHERE user_id = :user_id)"
+            if restricted else ""
+        )
+        owner_filter = "AND r.user_id = :user_id" if restricted else ""
+
+        branches = {
+            "request": f"""
+                SELECT 'request' AS kind, r.id, r.project_id, r.id AS request_id,
+                       ts_rank(r.search_vector, q.query) AS rank
+                FROM requests r, q
+                WHERE r.search_vector @@ q.query {owner_filter} {project_filter.format(alias="r")}
+                ORDER BY rank DESC LIMIT :limit
+            """,
+            "message": f"""
+                SELECT 'message' AS kind, m.id, r.project_id, m.request_id,
+                       ts_rank(m.search_vector, q.query) AS rank
+                FROM request_messages m JOIN requests r ON r.id = m.request_id, q
+                WHERE m.search_vector @@ q.query {owner_filter} {project_filter.format(alias="r")}
+                ORDER BY rank DESC LIMIT :limit
+            """,
+            "file": f"""
+                SELECT 'file' AS kind, f.id, f.project_id, NULL::integer AS request_id,
+                       ts_rank(f.search_vector, q.query) AS rank
+                FROM files f, q
+                WHERE f.search_vector @@ q.query {member_filter.format(alias="f")} {project_filter.format(alias="f")}
+                ORDER BY rank DESC LIMIT :limit
+            """,
+            "recording": f"""
+                SELECT 'recording' AS kind, rc.id, rc.project_id, NULL::integer AS request_id,
+                       ts_rank(rc.search_vector, q.query) AS rank
+                FROM recordings rc, q
+                WHERE rc.search_vector @@ q.query {member_filter.format(alias="rc")} {project_filter.format(alias="rc")}
+                ORDER BY rank DESC LIMIT :limit
+            """,
+        }
+        return [f"({branches[kind]})" for kind in kinds]
+
+    def search(
+        self,
+        db: Session,
+        user: User,
+        query: str,
+        kinds: List[str],
+        project_id: Optional[int] = None,
+        limit: int = 20
+    ) -> List[dict]:
+        """Ranked full-text search across requests, messages, files and recordings the user can see"""
+        restricted = user.role != UserRole.ADMIN
+        union = "\nUNION ALL\n".join(self._branches(kinds, restricted, project_id))
+
+        # Headlines are expensive, so they are only computed for the final top hits
+        statement = text(f"""
+            WITH q AS (SELECT websearch_to_tsquery('{SEARCH_CONFIG}', :query) AS query),
+            hits AS ({union}),
+            top AS (SELECT * FROM hits ORDER BY rank DESC LIMIT :limit)
+            SELECT top.kind, top.id, top.project_id, top.request_id, top.rank,
+                   CASE top.kind
+                       WHEN 'request' THEN r.title
+                       WHEN 'message' THEN mr.title
+                       WHEN 'file' THEN f.name
+                       ELSE rc.title
+                   END AS title,
+                   ts_headline('{SEARCH_CONFIG}',
+                       CASE top.kind
+                           WHEN 'request' THEN r.title || ' ' || r.description
+                           WHEN 'message' THEN m.message
+                           WHEN 'file' THEN f.name || ' ' || coalesce(f.description, '')
+                           ELSE rc.title || ' ' || coalesce(rc.description, '')
+                       END,
+                       q.query, :headline_options) AS highlight
+            FROM top CROSS JOIN q
+            LEFT JOIN requests r ON top.kind = 'request' AND r.id = top.id
+            LEFT JOIN request_messages m ON top.kind = 'message' AND m.id = top.id
+            LEFT JOIN requests mr ON top.kind = 'message' AND mr.id = m.request_id
+            LEFT JOIN files f ON top.kind = 'file' AND f.id = top.id
+            LEFT JOIN recordings rc ON top.kind = 'recording' AND rc.id = top.id
+            ORDER BY top.rank DESC
+        """)
+
+        rows = db.execute(statement, {
+            "query": query,
+            "limit": limit,
+            "user_id": user.id,
+            "project_id": project_id,
+            "headline_options": _HEADLINE_OPTIONS,
+        }).mappings().all()
+
+        return [
+            {
+                **row,
+                "highlight": html.escape(row["highlight"] or "").replace(_START, "<mark>").replace(_STOP, "</mark>"),
+            }
+            for row in rows
+        ]
+
+
+# Singleton instance
+search_service = SearchService()
@@ -1,122 +1,197 @@
+import asyncio
+import time
 import httpx
 from typing import Optional, BinaryIO
-from msal import ConfidentialClientApplication
+from starlette.concurrency import run_in_threadpool
 from app.config import settings
+from app.utils.metrics import observe_outbound
+from app.utils.tracing import span
+from app.services.graph_resilience import for_tenant
 
 
 class SharePointService:
-    def __init__(self):
+    def __init__(self, transport: Optional[httpx.AsyncBaseTransport] = None):
         self.tenant_id = settings.MICROSOFT_TENANT_ID
         self.client_id = settings.MICROSOFT_CLIENT_ID
         self.client_secret = settings.MICROSOFT_CLIENT_SECRET
         self.site_id = settings.SHAREPOINT_SITE_ID
         self.drive_id = settings.SHAREPOINT_DRIVE_ID
-        self.graph_url = "https://graph.microsoft.com/v1.0"
-        self._access_token = None
+        self.graph_url = settings.GRAPH_API_URL
+        self._msal_app = None
+        self._transport = transport
+        self._client: Optional[httpx.AsyncClient] = None
+        self.resilience = for_tenant(self.tenant_id)
+
+    def _get_client(self) -> httpx.AsyncClient:
+        """Get the shared HTTP client (connections are pooled and kept alive across calls)"""
+        if self._client is None:
+            self._client = httpx.AsyncClient(
+                transport=self._transport,
+                timeout=settings.GRAPH_HTTP_TIMEOUT_SECONDS,
+                limits=httpx.Limits(
+                    max_connections=settings.GRAPH_CONCURRENCY_MAX,
+                    max_keepalive_connections=settings.GRAPH_CONCURRENCY_MAX,
+                ),
+            )
+        return self._client
+
+    async def close(self) -> None:
+        """Close pooled connections"""
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+    def _get_msal_app(self):
+        """Get the MSAL client; its token cache serves tokens until shortly before they expire"""
+        if self._msal_app is None:
+            # Imported on first use: msal and its dependencies add noticeably to worker startup
+            from msal import ConfidentialClientApplication
+
+            self._msal_app = ConfidentialClientApplication(
+                self.client_id,
+                authority=f"{settings.MICROSOFT_AUTHORITY_HOST}/{self.tenant_id}",
+                client_credential=self.client_secret,
+                # Microsoft's own hosts skip discovery anyway; other hosts (a local stand-in) would fail it
+                instance_discovery=False,
+            )
+        return self._msal_app
 
     def _get_access_token(self) -> str:
         """Get access token using client credentials flow"""
-        if self._access_token:
-            return self._access_token
-        
-        app = ConfidentialClientApplication(
-            self.client_id,
-            authority=f"https://login.microsoftonline.com/{self.tenant_id}",
-            client_credential=self.client_secret,
-        )
-        
-        result = app.acquire_token_for_client(scopes=["https://graph.microsoft.com/.default"])
-        
+        with span("sharepoint.get_access_token"):
+            result = self._get_msal_app().acquire_token_for_client(scopes=["https://graph.microsoft.com/.default"])
+
         if "access_token" in result:
-            self._access_token = result["access_token"]
-            return self._access_token
+            return result["access_token"]
         else:
             raise Exception(f"Failed to get access token: {result.get('error_description')}")
 
+    def is_configured(self) -> bool:
+        return bool(self.tenant_id and self.client_id and self.client_secret and self.drive_id)
+
+    def throttle_remaining(self) -> float:
+        """Seconds until Graph accepts requests again (0 when not throttled and the breaker is closed)"""
+        return self.resilience.throttle_remaining()
+
+    # Measured per request, retries included; copy_file polls and calls get_file_info, so methods would overlap
+    @observe_outbound("sharepoint", "request")
+    async def _request(self, method: str, url: str, **kwargs) -> httpx.Response:
+        """Send an authorized request to Graph, retrying throttled and transient failures"""
+        # MSAL fetches tokens with blocking HTTP
+        token = await run_in_threadpool(self._get_access_token)
+        headers = {"Authorization": f"Bearer {token}"}
+        headers.update(kwargs.pop("headers", {}))
+
+        client = self._get_client()
+        return await self.resilience.send(lambda: client.request(method, url, headers=headers, **kwargs))
+
     async def upload_file(
-        self, 
-        file_content: bytes, 
-        file_name: str, 
+        self,
+        file_content: bytes,
+        file_name: str,
         folder_path: str = "/"
     ) -> dict:
         """Upload a file to SharePoint"""
-        token = self._get_access_token()
-        
         # Clean folder path
         if not folder_path.startswith("/"):
             folder_path = f"/{folder_path}"
         if folder_path.endswith("/"):
             folder_path = folder_path[:-1]
-        
+
         # Upload URL for files < 4MB (use resumable upload for larger files)
         url = f"{self.graph_url}/drives/{self.drive_id}/root:{folder_path}/{file_name}:/content"
-        
-        headers = {
-            "Authorization": f"Bearer {token}",
-            "Content-Type": "application/octet-stream"
+
+        headers = {"Content-Type": "application/octet-stream"}
+
+        response = await self._request("PUT", url, headers=headers, content=file_content)
+        response.raise_for_status()
+        return response.json()
+
+    async def copy_file(self, file_id: str, file_name: str, folder_path: str = "/") -> dict:
+        """Copy a file server-side (no bytes go through us); returns the new file's metadata"""
+        folder_path = "/" + folder_path.strip("/")
+        url = f"{self.graph_url}/drives/{self.drive_id}/items/{file_id}/copy"
+
+        data = {
+            "parentReference": {"driveId": self.drive_id, "path": f"/drive/root:{folder_path}"},
+            "name": file_name
         }
-        
-        async with httpx.AsyncClient() as client:
-            response = await client.put(url, headers=headers, content=file_content)
-            response.raise_for_status()
-            return response.json()
+
+        response = await self._request("POST", url, params={"@microsoft.graph.conflictBehavior": "rename"}, json=data)
+        response.raise_for_status()
+
+        # Graph copies asynchronously: poll the pre-authenticated monitor URL until it reports the new item
+        monitor_url = response.headers["Location"]
+        deadline = time.monotonic() + settings.GRAPH_COPY_TIMEOUT_SECONDS
+        delay = 0.2
+        while True:
+            monitor = await self._get_client().get(monitor_url)
+            monitor.raise_for_status()
+            job = monitor.json()
+            if job.get("status") == "completed":
+                return await self.get_file_info(job["resourceId"])
+            if job.get("status") == "failed":
+                raise Exception(f"Copy failed: {job.get('error', {}).get('message', 'unknown error')}")
+            if time.monotonic() + delay > deadline:
+                raise TimeoutError(f"Copy still {job.get('status')} after {settings.GRAPH_COPY_TIMEOUT_SECONDS}s")
+            await asyncio.sleep(delay)
+            delay = min(delay * 2, 2.0)
 
     async def get_file_info(self, file_id: str) -> dict:
         """Get file metadata from SharePoint"""
-        token = self._get_access_token()
-        
         url = f"{self.graph_url}/drives/{self.drive_id}/items/{file_id}"
-        headers = {"Authorization": f"Bearer {token}"}
-        
-        async with httpx.AsyncClient() as client:
-            response = await client.get(url, headers=headers)
-            response.raise_for_status()
-            return response.json()
+
+        response = await self._request("GET", url)
+        response.raise_for_status()
+        return response.json()
 
     async def get_download_url(self, file_id: str) -> str:
         """Get a temporary download URL for a file"""
-        token = self._get_access_token()
-        
         url = f"{self.graph_url}/drives/{self.drive_id}/items/{file_id}"
-        headers = {"Authorization": f"Bearer {token}"}
-        
-        async with httpx.AsyncClient() as client:
-            response = await client.get(url, headers=headers)
-            response.raise_for_status()
-            file_info = response.json()
-            return file_info.get("@microsoft.graph.downloadUrl")
+
+        response = await self._request("GET", url)
+        response.raise_for_status()
+        file_info = response.json()
+        return file_info.get("@microsoft.graph.downloadUrl")
 
     async def delete_file(self, file_id: str) -> None:
         """Delete a file from SharePoint"""
-        token = self._get_access_token()
-        
         url = f"{self.graph_url}/drives/{self.drive_id}/items/{file_id}"
-        headers = {"Authorization": f"Bearer {token}"}
-        
-        async with httpx.AsyncClient() as client:
-            response = await client.delete(url, headers=headers)
-            response.raise_for_status()
+
+        response = await self._request("DELETE", url)
+        response.raise_for_status()
+
+    async def delete_folder(self, folder_path: str) -> bool:
+        """Delete a folder and everything in it; returns False if it did not exist"""
+        url = f"{self.graph_url}/drives/{self.drive_id}/root:{folder_path}"
+
+        response = await self._request("DELETE", url)
+        if response.status_code == 404:
+            return False
+        response.raise_for_status()
+        return True
+
+    async def delete_project_folders(self, project_id: int) -> None:
+        """Remove a deleted project's files and recordings folders (run as a background task)"""
+        for folder_path in (f"/files/project_{project_id}", f"/recordings/project_{project_id}"):
+            try:
+                await self.delete_folder(folder_path)
+            except Exception as e:
+                print(f"Failed to delete SharePoint folder {folder_path}: {e}")
 
     async def create_folder(self, folder_name: str, parent_path: str = "/") -> dict:
         """Create a folder in SharePoint"""
-        token = self._get_access_token()
-        
         url = f"{self.graph_url}/drives/{self.drive_id}/root:{parent_path}:/children"
-        headers = {
-            "Authorization": f"Bearer {token}",
-            "Content-Type": "application/json"
-        }
-        
+
         data = {
             "name": folder_name,
             "folder": {},
             "@microsoft.graph.conflictBehavior": "rename"
         }
-        
-        async with httpx.AsyncClient() as client:
-            response = await client.post(url, headers=headers, json=data)
-            response.raise_for_status()
-            return response.json()
+
+        response = await self._request("POST", url, json=data)
+        response.raise_for_status()
+        return response.json()
 
 
 # Singleton instance
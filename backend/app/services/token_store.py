@@ -0,0 +1,123 @@
+import secrets
+import threading
+import time
+import uuid
+from datetime import datetime, timedelta, timezone
+from typing import Dict, Optional, Tuple
+from sqlalchemy import delete, or_, select, update
+from sqlalchemy.orm import Session
+from app.config import settings
+from app.database import engine
+from app.models.refresh_token import RefreshTokenFamily
+
+
+class RefreshTokenError(Exception):
+    """The refresh token is unknown, revoked or not the family's current token"""
+
+
+class RefreshTokenReused(RefreshTokenError):
+    """An already rotated refresh token was presented; the family has been revoked"""
+
+
+def _as_utc(value: datetime) -> datetime:
+    return value.replace(tzinfo=timezone.utc) if value.tzinfo is None else value
+
+
+class RefreshTokenStore:
+    def __init__(self):
+        # fid -> revoked_at, only for revocations recent enough that access tokens may still be live
+        self._revoked: Dict[str, datetime] = {}
+        self._synced_until: Optional[datetime] = None
+        self._next_sync = 0.0
+        self._lock = threading.Lock()
+
+    @property
+    def _access_lifetime(self) -> timedelta:
+        return timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
+
+    def create_family(self, db: Session, user_id: int) -> Tuple[str, str]:
+        """Start a session; returns (fid, jti) for the first refresh token"""
+        family = RefreshTokenFamily(id=str(uuid.uuid4()), user_id=user_id, current_jti=secrets.token_urlsafe(16))
+        db.add(family)
+        self.prune(db, user_id)
+        db.commit()
+        return family.id, family.current_jti
+
+    def rotate(self, db: Session, fid: str, jti: str) -> Tuple[int, str]:
+        """Swap the family's current jti for a new one; returns (user_id, new jti)"""
+        new_jti = secrets.token_urlsafe(16)
+        # Compare-and-swap: of two concurrent refreshes with the same token only one wins
+        user_id = db.execute(
+            update(RefreshTokenFamily)
+            .where(
+                RefreshTokenFamily.id == fid,
+                RefreshTokenFamily.current_jti == jti,
+                RefreshTokenFamily.revoked_at.is_(None)
+            )
+            .values(current_jti=new_jti, last_rotated_at=datetime.now(timezone.utc))
+            .returning(RefreshTokenFamily.user_id)
+        ).scalar()
+        if user_id is not None:
+            db.commit()
+            return user_id, new_jti
+
+        family = db.get(RefreshTokenFamily, fid)
+        if family is None or family.revoked_at is not None:
+            db.rollback()
+            raise RefreshTokenError("Invalid refresh token")
+
+        # A live family with a different current jti: an old token was replayed
+        self.revoke(db, fid, "reuse")
+        raise RefreshTokenReused("Refresh token reuse detected")
+
+    def revoke(self, db: Session, fid: str, reason: str) -> None:
+        """Revoke a family; its refresh and access tokens stop working"""
+        now = datetime.now(timezone.utc)
+        db.execute(
+            update(RefreshTokenFamily)
+            .where(RefreshTokenFamily.id == fid, RefreshTokenFamily.revoked_at.is_(None))
+            .values(revoked_at=now, revoked_reason=reason)
+        )
+        db.commit()
+        with self._lock:
+            self._revoked[fid] = now
+
+    def prune(self, db: Session, user_id: int) -> None:
+        """Drop a user's expired families, keeping revocations while their access tokens can be live"""
+        now = datetime.now(timezone.utc)
+        db.execute(
+            delete(RefreshTokenFamily).where(
+                RefreshTokenFamily.user_id == user_id,
+                or_(
+                    RefreshTokenFamily.revoked_at < now - self._access_lifetime,
+                    RefreshTokenFamily.last_rotated_at < now - timedelta(days=settings.REFRESH_TOKEN_EXPIRE_DAYS)
+                )
+            )
+        )
+
+    def _sync(self) -> None:
+        now = datetime.now(timezone.utc)
+        since = self._synced_until or now - self._access_lifetime
+        with engine.connect() as conn:
+            rows = conn.execute(
+                select(RefreshTokenFamily.id, RefreshTokenFamily.revoked_at)
+                .where(RefreshTokenFamily.revoked_at >= since)
+            ).all()
+        cutoff = now - self._access_lifetime
+        self._revoked.update((fid, _as_utc(revoked_at)) for fid, revoked_at in rows)
+        self._revoked = {fid: revoked_at for fid, revoked_at in self._revoked.items() if revoked_at >= cutoff}
+        # Overlap windows slightly so a revocation committed mid-query is not missed
+        self._synced_until = now - timedelta(seconds=settings.TOKEN_REVOCATION_SYNC_SECONDS)
+
+    def is_revoked(self, fid: str) -> bool:
+        """O(1) check used on every authenticated request; other workers' revocations arrive within the sync interval"""
+        if time.monotonic() >= self._next_sync:
+            with self._lock:
+                if time.monotonic() >= self._next_sync:
+                    self._sync()
+                    self._next_sync = time.monotonic() + settings.TOKEN_REVOCATION_SYNC_SECONDS
+        return fid in self._revoked
+
+
+# Singleton instance
+token_store = RefreshTokenStore()
@@ -0,0 +1,90 @@
+import hashlib
+from prometheus_client import Counter
+from sqlalchemy.orm import Session
+from starlette.concurrency import run_in_threadpool
+from app.config import settings
+from app.services.graph_resilience import GraphUnavailable
+from app.services.sharepoint import sharepoint_service
+
+UPLOADS = Counter(
+    "uploads_total", "Uploads by how their content reached SharePoint (upload, copy or reference)", ["kind", "outcome"]
+)
+UPLOAD_BYTES_SAVED = Counter(
+    "upload_bytes_saved_total", "Upload bytes not sent to SharePoint because the content was already there", ["kind"]
+)
+
+
+class UploadDedupeService:
+    """Puts upload content in SharePoint, reusing identical content already there when UPLOAD_DEDUPE_MODE allows"""
+
+    async def content_hash(self, content: bytes) -> str:
+        # hashlib releases the GIL on large buffers, so recordings hash without stalling the event loop
+        return await run_in_threadpool(lambda: hashlib.sha256(content).hexdigest())
+
+    def find_upload(self, db: Session, model, user_id: int, idempotency_key: str):
+        """Row of model created by this user's earlier upload with the same Idempotency-Key"""
+        return db.query(model).filter(model.user_id == user_id, model.idempotency_key == idempotency_key).first()
+
+    def find_duplicate(self, db: Session, model, content_sha256: str, project_id: int):
+        """Oldest row of model (File or Recording) whose SharePoint item holds this content, same project first"""
+        return db.query(model).filter(
+            model.content_sha256 == content_sha256,
+            model.sharepoint_file_id.isnot(None)
+        ).order_by(model.project_id != project_id, model.id).first()
+
+    async def store(
+        self,
+        db: Session,
+        model,
+        content: bytes,
+        content_sha256: str,
+        file_name: str,
+        folder_path: str,
+        project_id: int
+    ) -> dict:
+        """SharePoint item (id, webUrl) holding the content: uploaded, copied server-side or reused"""
+        kind = model.__tablename__
+        duplicate = None
+        if settings.UPLOAD_DEDUPE_MODE in ("copy", "reference"):
+            duplicate = self.find_duplicate(db, model, content_sha256, project_id)
+
+        if duplicate is not None:
+            # References stay within a project: its folder is deleted with it, along with every row using it
+            if settings.UPLOAD_DEDUPE_MODE == "reference" and duplicate.project_id == project_id:
+                UPLOADS.labels(kind, "reference").inc()
+                UPLOAD_BYTES_SAVED.labels(kind).inc(len(content))
+                return {"id": duplicate.sharepoint_file_id, "webUrl": duplicate.sharepoint_url}
+            try:
+                item = await sharepoint_service.copy_file(duplicate.sharepoint_file_id, file_name, folder_path)
+                UPLOADS.labels(kind, "copy").inc()
+                UPLOAD_BYTES_SAVED.labels(kind).inc(len(content))
+                return item
+            except GraphUnavailable:
+                raise
+            except Exception as e:
+                # e.g. the original was removed from SharePoint directly; the bytes are at hand, so send them
+                print(f"Server-side copy of {duplicate.sharepoint_file_id} failed, uploading instead: {e}")
+
+        item = await sharepoint_service.upload_file(file_content=content, file_name=file_name, folder_path=folder_path)
+        UPLOADS.labels(kind, "upload").inc()
+        return item
+
+    async def discard(self, db: Session, model, item_id: str) -> None:
+        """Delete an item stored for a row that was never saved, unless a saved row uses it"""
+        if not item_id or db.query(model.id).filter(model.sharepoint_file_id == item_id).first() is not None:
+            return
+        try:
+            await sharepoint_service.delete_file(item_id)
+        except Exception as e:
+            print(f"Failed to delete unsaved upload {item_id} from SharePoint: {e}")
+
+    def is_shared(self, db: Session, model, row) -> bool:
+        """Whether another row still uses row's SharePoint item, which must then outlive row"""
+        return db.query(model.id).filter(
+            model.sharepoint_file_id == row.sharepoint_file_id,
+            model.id != row.id
+        ).first() is not None
+
+
+# Singleton instance
+upload_dedupe_service = UploadDedupeService()
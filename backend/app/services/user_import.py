@@ -0,0 +1,134 @@
+import csv
+import io
+import json
+from datetime import datetime, timedelta, timezone
+from typing import List, Tuple
+from pydantic import ValidationError
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+from starlette.concurrency import run_in_threadpool
+from app.config import settings
+from app.models.user import User
+from app.schemas.user import UserImportItem
+from app.utils.security import hash_passwords, create_invite_token
+
+# Stored for invited users until they accept; never verifies against any password
+UNUSABLE_PASSWORD = "!"
+
+
+def parse_import(content: bytes, content_type: str) -> List[dict]:
+    """Parse an upload into raw rows: a JSON array of objects, or CSV with a header row"""
+    text = content.decode("utf-8-sig")
+    if "json" in content_type:
+        rows = json.loads(text)
+        if not isinstance(rows, list) or not all(isinstance(row, dict) for row in rows):
+            raise ValueError("JSON body must be an array of objects")
+        return rows
+    if "csv" in content_type:
+        # Empty cells mean "not provided"
+        return [
+            {key.strip(): value.strip() for key, value in row.items() if key and value and value.strip()}
+            for row in csv.DictReader(io.StringIO(text))
+        ]
+    raise ValueError("Content-Type must be application/json or text/csv")
+
+
+class UserImportService:
+    def validate(self, rows: List[dict]) -> Tuple[List[Tuple[int, UserImportItem]], List[dict]]:
+        """Validate rows and drop repeated emails within the upload"""
+        items, skipped, seen = [], [], set()
+        for number, row in enumerate(rows, start=1):
+            try:
+                item = UserImportItem(**row)
+            except ValidationError as e:
+                error = e.errors()[0]
+                field = ".".join(str(part) for part in error["loc"])
+                skipped.append({"row": number, "email": row.get("email"), "reason": f"{field}: {error['msg']}"})
+                continue
+            if item.email in seen:
+                skipped.append({"row": number, "email": item.email, "reason": "Duplicate email in import"})
+                continue
+            seen.add(item.email)
+            items.append((number, item))
+        return items, skipped
+
+    def _existing_emails(self, db: Session, emails: List[str]) -> set:
+        # One lookup against the unique email index
+        return set(db.execute(select(User.email).where(User.email.in_(emails))).scalars()) if emails else set()
+
+    def _insert(self, db: Session, values: List[dict]) -> dict:
+        """Insert the users, returning email -> id for those created"""
+        if db.get_bind().dialect.name == "postgresql":
+            from sqlalchemy.dialects.postgresql import insert
+        else:
+            from sqlalchemy.dialects.sqlite import insert
+
+        # A concurrent registration of the same email is skipped rather than failing the batch
+        statement = (
+            insert(User)
+            .values(values)
+            .on_conflict_do_nothing(index_elements=["email"])
+            .returning(User.id, User.email)
+        )
+        inserted = {email: user_id for user_id, email in db.execute(statement).all()}
+        db.commit()
+        return inserted
+
+    async def import_users(self, db: Session, rows: List[dict]) -> dict:
+        """Create users in one multi-row INSERT; passwords are hashed in parallel, the rest get invite tokens"""
+        items, skipped = self.validate(rows)
+
+        # Database work goes to the threadpool and hashing to the process pool, keeping the event loop free
+        existing = await run_in_threadpool(self._existing_emails, db, [item.email for _, item in items])
+        new_items = []
+        for number, item in items:
+            if item.email in existing:
+                skipped.append({"row": number, "email": item.email, "reason": "Email already registered"})
+            else:
+                new_items.append((number, item))
+
+        if not new_items:
+            return {"created": [], "skipped": sorted(skipped, key=lambda s: s["row"])}
+
+        with_password = [item for _, item in new_items if item.password]
+        hashes = dict(zip(
+            (item.email for item in with_password),
+            await hash_passwords([item.password for item in with_password])
+        ))
+
+        invite_expires_at = datetime.now(timezone.utc) + timedelta(hours=settings.INVITE_TOKEN_EXPIRE_HOURS)
+        values, invite_tokens = [], {}
+        for _, item in new_items:
+            value = {
+                "email": item.email,
+                "full_name": item.full_name,
+                "role": item.role,
+                "is_active": True,
+                "hashed_password": hashes.get(item.email, UNUSABLE_PASSWORD),
+                "invite_token_hash": None,
+                "invite_expires_at": None,
+            }
+            if item.email not in hashes:
+                token, token_hash = create_invite_token()
+                invite_tokens[item.email] = token
+                value.update(is_active=False, invite_token_hash=token_hash, invite_expires_at=invite_expires_at)
+            values.append(value)
+
+        inserted = await run_in_threadpool(self._insert, db, values)
+
+        created = []
+        for number, item in new_items:
+            if item.email in inserted:
+                created.append({
+                    "id": inserted[item.email],
+                    "email": item.email,
+                    "invite_token": invite_tokens.get(item.email),
+                })
+            else:
+                skipped.append({"row": number, "email": item.email, "reason": "Email already registered"})
+
+        return {"created": created, "skipped": sorted(skipped, key=lambda s: s["row"])}
+
+
+# Singleton instance
+user_import_service = UserImportService()
@@ -1,20 +1,18 @@
-from fastapi import Depends, HTTPException, status
+from fastapi import Depends, HTTPException, Query, status
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from sqlalchemy.orm import Session
 from app.database import get_db
 from app.models.user import User, UserRole
 from app.utils.security import decode_token
+from app.services.token_store import token_store
 from typing import Optional
 
 security = HTTPBearer()
+optional_security = HTTPBearer(auto_error=False)
 
 
-def get_current_user(
-    credentials: HTTPAuthorizationCredentials = Depends(security),
-    db: Session = Depends(get_db)
-) -> User:
-    """Get the current authenticated user"""
-    token = credentials.credentials
+def authenticate_token(token: str, db: Session) -> User:
+    """Resolve an access token to an active user"""
     payload = decode_token(token)
     
     if payload is None or payload.get("type") != "access":
@@ -32,6 +30,13 @@ def get_current_user(
             headers={"WWW-Authenticate": "Bearer"},
         )
     
+    if payload.get("fid") and token_store.is_revoked(payload["fid"]):
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Session revoked",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+    
     user = db.query(User).filter(User.id == user_id).first()
     if user is None:
         raise HTTPException(
@@ -49,6 +54,31 @@ def get_current_user(
     return user
 
 
+def get_current_user(
+    credentials: HTTPAuthorizationCredentials = Depends(security),
+    db: Session = Depends(get_db)
+) -> User:
+    """Get the current authenticated user"""
+    return authenticate_token(credentials.credentials, db)
+
+
+def get_stream_user(
+    token: Optional[str] = Query(None),
+    credentials: Optional[HTTPAuthorizationCredentials] = Depends(optional_security),
+    db: Session = Depends(get_db)
+) -> User:
+    """Get the current user for streaming endpoints (EventSource cannot send headers, so ?token= is accepted)"""
+    if credentials is not None:
+        return authenticate_token(credentials.credentials, db)
+    if token:
+        return authenticate_token(token, db)
+    raise HTTPException(
+        status_code=status.HTTP_401_UNAUTHORIZED,
+        detail="Not authenticated",
+        headers={"WWW-Authenticate": "Bearer"},
+    )
+
+
 def get_current_active_user(current_user: User = Depends(get_current_user)) -> User:
     """Get current active user"""
     return current_user
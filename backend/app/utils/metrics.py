@@ -0,0 +1,110 @@
+import functools
+import os
+import time
+from contextvars import ContextVar
+from typing import Optional
+from prometheus_client import (
+    CONTENT_TYPE_LATEST,
+    CollectorRegistry,
+    Gauge,
+    Histogram,
+    REGISTRY,
+    generate_latest,
+    multiprocess,
+)
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from app.utils.tracing import span
+
+# Multi-worker servers must export PROMETHEUS_MULTIPROC_DIR (an empty directory) before starting;
+# each worker then writes its samples there and /metrics aggregates them
+MULTIPROCESS = bool(os.environ.get("PROMETHEUS_MULTIPROC_DIR"))
+
+HTTP_REQUEST_DURATION = Histogram(
+    "http_request_duration_seconds", "HTTP request latency", ["method", "route", "status"]
+)
+HTTP_REQUESTS_IN_PROGRESS = Gauge(
+    "http_requests_in_progress", "HTTP requests being served", ["method"], multiprocess_mode="livesum"
+)
+DB_QUERIES_PER_REQUEST = Histogram(
+    "db_queries_per_request", "Database queries executed while serving a request", ["method", "route"],
+    buckets=(0, 1, 2, 3, 5, 8, 13, 21, 34, 55, 100, 200)
+)
+DB_QUERY_SECONDS_PER_REQUEST = Histogram(
+    "db_query_seconds_per_request", "Time spent in database queries while serving a request", ["method", "route"]
+)
+OUTBOUND_REQUEST_DURATION = Histogram(
+    "outbound_request_duration_seconds", "Latency of calls to external services", ["service", "method", "outcome"],
+    buckets=(0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 120)
+)
+OUTBOUND_REQUESTS_IN_PROGRESS = Gauge(
+    "outbound_requests_in_progress", "Calls to external services in flight", ["service"], multiprocess_mode="livesum"
+)
+
+
+class QueryStats:
+    __slots__ = ("count", "seconds")
+
+    def __init__(self):
+        self.count = 0
+        self.seconds = 0.0
+
+
+# Set per request by MetricsMiddleware; threadpool endpoints inherit it with the rest of the context
+current_query_stats: ContextVar[Optional[QueryStats]] = ContextVar("current_query_stats", default=None)
+
+
+@event.listens_for(Engine, "before_cursor_execute")
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault("query_start_time", []).append(time.perf_counter())
+
+
+@event.listens_for(Engine, "after_cursor_execute")
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    started = conn.info["query_start_time"].pop()
+    stats = current_query_stats.get()
+    if stats is not None:
+        stats.count += 1
+        stats.seconds += time.perf_counter() - started
+
+
+@event.listens_for(Engine, "handle_error")
+def _handle_error(exception_context):
+    # A failed statement never reaches after_cursor_execute
+    connection = exception_context.connection
+    if connection is not None and connection.info.get("query_start_time"):
+        connection.info["query_start_time"].pop()
+
+
+def observe_outbound(service: str, method: Optional[str] = None):
+    """Time and trace each call of an async service method, labelled by service, method (default: its name) and outcome"""
+    def decorator(func):
+        label = method or func.__name__
+        name = f"{service}.{label}"
+
+        @functools.wraps(func)
+        async def wrapper(*args, **kwargs):
+            outcome = "error"
+            in_progress = OUTBOUND_REQUESTS_IN_PROGRESS.labels(service)
+            in_progress.inc()
+            started = time.perf_counter()
+            try:
+                with span(name):
+                    result = await func(*args, **kwargs)
+                outcome = "ok"
+                return result
+            finally:
+                OUTBOUND_REQUEST_DURATION.labels(service, label, outcome).observe(time.perf_counter() - started)
+                in_progress.dec()
+        return wrapper
+    return decorator
+
+
+def render_metrics() -> bytes:
+    """Exposition text for this process, or for all workers in multiprocess mode"""
+    if MULTIPROCESS:
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+        return generate_latest(registry)
+    return generate_latest(REGISTRY)
+
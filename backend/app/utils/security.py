@@ -1,5 +1,10 @@
+import asyncio
+import hashlib
+import multiprocessing
+import secrets
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime, timedelta
-from typing import Optional
+from typing import List, Optional, Tuple
 from jose import JWTError, jwt
 from passlib.context import CryptContext
 from app.config import settings
@@ -9,7 +14,11 @@ pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
     """Verify a password against its hash"""
-    return pwd_context.verify(plain_password, hashed_password)
+    try:
+        return pwd_context.verify(plain_password, hashed_password)
+    except ValueError:
+        # Unusable hash, e.g. an invited user who has not set a password yet
+        return False
 
 
 def get_password_hash(password: str) -> str:
@@ -46,3 +55,36 @@ def decode_token(token: str) -> dict:
         return payload
     except JWTError:
         return None
+
+
+# Shared pool so bulk imports hash on every core instead of blocking the event loop
+_hash_pool: Optional[ProcessPoolExecutor] = None
+
+
+async def hash_passwords(passwords: List[str]) -> List[str]:
+    """Hash many passwords in parallel across a process pool"""
+    global _hash_pool
+    if _hash_pool is None:
+        _hash_pool = ProcessPoolExecutor(
+            max_workers=settings.PASSWORD_HASH_WORKERS,
+            mp_context=multiprocessing.get_context("spawn")
+        )
+    loop = asyncio.get_running_loop()
+    return await asyncio.gather(*(loop.run_in_executor(_hash_pool, get_password_hash, password) for password in passwords))
+
+
+def shutdown_hash_pool() -> None:
+    global _hash_pool
+    if _hash_pool is not None:
+        _hash_pool.shutdown(cancel_futures=True)
+        _hash_pool = None
+
+
+def create_invite_token() -> Tuple[str, str]:
+    """Create an invite token; returns (token, sha256 hex digest to store)"""
+    token = secrets.token_urlsafe(32)
+    return token, hash_invite_token(token)
+
+
+def hash_invite_token(token: str) -> str:
+    return hashlib.sha256(token.encode()).hexdigest()
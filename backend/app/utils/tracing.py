@@ -0,0 +1,61 @@
+import os
+from contextlib import nullcontext
+from app.config import settings
+
+# Set by setup_tracing(); while None, span() is a no-op and OpenTelemetry is never imported
+_tracer = None
+_provider = None
+
+
+def _exporter():
+    if settings.TRACING_EXPORTER == "file":
+        from opentelemetry.sdk.trace.export import ConsoleSpanExporter
+
+        # One JSON span per line, for loading into a local collector or analysing directly
+        out = open(settings.TRACING_FILE_PATH, "a", buffering=1)
+        return ConsoleSpanExporter(out=out, formatter=lambda span: span.to_json(indent=None) + os.linesep)
+
+    from opentelemetry.exporter.otlp.proto.http.trace_exporter import OTLPSpanExporter
+    return OTLPSpanExporter(endpoint=settings.TRACING_OTLP_ENDPOINT)
+
+
+def setup_tracing(app, engine) -> None:
+    """Trace requests, SQL statements and outbound httpx calls; W3C trace context is extracted and injected"""
+    global _tracer, _provider
+    if not settings.TRACING_ENABLED:
+        return
+
+    from opentelemetry import trace
+    from opentelemetry.instrumentation.fastapi import FastAPIInstrumentor
+    from opentelemetry.instrumentation.httpx import HTTPXClientInstrumentor
+    from opentelemetry.instrumentation.sqlalchemy import SQLAlchemyInstrumentor
+    from opentelemetry.sdk.resources import Resource
+    from opentelemetry.sdk.trace import TracerProvider
+    from opentelemetry.sdk.trace.export import BatchSpanProcessor
+    from opentelemetry.sdk.trace.sampling import ParentBased, TraceIdRatioBased
+
+    # Callers that already sampled (or dropped) a trace decide for us; new traces use the ratio
+    _provider = TracerProvider(
+        resource=Resource.create({"service.name": settings.TRACING_SERVICE_NAME}),
+        sampler=ParentBased(TraceIdRatioBased(settings.TRACING_SAMPLE_RATIO)),
+    )
+    _provider.add_span_processor(BatchSpanProcessor(_exporter()))
+    trace.set_tracer_provider(_provider)
+    _tracer = trace.get_tracer("app")
+
+    FastAPIInstrumentor.instrument_app(app, tracer_provider=_provider, excluded_urls="/health,/metrics")
+    SQLAlchemyInstrumentor().instrument(engine=engine, tracer_provider=_provider)
+    HTTPXClientInstrumentor().instrument(tracer_provider=_provider)
+
+
+def shutdown_tracing() -> None:
+    """Flush spans still buffered in the batch processor"""
+    if _provider is not None:
+        _provider.shutdown()
+
+
+def span(name: str, **attributes):
+    """Context manager for a child span of the current trace (no-op when tracing is disabled)"""
+    if _tracer is None:
+        return nullcontext()
+    return _tracer.start_as_current_span(name, attributes=attributes)
@@ -0,0 +1,104 @@
+"""Measure how long GoogleCalendarService blocks the event loop.
+
+Runs calendar calls against an in-process Calendar API stand-in with
+simulated network latency while a probe task measures event-loop lag.
+Exits non-zero if the worst observed lag exceeds the budget.
+
+    cd backend && python -m benchmarks.calendar_loop_block --calls 200 --latency-ms 50
+"""
+import argparse
+import asyncio
+import json
+import statistics
+import sys
+import time
+from datetime import datetime, timedelta, timezone
+import httpx
+from app.services.google_calendar import GoogleCalendarService
+
+
+def make_transport(latency: float) -> httpx.AsyncBaseTransport:
+    """Calendar API stand-in that answers every call after a non-blocking delay"""
+    async def handler(request: httpx.Request) -> httpx.Response:
+        await asyncio.sleep(latency)
+        if request.method == "DELETE":
+            return httpx.Response(204)
+        if request.method == "GET" and request.url.path.endswith("/events"):
+            return httpx.Response(200, json={"items": []})
+        body = json.loads(request.content or b"{}")
+        body.setdefault("id", "evt-bench")
+        return httpx.Response(200, json=body)
+
+    return httpx.MockTransport(handler)
+
+
+async def probe_lag(interval: float, samples: list, stop: asyncio.Event) -> None:
+    """Record how late each wake-up is compared to the requested interval"""
+    while not stop.is_set():
+        started = time.perf_counter()
+        await asyncio.sleep(interval)
+        samples.append(time.perf_counter() - started - interval)
+
+
+async def run(calls: int, concurrency: int, latency: float) -> dict:
+    service = GoogleCalendarService(transport=make_transport(latency))
+    service.refresh_token = "bench"
+    service._access_token = "bench"
+    service._token_expires_at = float("inf")
+
+    start_time = datetime.now(timezone.utc)
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def one(index: int) -> None:
+        async with semaphore:
+            event = await service.create_event(
+                summary=f"Bench {index}",
+                description="",
+                start_time=start_time + timedelta(hours=index),
+                end_time=start_time + timedelta(hours=index + 1),
+                attendee_emails=["bench@example.com"]
+            )
+            await service.update_event(event["id"], summary="Updated")
+            await service.delete_event(event["id"])
+
+    samples: list = []
+    stop = asyncio.Event()
+    probe = asyncio.create_task(probe_lag(0.001, samples, stop))
+
+    started = time.perf_counter()
+    await asyncio.gather(*(one(index) for index in range(calls)))
+    elapsed = time.perf_counter() - started
+
+    stop.set()
+    await probe
+    await service.close()
+
+    samples.sort()
+    return {
+        "calls": calls * 3,
+        "elapsed_s": round(elapsed, 3),
+        "lag_p50_ms": round(statistics.median(samples) * 1000, 3),
+        "lag_p99_ms": round(samples[int(len(samples) * 0.99) - 1] * 1000, 3),
+        "lag_max_ms": round(samples[-1] * 1000, 3),
+    }
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--calls", type=int, default=200)
+    parser.add_argument("--concurrency", type=int, default=20)
+    parser.add_argument("--latency-ms", type=float, default=50.0)
+    parser.add_argument("--budget-ms", type=float, default=20.0, help="maximum tolerated loop lag")
+    args = parser.parse_args()
+
+    result = asyncio.run(run(args.calls, args.concurrency, args.latency_ms / 1000))
+    print(json.dumps(result, indent=2))
+
+    if result["lag_max_ms"] > args.budget_ms:
+        print(f"FAIL: event loop blocked for {result['lag_max_ms']} ms (budget {args.budget_ms} ms)")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
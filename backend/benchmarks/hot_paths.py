@@ -0,0 +1,227 @@
+"""Micro-benchmarks for the auth and serialization code run on every request.
+
+Cases run in isolation against an in-memory SQLite database and synthetic
+tokens, in rounds like pytest-benchmark:
+  decode_token         verify and decode an access token
+  get_current_user     token to active user, with a fresh session as get_db gives
+  membership_check     `project in current_user.projects`, lazy load included
+  serialize_projects   List[Project] response model, validated from ORM objects and dumped to JSON
+  serialize_requests   List[Request] with their messages
+  serialize_bookings   List[Booking]
+
+CPU time per call is process time (min/median/mean/stddev over rounds).
+Allocations come from tracemalloc in separate calls: the peak above the
+starting point during a call, and the bytes still held after it.
+Saved results can be compared with a later run; --compare exits non-zero
+when a case's median CPU time grows by more than the tolerance.
+
+    cd backend && python -m benchmarks.hot_paths
+    cd backend && python -m benchmarks.hot_paths --filter serialize --save before.json
+    cd backend && python -m benchmarks.hot_paths --compare before.json
+"""
+import os
+
+# Before any app import: the engine is created from this at import time
+os.environ["DATABASE_URL"] = "sqlite://"
+
+import argparse
+import json
+import statistics
+import sys
+import time
+import tracemalloc
+from datetime import datetime, timedelta, timezone
+from typing import Callable, Dict, List
+from fastapi.security import HTTPAuthorizationCredentials
+from pydantic import TypeAdapter
+from sqlalchemy.orm import selectinload
+import app.models  # noqa: F401  (registers every table)
+from app.database import Base, SessionLocal, engine
+from app.models.booking import AvailabilitySlot, Booking, BookingStatus
+from app.models.project import Project
+from app.models.request import Request, RequestMessage, RequestType
+from app.models.user import User, UserRole
+from app.schemas import Booking as BookingSchema, Project as ProjectSchema, Request as RequestSchema
+from app.services.token_store import token_store
+from app.utils.deps import get_current_user
+from app.utils.security import create_access_token, decode_token
+
+
+def seed(items: int, memberships: int, messages: int) -> dict:
+    """Admin, one client belonging to `memberships` projects, and `items` projects/requests/bookings"""
+    Base.metadata.create_all(bind=engine)
+    now = datetime.now(timezone.utc)
+    db = SessionLocal()
+    admin = User(email="admin@bench.test", hashed_password="x", full_name="Bench Admin", role=UserRole.ADMIN)
+    client = User(email="client@bench.test", hashed_password="x", full_name="Bench Client", role=UserRole.CLIENT)
+    projects = [
+        Project(name=f"Project {i}", description="Benchmark project", start_date=now)
+        for i in range(max(items, memberships))
+    ]
+    client.projects = projects[:memberships]
+    db.add_all([admin, client, *projects])
+    db.flush()
+
+    for i in range(items):
+        request = Request(
+            user_id=client.id, project_id=projects[i].id, title=f"Request {i}",
+            description="Benchmark request", type=RequestType.IMPROVEMENT
+        )
+        request.messages = [RequestMessage(user_id=client.id, message=f"Message {j}") for j in range(messages)]
+        slot = AvailabilitySlot(start_time=now + timedelta(hours=i), end_time=now + timedelta(hours=i, minutes=50), is_available=False)
+        db.add_all([request, slot])
+        db.flush()
+        db.add(Booking(
+            user_id=client.id, slot_id=slot.id, title=f"Booking {i}", start_time=slot.start_time,
+            end_time=slot.end_time, status=BookingStatus.CONFIRMED, meeting_link="https://meet.example.com/bench"
+        ))
+
+    fid, _ = token_store.create_family(db, client.id)
+    db.commit()
+    ids = {"client_id": client.id, "project_id": projects[0].id, "fid": fid}
+    db.close()
+    return ids
+
+
+def build_cases(args) -> Dict[str, Callable[[], object]]:
+    ids = seed(args.items, args.memberships, args.messages)
+    token = create_access_token(data={"sub": str(ids["client_id"]), "fid": ids["fid"]})
+    credentials = HTTPAuthorizationCredentials(scheme="Bearer", credentials=token)
+
+    def current_user():
+        db = SessionLocal()
+        try:
+            return get_current_user(credentials, db)
+        finally:
+            db.close()
+
+    db = SessionLocal()
+    member = db.get(User, ids["client_id"])
+    project = db.get(Project, ids["project_id"])
+
+    def membership_check():
+        # As in a request: the user's projects have not been loaded yet
+        db.expire(member, ["projects"])
+        return project in member.projects
+
+    projects = db.query(Project).order_by(Project.id).limit(args.items).all()
+    requests = db.query(Request).options(selectinload(Request.messages)).order_by(Request.id).all()
+    bookings = db.query(Booking).order_by(Booking.id).all()
+
+    def serializer(schema, objects):
+        # What FastAPI does with a response_model: validate from attributes, then dump JSON
+        adapter = TypeAdapter(List[schema])
+        return lambda: adapter.dump_json(adapter.validate_python(objects))
+
+    return {
+        "decode_token": lambda: decode_token(token),
+        "get_current_user": current_user,
+        "membership_check": membership_check,
+        "serialize_projects": serializer(ProjectSchema, projects),
+        "serialize_requests": serializer(RequestSchema, requests),
+        "serialize_bookings": serializer(BookingSchema, bookings),
+    }
+
+
+def calibrate(fn: Callable, min_round: float) -> int:
+    """Calls per round so one round takes at least min_round seconds of CPU"""
+    iterations = 1
+    while True:
+        started = time.process_time()
+        for _ in range(iterations):
+            fn()
+        if time.process_time() - started >= min_round:
+            return iterations
+        iterations *= 2
+
+
+def measure_cpu(fn: Callable, rounds: int, min_round: float) -> dict:
+    fn()
+    iterations = calibrate(fn, min_round)
+    per_call = []
+    for _ in range(rounds):
+        started = time.process_time()
+        for _ in range(iterations):
+            fn()
+        per_call.append((time.process_time() - started) / iterations)
+    return {
+        "iterations": iterations,
+        "min_us": round(min(per_call) * 1e6, 2),
+        "median_us": round(statistics.median(per_call) * 1e6, 2),
+        "mean_us": round(statistics.mean(per_call) * 1e6, 2),
+        "stddev_us": round(statistics.stdev(per_call) * 1e6, 2) if len(per_call) > 1 else 0.0,
+    }
+
+
+def measure_allocations(fn: Callable, calls: int) -> dict:
+    peaks, retained = [], []
+    tracemalloc.start()
+    try:
+        fn()
+        for _ in range(calls):
+            tracemalloc.reset_peak()
+            before = tracemalloc.get_traced_memory()[0]
+            fn()
+            current, peak = tracemalloc.get_traced_memory()
+            peaks.append(peak - before)
+            retained.append(current - before)
+    finally:
+        tracemalloc.stop()
+    return {
+        "peak_kib": round(statistics.median(peaks) / 1024, 1),
+        "retained_bytes": round(statistics.mean(retained)),
+    }
+
+
+def print_table(results: dict, baseline: dict) -> None:
+    print(f"{'case':<22}{'median us':>12}{'min us':>10}{'stddev':>10}{'peak KiB':>10}{'retained B':>12}{'vs baseline':>13}")
+    for name, r in results.items():
+        change = ""
+        if name in baseline:
+            change = f"{(r['median_us'] / baseline[name]['median_us'] - 1) * 100:+.1f}%"
+        print(
+            f"{name:<22}{r['median_us']:>12}{r['min_us']:>10}{r['stddev_us']:>10}"
+            f"{r['peak_kib']:>10}{r['retained_bytes']:>12}{change:>13}"
+        )
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--filter", default="", help="only run cases whose name contains this")
+    parser.add_argument("--rounds", type=int, default=10)
+    parser.add_argument("--min-round-ms", type=float, default=100.0, help="CPU time each round runs for at least")
+    parser.add_argument("--allocation-calls", type=int, default=20)
+    parser.add_argument("--items", type=int, default=50, help="objects in each serialized list")
+    parser.add_argument("--memberships", type=int, default=20, help="projects the benchmark client belongs to")
+    parser.add_argument("--messages", type=int, default=5, help="messages per serialized request")
+    parser.add_argument("--save", help="write the results as JSON")
+    parser.add_argument("--compare", help="results saved by an earlier run")
+    parser.add_argument("--tolerance", type=float, default=0.1, help="allowed relative growth of median CPU time")
+    args = parser.parse_args()
+
+    cases = {name: fn for name, fn in build_cases(args).items() if args.filter in name}
+    results = {}
+    for name, fn in cases.items():
+        results[name] = {**measure_cpu(fn, args.rounds, args.min_round_ms / 1000), **measure_allocations(fn, args.allocation_calls)}
+
+    baseline = {}
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+    print_table(results, baseline)
+
+    if args.save:
+        with open(args.save, "w") as f:
+            json.dump(results, f, indent=2)
+
+    regressions = [
+        name for name, r in results.items()
+        if name in baseline and r["median_us"] > baseline[name]["median_us"] * (1 + args.tolerance)
+    ]
+    for name in regressions:
+        print(f"REGRESSION: {name} {results[name]['median_us']} us vs {baseline[name]['median_us']} us")
+    return int(bool(regressions))
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,449 @@
+"""Local stand-ins for Microsoft Graph (SharePoint) and Google Calendar.
+
+Serves just enough of both APIs for the app's services: MSAL discovery and
+client-credentials tokens, drive uploads/copies/metadata/deletes, calendar events,
+push channels and batch requests. Every API call is delayed by the
+configured latency and can be throttled (429 + Retry-After) once a
+requests-per-second limit is exceeded, or fail with 503 at a given rate.
+
+Graph is served over HTTPS with a throwaway self-signed certificate because
+MSAL refuses plain-HTTP authorities. The overrides the API needs (endpoints,
+credentials, the certificate to trust) are written to an env file:
+
+    cd backend && python -m benchmarks.load.fakes --latency-ms 80 --rps-limit 200 --env-file load.env
+    set -a && . ./load.env && set +a && gunicorn -c gunicorn_conf.py app.main:app
+
+GET /_stats on either server reports request, throttle, error, byte and copy counts.
+"""
+import argparse
+import asyncio
+import ipaddress
+import json
+import os
+import random
+import signal
+import tempfile
+import time
+import uuid
+from datetime import datetime, timedelta, timezone
+from typing import Dict, Optional, Tuple
+from urllib.parse import parse_qsl, urlsplit
+import uvicorn
+from starlette.applications import Starlette
+from starlette.requests import Request
+from starlette.responses import JSONResponse, Response
+from starlette.routing import Route
+
+TENANT_ID = "load-tenant"
+DRIVE_ID = "load-drive"
+
+
+class Stats:
+    def __init__(self):
+        self.requests = 0
+        self.throttled = 0
+        self.errors = 0
+        self.bytes_received = 0
+        self.copies = 0
+
+    def as_dict(self) -> dict:
+        return dict(vars(self))
+
+
+class FaultInjection:
+    """Delays API calls and answers some with 429/503, like the real service under load"""
+
+    def __init__(self, app, stats: Stats, latency: float, jitter: float, rps_limit: float,
+                 retry_after: float, error_rate: float, exempt: Tuple[str, ...] = ("/_stats",)):
+        self.app = app
+        self.stats = stats
+        self.latency = latency
+        self.jitter = jitter
+        self.rps_limit = rps_limit
+        self.retry_after = retry_after
+        self.error_rate = error_rate
+        self.exempt = exempt
+        # Token bucket holding one second of requests
+        self._tokens = rps_limit
+        self._refilled_at = time.monotonic()
+
+    def _throttled(self) -> bool:
+        if not self.rps_limit:
+            return False
+        now = time.monotonic()
+        self._tokens = min(self.rps_limit, self._tokens + (now - self._refilled_at) * self.rps_limit)
+        self._refilled_at = now
+        if self._tokens < 1:
+            return True
+        self._tokens -= 1
+        return False
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope["path"].startswith(self.exempt):
+            return await self.app(scope, receive, send)
+
+        self.stats.requests += 1
+        await asyncio.sleep(self.latency + random.uniform(0, self.jitter))
+
+        if self._throttled():
+            self.stats.throttled += 1
+            response = JSONResponse(
+                {"error": {"code": "TooManyRequests", "message": "Request throttled by the stand-in"}},
+                status_code=429,
+                headers={"Retry-After": str(self.retry_after)},
+            )
+            return await response(scope, receive, send)
+        if self.error_rate and random.random() < self.error_rate:
+            self.stats.errors += 1
+            response = JSONResponse({"error": {"code": "serviceNotAvailable", "message": "Injected failure"}}, status_code=503)
+            return await response(scope, receive, send)
+
+        await self.app(scope, receive, send)
+
+
+def _stats_route(stats: Stats) -> Route:
+    async def get_stats(request: Request) -> JSONResponse:
+        return JSONResponse(stats.as_dict())
+    return Route("/_stats", get_stats)
+
+
+# Microsoft Graph
+
+def create_graph_app(stats: Stats) -> Starlette:
+    items: Dict[str, dict] = {}
+    paths: Dict[str, str] = {}
+    copy_jobs: Dict[str, str] = {}
+
+    def base_url(request: Request) -> str:
+        return str(request.base_url).rstrip("/")
+
+    async def openid_configuration(request: Request) -> JSONResponse:
+        tenant = f"{base_url(request)}/{request.path_params['tenant']}"
+        return JSONResponse({
+            "issuer": f"{tenant}/v2.0",
+            "authorization_endpoint": f"{tenant}/oauth2/v2.0/authorize",
+            "token_endpoint": f"{tenant}/oauth2/v2.0/token",
+        })
+
+    async def token(request: Request) -> JSONResponse:
+        return JSONResponse({"token_type": "Bearer", "expires_in": 3599, "access_token": f"graph-{uuid.uuid4().hex}"})
+
+    def new_item(request: Request, path: str, **fields) -> dict:
+        item_id = uuid.uuid4().hex
+        item = {
+            "id": item_id,
+            "name": path.rsplit("/", 1)[-1],
+            "webUrl": f"{base_url(request)}/sites/load{path}",
+            "@microsoft.graph.downloadUrl": f"{base_url(request)}/download/{item_id}",
+            "createdDateTime": datetime.now(timezone.utc).isoformat(),
+            "parentReference": {"driveId": request.path_params["drive_id"], "path": path.rsplit("/", 1)[0]},
+            **fields,
+        }
+        items[item_id] = item
+        paths[path] = item_id
+        return item
+
+    async def drive(request: Request) -> Response:
+        rest = request.path_params["rest"]
+        method = request.method
+
+        if rest.startswith("root:"):
+            path = rest[len("root:"):]
+            if path.endswith(":/content") and method == "PUT":
+                body = await request.body()
+                stats.bytes_received += len(body)
+                path = path[:-len(":/content")]
+                previous = paths.pop(path, None)
+                items.pop(previous, None)
+                item = new_item(request, path, size=len(body), file={"mimeType": request.headers.get("content-type")})
+                return JSONResponse(item, status_code=201)
+            if path.endswith(":/children") and method == "POST":
+                body = await request.json()
+                parent = path[:-len(":/children")].rstrip("/")
+                return JSONResponse(new_item(request, f"{parent}/{body['name']}", folder={"childCount": 0}), status_code=201)
+            if method == "DELETE":
+                prefix = path.rstrip("/")
+                doomed = [p for p in paths if p == prefix or p.startswith(f"{prefix}/")]
+                if not doomed:
+                    return JSONResponse({"error": {"code": "itemNotFound"}}, status_code=404)
+                for p in doomed:
+                    items.pop(paths.pop(p), None)
+                return Response(status_code=204)
+
+        if rest.startswith("items/"):
+            item_id, _, action = rest[len("items/"):].partition("/")
+            item = items.get(item_id)
+            if item is None:
+                return JSONResponse({"error": {"code": "itemNotFound"}}, status_code=404)
+            if action == "copy" and method == "POST":
+                body = await request.json()
+                folder = body["parentReference"]["path"].split("root:", 1)[-1].rstrip("/")
+                stem, dot, extension = body.get("name", item["name"]).rpartition(".")
+                path, suffix = f"{folder}/{body.get('name', item['name'])}", 1
+                while path in paths:  # conflictBehavior=rename
+                    path = f"{folder}/{stem} {suffix}{dot}{extension}" if dot else f"{folder}/{extension} {suffix}"
+                    suffix += 1
+                copy = new_item(request, path, size=item.get("size"), file=item.get("file"))
+                stats.copies += 1
+                job_id = uuid.uuid4().hex
+                copy_jobs[job_id] = copy["id"]
+                return Response(status_code=202, headers={"Location": f"{base_url(request)}/monitor/{job_id}"})
+            if method == "GET":
+                return JSONResponse(item)
+            if method == "DELETE":
+                items.pop(item_id)
+                paths.pop(next(p for p, i in paths.items() if i == item_id), None)
+                return Response(status_code=204)
+
+        return JSONResponse({"error": {"code": "invalidRequest", "message": f"{method} {rest}"}}, status_code=400)
+
+    async def monitor(request: Request) -> JSONResponse:
+        # Copies finish immediately; the latency of polling still applies
+        resource_id = copy_jobs.get(request.path_params["job_id"])
+        if resource_id is None:
+            return JSONResponse({"error": {"code": "itemNotFound"}}, status_code=404)
+        return JSONResponse({"status": "completed", "percentageComplete": 100.0, "resourceId": resource_id})
+
+    app = Starlette(routes=[
+        _stats_route(stats),
+        Route("/{tenant}/v2.0/.well-known/openid-configuration", openid_configuration),
+        Route("/{tenant}/oauth2/v2.0/token", token, methods=["POST"]),
+        Route("/v1.0/drives/{drive_id}/{rest:path}", drive, methods=["GET", "PUT", "POST", "DELETE"]),
+        Route("/monitor/{job_id}", monitor),
+    ])
+    return app
+
+
+# Google Calendar
+
+class CalendarStore:
+    """Events of every calendar in one dict, versioned for sync tokens"""
+
+    def __init__(self):
+        self.events: Dict[str, dict] = {}
+        self.version = 0
+
+    def _save(self, event: dict) -> dict:
+        self.version += 1
+        event["etag"] = f'"{self.version}"'
+        event["updated"] = datetime.now(timezone.utc).isoformat()
+        event["_version"] = self.version
+        self.events[event["id"]] = event
+        return event
+
+    @staticmethod
+    def _public(event: dict) -> dict:
+        return {k: v for k, v in event.items() if not k.startswith("_")}
+
+    def handle(self, method: str, path: str, params: dict, headers: dict, body: Optional[dict]) -> Tuple[int, Optional[dict]]:
+        """Serve one Calendar API call (direct or from a batch) as (status, JSON body)"""
+        parts = path.strip("/").split("/")
+        # calendar/v3/channels/stop
+        if parts[-2:] == ["channels", "stop"]:
+            return 204, None
+        # calendar/v3/calendars/{calendarId}/events[/{eventId}|/watch]
+        if len(parts) < 5 or parts[2] != "calendars" or parts[4] != "events":
+            return 404, {"error": {"code": 404, "message": "Not Found"}}
+
+        if len(parts) == 5:
+            if method == "POST":
+                event = {**(body or {}), "id": uuid.uuid4().hex, "status": "confirmed"}
+                if event.get("conferenceData"):
+                    event["hangoutLink"] = f"https://meet.example.com/{event['id'][:10]}"
+                return 200, self._public(self._save(event))
+            since = int(params["syncToken"]) if params.get("syncToken") else 0
+            items = [self._public(e) for e in self.events.values() if e["_version"] > since]
+            if not params.get("syncToken") and not params.get("showDeleted"):
+                items = [e for e in items if e["status"] != "cancelled"]
+            return 200, {"items": items, "nextSyncToken": str(self.version)}
+
+        if parts[5] == "watch":
+            expiration = int((time.time() + int(body.get("params", {}).get("ttl", 3600))) * 1000)
+            return 200, {"kind": "api#channel", "id": body["id"], "resourceId": uuid.uuid4().hex, "expiration": str(expiration)}
+
+        event = self.events.get(parts[5])
+        if event is None or (event["status"] == "cancelled" and method != "GET"):
+            return 410 if event else 404, {"error": {"code": 404, "message": "Not Found"}}
+        if method == "GET":
+            return 200, self._public(event)
+        if method == "DELETE":
+            event["status"] = "cancelled"
+            self._save(event)
+            return 204, None
+        if method in ("PATCH", "PUT"):
+            if headers.get("if-match") and headers["if-match"] != event["etag"]:
+                return 412, {"error": {"code": 412, "message": "Precondition Failed"}}
+            event.update(body or {})
+            return 200, self._public(self._save(event))
+        return 405, {"error": {"code": 405, "message": "Method Not Allowed"}}
+
+
+def _parse_batch(body: str, boundary: str):
+    """Yield (content_id, method, path, params, headers, json body) for each part of a multipart/mixed batch"""
+    for part in body.replace("\r\n", "\n").split(f"--{boundary}"):
+        part = part.strip("\n")
+        if not part or part == "--":
+            continue
+        outer, _, inner = part.partition("\n\n")
+        content_id = next(
+            (line.split(":", 1)[1].strip().strip("<>") for line in outer.split("\n") if line.lower().startswith("content-id:")),
+            ""
+        )
+        head, _, payload = inner.partition("\n\n")
+        request_line, *header_lines = head.split("\n")
+        method, target, _ = request_line.split(" ", 2)
+        url = urlsplit(target)
+        headers = {k.strip().lower(): v.strip() for k, _, v in (line.partition(":") for line in header_lines)}
+        yield content_id, method, url.path, dict(parse_qsl(url.query)), headers, json.loads(payload) if payload.strip() else None
+
+
+def create_google_app(stats: Stats) -> Starlette:
+    store = CalendarStore()
+
+    async def token(request: Request) -> JSONResponse:
+        return JSONResponse({"access_token": f"google-{uuid.uuid4().hex}", "expires_in": 3599, "token_type": "Bearer"})
+
+    async def calendar(request: Request) -> Response:
+        raw = await request.body()
+        status, body = store.handle(
+            request.method, request.url.path, dict(request.query_params),
+            {k.lower(): v for k, v in request.headers.items()}, json.loads(raw) if raw else None
+        )
+        return JSONResponse(body, status_code=status) if body is not None else Response(status_code=status)
+
+    async def batch(request: Request) -> Response:
+        boundary = request.headers["content-type"].split("boundary=", 1)[-1].strip('"')
+        response_boundary = f"batch_{uuid.uuid4().hex}"
+        parts = []
+        for content_id, method, path, params, headers, body in _parse_batch((await request.body()).decode(), boundary):
+            status, result = store.handle(method, path, params, headers, body)
+            payload = json.dumps(result) if result is not None else ""
+            parts.append(
+                f"--{response_boundary}\r\n"
+                "Content-Type: application/http\r\n"
+                f"Content-ID: <response-{content_id}>\r\n\r\n"
+                f"HTTP/1.1 {status} {'OK' if status < 300 else 'Error'}\r\n"
+                "Content-Type: application/json; charset=UTF-8\r\n\r\n"
+                f"{payload}\r\n"
+            )
+        parts.append(f"--{response_boundary}--\r\n")
+        return Response("".join(parts), media_type=f"multipart/mixed; boundary={response_boundary}")
+
+    return Starlette(routes=[
+        _stats_route(stats),
+        Route("/token", token, methods=["POST"]),
+        Route("/calendar/v3/{rest:path}", calendar, methods=["GET", "POST", "PATCH", "PUT", "DELETE"]),
+        Route("/batch/calendar/v3", batch, methods=["POST"]),
+    ])
+
+
+def self_signed_certificate(directory: str, host: str) -> Tuple[str, str]:
+    """Write a throwaway certificate/key pair for host (cryptography ships with msal)"""
+    from cryptography import x509
+    from cryptography.hazmat.primitives import hashes, serialization
+    from cryptography.hazmat.primitives.asymmetric import ec
+    from cryptography.x509.oid import NameOID
+
+    key = ec.generate_private_key(ec.SECP256R1())
+    name = x509.Name([x509.NameAttribute(NameOID.COMMON_NAME, host)])
+    try:
+        alt_name = x509.IPAddress(ipaddress.ip_address(host))
+    except ValueError:
+        alt_name = x509.DNSName(host)
+    now = datetime.now(timezone.utc)
+    certificate = (
+        x509.CertificateBuilder()
+        .subject_name(name)
+        .issuer_name(name)
+        .public_key(key.public_key())
+        .serial_number(x509.random_serial_number())
+        .not_valid_before(now - timedelta(minutes=5))
+        .not_valid_after(now + timedelta(days=7))
+        .add_extension(x509.SubjectAlternativeName([alt_name]), critical=False)
+        .add_extension(x509.BasicConstraints(ca=True, path_length=None), critical=True)
+        .sign(key, hashes.SHA256())
+    )
+    cert_path = os.path.join(directory, "fakes-cert.pem")
+    key_path = os.path.join(directory, "fakes-key.pem")
+    with open(cert_path, "wb") as f:
+        f.write(certificate.public_bytes(serialization.Encoding.PEM))
+    with open(key_path, "wb") as f:
+        f.write(key.private_bytes(serialization.Encoding.PEM, serialization.PrivateFormat.PKCS8, serialization.NoEncryption()))
+    return cert_path, key_path
+
+
+def env_overrides(host: str, graph_port: int, google_port: int, cert_path: str) -> Dict[str, str]:
+    """Settings (and CA bundle variables) pointing the API at the stand-ins"""
+    return {
+        "GRAPH_API_URL": f"https://{host}:{graph_port}/v1.0",
+        "MICROSOFT_AUTHORITY_HOST": f"https://{host}:{graph_port}",
+        "MICROSOFT_TENANT_ID": TENANT_ID,
+        "MICROSOFT_CLIENT_ID": "load-client",
+        "MICROSOFT_CLIENT_SECRET": "load-secret",
+        "SHAREPOINT_DRIVE_ID": DRIVE_ID,
+        "GOOGLE_API_URL": f"http://{host}:{google_port}",
+        "GOOGLE_TOKEN_URL": f"http://{host}:{google_port}/token",
+        "GOOGLE_CLIENT_ID": "load-client",
+        "GOOGLE_CLIENT_SECRET": "load-secret",
+        "GOOGLE_REFRESH_TOKEN": "load-refresh-token",
+        # httpx and requests (MSAL) trust only the stand-in certificate
+        "SSL_CERT_FILE": cert_path,
+        "REQUESTS_CA_BUNDLE": cert_path,
+        # Scenarios drive thousands of users from one address
+        "RATE_LIMIT_ENABLED": "false",
+    }
+
+
+async def serve(args) -> None:
+    cert_path, key_path = self_signed_certificate(args.cert_dir, args.host)
+    overrides = env_overrides(args.host, args.graph_port, args.google_port, cert_path)
+    if args.env_file:
+        with open(args.env_file, "w") as f:
+            f.write("# Written by python -m benchmarks.load.fakes\n")
+            f.writelines(f"{key}={value}\n" for key, value in overrides.items())
+
+    faults = dict(
+        latency=args.latency_ms / 1000, jitter=args.jitter_ms / 1000, rps_limit=args.rps_limit,
+        retry_after=args.retry_after, error_rate=args.error_rate,
+    )
+    graph_stats, google_stats = Stats(), Stats()
+    servers = [
+        uvicorn.Server(uvicorn.Config(
+            FaultInjection(create_graph_app(graph_stats), graph_stats, exempt=("/_stats", f"/{TENANT_ID}/"), **faults),
+            host=args.host, port=args.graph_port, ssl_certfile=cert_path, ssl_keyfile=key_path, log_level="warning",
+        )),
+        uvicorn.Server(uvicorn.Config(
+            FaultInjection(create_google_app(google_stats), google_stats, exempt=("/_stats", "/token"), **faults),
+            host=args.host, port=args.google_port, log_level="warning",
+        )),
+    ]
+    # One process serves both, so stop them together instead of letting each install its own handlers
+    loop = asyncio.get_running_loop()
+    for server in servers:
+        server.install_signal_handlers = lambda: None
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        loop.add_signal_handler(sig, lambda: [setattr(server, "should_exit", True) for server in servers])
+
+    print(f"Graph stand-in on https://{args.host}:{args.graph_port}, Calendar stand-in on http://{args.host}:{args.google_port}")
+    if args.env_file:
+        print(f"API overrides written to {args.env_file}")
+    await asyncio.gather(*(server.serve() for server in servers))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--graph-port", type=int, default=9443)
+    parser.add_argument("--google-port", type=int, default=9080)
+    parser.add_argument("--latency-ms", type=float, default=50.0, help="added to every API call")
+    parser.add_argument("--jitter-ms", type=float, default=20.0, help="uniform random extra latency")
+    parser.add_argument("--rps-limit", type=float, default=0.0, help="answer 429 above this many calls per second (0 = never)")
+    parser.add_argument("--retry-after", type=int, default=1, help="Retry-After seconds sent with 429s")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="share of calls failing with 503")
+    parser.add_argument("--env-file", default="load.env", help="where to write the API's overrides ('' to skip)")
+    parser.add_argument("--cert-dir", default=tempfile.gettempdir())
+    asyncio.run(serve(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
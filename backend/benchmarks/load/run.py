@@ -0,0 +1,252 @@
+"""Run load scenarios against a running API and report latency percentiles and throughput.
+
+Scenarios (all by default, or pick with --scenario):
+  login_storm         clients log in concurrently (POST /auth/login, bcrypt-bound)
+  dashboard_polling   logged-in clients poll GET /dashboard
+  concurrent_booking  all clients race for the same slot, one slot per round (POST /bookings)
+  bulk_uploads        the admin uploads files to random projects (POST /files, through Graph)
+
+Expects a database filled by benchmarks.load.seed and an API pointed at
+benchmarks.load.fakes. Results can be saved as a baseline; later runs
+compared against it exit non-zero when p95 latency grows or throughput
+drops by more than the tolerance.
+
+    cd backend && python -m benchmarks.load.run --save-baseline benchmarks/load/baseline.json
+    cd backend && python -m benchmarks.load.run --compare benchmarks/load/baseline.json --tolerance 0.2
+"""
+import argparse
+import asyncio
+import json
+import os
+import random
+import statistics
+import sys
+import time
+from collections import Counter
+from typing import Awaitable, Callable, Dict, List, Optional
+import httpx
+from benchmarks.load.seed import ADMIN_EMAIL, LOAD_PASSWORD, client_email
+
+SCENARIOS = ["login_storm", "dashboard_polling", "concurrent_booking", "bulk_uploads"]
+
+
+class Recorder:
+    """Latency and status of every measured request in a scenario"""
+
+    def __init__(self):
+        self.latencies: List[float] = []
+        self.statuses: Counter = Counter()
+        self.started = time.perf_counter()
+        self.finished: Optional[float] = None
+        self.extra: Dict[str, int] = {}
+
+    async def call(self, client: httpx.AsyncClient, method: str, url: str, **kwargs) -> Optional[httpx.Response]:
+        started = time.perf_counter()
+        try:
+            response = await client.request(method, url, **kwargs)
+        except httpx.TransportError:
+            # Counted as status 0: timeouts, refused or reset connections
+            response = None
+        self.latencies.append(time.perf_counter() - started)
+        self.statuses[response.status_code if response is not None else 0] += 1
+        return response
+
+    def summary(self) -> dict:
+        elapsed = (self.finished or time.perf_counter()) - self.started
+        latencies = sorted(self.latencies)
+        # quantiles() needs two samples; a single one is every percentile
+        cuts = statistics.quantiles(latencies, n=100, method="inclusive") if len(latencies) > 1 else latencies * 99
+        return {
+            "requests": len(latencies),
+            "errors": sum(count for status, count in self.statuses.items() if status == 0 or status >= 500),
+            "throughput_rps": round(len(latencies) / elapsed, 1) if elapsed else 0.0,
+            "p50_ms": round(cuts[49] * 1000, 1) if cuts else None,
+            "p95_ms": round(cuts[94] * 1000, 1) if cuts else None,
+            "p99_ms": round(cuts[98] * 1000, 1) if cuts else None,
+            "max_ms": round(latencies[-1] * 1000, 1) if latencies else None,
+            "statuses": {str(status): count for status, count in sorted(self.statuses.items())},
+            **self.extra,
+        }
+
+
+async def run_workers(concurrency: int, duration: float, work: Callable[[int], Awaitable[None]]) -> None:
+    """Call work(worker_index) in a loop from each worker until the duration is over"""
+    deadline = time.perf_counter() + duration
+
+    async def worker(index: int) -> None:
+        while time.perf_counter() < deadline:
+            await work(index)
+
+    await asyncio.gather(*(worker(index) for index in range(concurrency)))
+
+
+async def login(client: httpx.AsyncClient, email: str) -> str:
+    response = await client.post("/auth/login", data={"username": email, "password": LOAD_PASSWORD})
+    response.raise_for_status()
+    return response.json()["access_token"]
+
+
+async def login_clients(client: httpx.AsyncClient, count: int, users: int, rng: random.Random) -> List[str]:
+    """Tokens for distinct random clients (setup, not measured)"""
+    indexes = rng.sample(range(1, users), min(count, users - 1))
+    semaphore = asyncio.Semaphore(20)
+
+    async def one(index: int) -> str:
+        async with semaphore:
+            return await login(client, client_email(index))
+
+    return await asyncio.gather(*(one(index) for index in indexes))
+
+
+def auth(token: str) -> dict:
+    return {"Authorization": f"Bearer {token}"}
+
+
+async def login_storm(client: httpx.AsyncClient, args, rng: random.Random) -> Recorder:
+    recorder = Recorder()
+
+    async def work(_: int) -> None:
+        email = client_email(rng.randrange(1, args.users))
+        await recorder.call(client, "POST", "/auth/login", data={"username": email, "password": LOAD_PASSWORD})
+
+    await run_workers(args.concurrency, args.duration, work)
+    recorder.finished = time.perf_counter()
+    return recorder
+
+
+async def dashboard_polling(client: httpx.AsyncClient, args, rng: random.Random) -> Recorder:
+    tokens = await login_clients(client, args.concurrency, args.users, rng)
+    recorder = Recorder()
+
+    async def work(index: int) -> None:
+        await recorder.call(client, "GET", "/dashboard", headers=auth(tokens[index % len(tokens)]))
+        await asyncio.sleep(args.poll_interval_ms / 1000)
+
+    await run_workers(len(tokens), args.duration, work)
+    recorder.finished = time.perf_counter()
+    return recorder
+
+
+async def concurrent_booking(client: httpx.AsyncClient, args, rng: random.Random) -> Recorder:
+    admin_token = await login(client, ADMIN_EMAIL)
+    response = await client.get("/bookings/slots", headers=auth(admin_token))
+    response.raise_for_status()
+    slot_ids = [slot["id"] for slot in response.json()][:args.booking_rounds]
+    if len(slot_ids) < args.booking_rounds:
+        sys.exit(f"Only {len(slot_ids)} available slots left; seed a fresh database")
+    tokens = await login_clients(client, args.concurrency, args.users, rng)
+
+    recorder = Recorder()
+    double_bookings = 0
+    for slot_id in slot_ids:
+        responses = await asyncio.gather(*(
+            recorder.call(client, "POST", "/bookings", headers=auth(token), json={"slot_id": slot_id, "title": "Load booking"})
+            for token in tokens
+        ))
+        booked = sum(1 for response in responses if response is not None and response.status_code == 201)
+        double_bookings += max(0, booked - 1)
+    recorder.finished = time.perf_counter()
+    # More than one 201 for a slot means the availability check raced
+    recorder.extra["double_bookings"] = double_bookings
+    return recorder
+
+
+async def bulk_uploads(client: httpx.AsyncClient, args, rng: random.Random) -> Recorder:
+    admin_token = await login(client, ADMIN_EMAIL)
+    response = await client.get("/projects", headers=auth(admin_token))
+    response.raise_for_status()
+    project_ids = [project["id"] for project in response.json()]
+    payload = os.urandom(args.upload_kb * 1024)
+    recorder = Recorder()
+
+    async def work(index: int) -> None:
+        name = f"load-{index}-{rng.randrange(10**9)}.pdf"
+        # The same bytes every time exercise UPLOAD_DEDUPE_MODE; distinct ones always transfer
+        content = payload + os.urandom(16) if args.distinct_uploads else payload
+        await recorder.call(
+            client, "POST", "/files",
+            params={"project_id": rng.choice(project_ids), "name": name},
+            files={"file": (name, content, "application/pdf")},
+            headers=auth(admin_token),
+        )
+
+    await run_workers(args.concurrency, args.duration, work)
+    recorder.finished = time.perf_counter()
+    return recorder
+
+
+def compare(results: dict, baseline: dict, tolerance: float) -> List[str]:
+    """Regressions of p95 latency or throughput beyond the tolerance, one line each"""
+    regressions = []
+    for name, result in results.items():
+        base = baseline.get(name)
+        if not base:
+            continue
+        if base["p95_ms"] and result["p95_ms"] > base["p95_ms"] * (1 + tolerance):
+            regressions.append(f"{name}: p95 {result['p95_ms']} ms vs baseline {base['p95_ms']} ms")
+        if result["throughput_rps"] < base["throughput_rps"] * (1 - tolerance):
+            regressions.append(f"{name}: {result['throughput_rps']} req/s vs baseline {base['throughput_rps']} req/s")
+    return regressions
+
+
+def print_table(results: dict) -> None:
+    print(f"{'scenario':<20}{'requests':>10}{'errors':>8}{'req/s':>10}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}")
+    for name, r in results.items():
+        cells = [str(r[key]) for key in ("requests", "errors", "throughput_rps", "p50_ms", "p95_ms", "p99_ms")]
+        print(f"{name:<20}{cells[0]:>10}{cells[1]:>8}" + "".join(f"{cell:>10}" for cell in cells[2:]))
+
+
+async def run(args) -> dict:
+    rng = random.Random(args.seed)
+    scenarios = {name: globals()[name] for name in (SCENARIOS if args.scenario == "all" else [args.scenario])}
+    limits = httpx.Limits(max_connections=args.concurrency * 2, max_keepalive_connections=args.concurrency * 2)
+    results = {}
+    async with httpx.AsyncClient(base_url=args.base_url, timeout=args.timeout, limits=limits) as client:
+        for name, scenario in scenarios.items():
+            print(f"Running {name}...", flush=True)
+            results[name] = (await scenario(client, args, rng)).summary()
+    return results
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--base-url", default="http://127.0.0.1:8000")
+    parser.add_argument("--scenario", choices=["all", *SCENARIOS], default="all")
+    parser.add_argument("--concurrency", type=int, default=50, help="concurrent virtual users")
+    parser.add_argument("--duration", type=float, default=30.0, help="seconds per time-based scenario")
+    parser.add_argument("--users", type=int, default=10_000, help="users created by the seeder")
+    parser.add_argument("--poll-interval-ms", type=float, default=500.0)
+    parser.add_argument("--booking-rounds", type=int, default=20, help="slots raced for, one per round")
+    parser.add_argument("--upload-kb", type=int, default=512)
+    parser.add_argument("--distinct-uploads", action="store_true", help="make every uploaded file's content unique")
+    parser.add_argument("--timeout", type=float, default=60.0)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--output", help="write the results as JSON")
+    parser.add_argument("--save-baseline", help="write the results as the new baseline")
+    parser.add_argument("--compare", help="baseline to compare against")
+    parser.add_argument("--tolerance", type=float, default=0.2, help="allowed relative regression")
+    args = parser.parse_args()
+
+    results = asyncio.run(run(args))
+    print_table(results)
+    print(json.dumps(results, indent=2))
+
+    for path in filter(None, (args.output, args.save_baseline)):
+        with open(path, "w") as f:
+            json.dump(results, f, indent=2)
+
+    status = 0
+    if any(result.get("double_bookings") for result in results.values()):
+        print("FAIL: a slot was booked more than once")
+        status = 1
+    if args.compare:
+        with open(args.compare) as f:
+            regressions = compare(results, json.load(f), args.tolerance)
+        for line in regressions:
+            print(f"REGRESSION: {line}")
+        status = status or int(bool(regressions))
+    return status
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,194 @@
+"""Seed a dedicated database with production-sized data for load tests.
+
+Defaults: 10k users (one admin), 1k projects with 10 members each,
+20 files and 5 recordings per project, 20k requests carrying 1M messages,
+and 5k future availability slots. Rows are inserted in batches through
+SQLAlchemy Core; the search triggers still run on Postgres. Every seeded
+user logs in with LOAD_PASSWORD; the admin is admin@load.test and clients
+are client<n>@load.test.
+
+    cd backend && alembic upgrade head && python -m benchmarks.load.seed
+    cd backend && python -m benchmarks.load.seed --users 1000 --projects 100 --messages 50000  # quick run
+"""
+import argparse
+import random
+import sys
+import time
+from datetime import datetime, timedelta, timezone
+from typing import Iterable, Iterator, List
+from sqlalchemy import func, insert, select
+from app.database import engine
+from app.models.booking import AvailabilitySlot
+from app.models.file import File
+from app.models.project import Project, ProjectStatus, project_users
+from app.models.recording import Recording
+from app.models.request import Request, RequestMessage, RequestStatus, RequestType
+from app.models.user import User, UserRole
+from app.utils.security import get_password_hash
+
+LOAD_PASSWORD = "load-password"
+ADMIN_EMAIL = "admin@load.test"
+EMAIL_DOMAIN = "@load.test"
+
+
+def client_email(index: int) -> str:
+    return f"client{index}{EMAIL_DOMAIN}"
+
+
+def batched(rows: Iterable[dict], size: int) -> Iterator[List[dict]]:
+    batch = []
+    for row in rows:
+        batch.append(row)
+        if len(batch) == size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def insert_rows(conn, table, rows: Iterable[dict], batch_size: int, label: str) -> int:
+    started = time.perf_counter()
+    count = 0
+    for batch in batched(rows, batch_size):
+        conn.execute(insert(table), batch)
+        count += len(batch)
+        print(f"\r  {label}: {count}", end="", flush=True)
+    print(f"\r  {label}: {count} in {time.perf_counter() - started:.1f}s")
+    return count
+
+
+def seed(args) -> None:
+    rng = random.Random(args.seed)
+    now = datetime.now(timezone.utc)
+    # One bcrypt hash for everyone; hashing 10k passwords would dominate the run
+    hashed_password = get_password_hash(LOAD_PASSWORD)
+
+    def past(days: int = 365) -> datetime:
+        return now - timedelta(seconds=rng.randrange(days * 86400))
+
+    with engine.begin() as conn:
+        if conn.execute(select(func.count()).select_from(User).where(User.email.like(f"%{EMAIL_DOMAIN}"))).scalar():
+            sys.exit("Load users already exist; seed a fresh database")
+
+        insert_rows(conn, User.__table__, (
+            {
+                "email": ADMIN_EMAIL if i == 0 else client_email(i),
+                "hashed_password": hashed_password,
+                "full_name": "Load Admin" if i == 0 else f"Load Client {i}",
+                "role": UserRole.ADMIN if i == 0 else UserRole.CLIENT,
+                "is_active": True,
+                "created_at": past(),
+            }
+            for i in range(args.users)
+        ), args.batch_size, "users")
+        user_ids = conn.execute(
+            select(User.id).where(User.email.like(f"%{EMAIL_DOMAIN}")).order_by(User.id)
+        ).scalars().all()
+        admin_id, client_ids = user_ids[0], user_ids[1:]
+
+        statuses = [ProjectStatus.ACTIVE] * 7 + [ProjectStatus.ON_HOLD, ProjectStatus.COMPLETED, ProjectStatus.CANCELLED]
+        insert_rows(conn, Project.__table__, (
+            {
+                "name": f"Load project {i}",
+                "description": f"Seeded project {i} for load tests",
+                "status": rng.choice(statuses),
+                "start_date": past(),
+                "created_at": past(),
+            }
+            for i in range(args.projects)
+        ), args.batch_size, "projects")
+        project_ids = conn.execute(
+            select(Project.id).where(Project.name.like("Load project %")).order_by(Project.id)
+        ).scalars().all()
+
+        members = {project_id: rng.sample(client_ids, min(args.members_per_project, len(client_ids))) for project_id in project_ids}
+        insert_rows(conn, project_users, (
+            {"project_id": project_id, "user_id": user_id}
+            for project_id, user_ids in members.items() for user_id in user_ids
+        ), args.batch_size, "memberships")
+
+        insert_rows(conn, File.__table__, (
+            {
+                "project_id": project_id,
+                "name": f"Document {i}.pdf",
+                "sharepoint_file_id": f"load-file-{project_id}-{i}",
+                "file_size_bytes": rng.randrange(10_000, 5_000_000),
+                "mime_type": "application/pdf",
+                "created_at": past(),
+            }
+            for project_id in project_ids for i in range(args.files_per_project)
+        ), args.batch_size, "files")
+
+        insert_rows(conn, Recording.__table__, (
+            {
+                "project_id": project_id,
+                "title": f"Session {i}",
+                "sharepoint_file_id": f"load-recording-{project_id}-{i}",
+                "duration_seconds": rng.randrange(1800, 7200),
+                "file_size_bytes": rng.randrange(100_000_000, 2_000_000_000),
+                "created_at": past(),
+            }
+            for project_id in project_ids for i in range(args.recordings_per_project)
+        ), args.batch_size, "recordings")
+
+        request_owners = [rng.choice(members[project_ids[i % len(project_ids)]]) for i in range(args.requests)]
+        insert_rows(conn, Request.__table__, (
+            {
+                "user_id": request_owners[i],
+                "project_id": project_ids[i % len(project_ids)],
+                "title": f"Load request {i}",
+                "description": "Seeded request body for load tests",
+                "type": rng.choice(list(RequestType)),
+                "status": rng.choice(list(RequestStatus)),
+                "created_at": past(),
+            }
+            for i in range(args.requests)
+        ), args.batch_size, "requests")
+        request_ids = conn.execute(
+            select(Request.id).where(Request.title.like("Load request %")).order_by(Request.id)
+        ).scalars().all()
+
+        # Threads alternate between the request's author and the admin
+        insert_rows(conn, RequestMessage.__table__, (
+            {
+                "request_id": request_ids[i % len(request_ids)],
+                "user_id": request_owners[i % len(request_ids)] if (i // len(request_ids)) % 2 == 0 else admin_id,
+                "message": f"Seeded message {i} about the delivery schedule and the next review",
+                "created_at": past(),
+            }
+            for i in range(args.messages)
+        ), args.batch_size, "messages")
+
+        first_slot = (now + timedelta(days=1)).replace(minute=0, second=0, microsecond=0)
+        insert_rows(conn, AvailabilitySlot.__table__, (
+            {
+                "start_time": first_slot + timedelta(hours=i),
+                "end_time": first_slot + timedelta(hours=i, minutes=50),
+                "is_available": True,
+            }
+            for i in range(args.slots)
+        ), args.batch_size, "slots")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--users", type=int, default=10_000)
+    parser.add_argument("--projects", type=int, default=1_000)
+    parser.add_argument("--members-per-project", type=int, default=10)
+    parser.add_argument("--files-per-project", type=int, default=20)
+    parser.add_argument("--recordings-per-project", type=int, default=5)
+    parser.add_argument("--requests", type=int, default=20_000)
+    parser.add_argument("--messages", type=int, default=1_000_000)
+    parser.add_argument("--slots", type=int, default=5_000)
+    parser.add_argument("--batch-size", type=int, default=5_000)
+    parser.add_argument("--seed", type=int, default=42, help="random seed, for identical datasets across runs")
+    args = parser.parse_args()
+
+    started = time.perf_counter()
+    print(f"Seeding {engine.url.render_as_string(hide_password=True)}")
+    seed(args)
+    print(f"Done in {time.perf_counter() - started:.1f}s")
+
+
+if __name__ == "__main__":
+    main()
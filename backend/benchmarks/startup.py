@@ -0,0 +1,100 @@
+"""Measure worker startup: import time of app.main and time to first request.
+
+Each run starts a fresh interpreter, so module caches don't carry over.
+Import time is measured in-process around `import app.main`; time to
+first request spawns uvicorn and polls /health/live until it answers.
+Uses DATABASE_URL and the rest of the environment as the server would.
+Exits non-zero if the median time to first request exceeds the budget.
+
+    cd backend && python -m benchmarks.startup --runs 5
+    cd backend && python -m benchmarks.startup --create-all  # compare with create_all at startup
+"""
+import argparse
+import json
+import os
+import socket
+import statistics
+import subprocess
+import sys
+import time
+import httpx
+
+IMPORT_SNIPPET = """
+import sys, time
+started = time.perf_counter()
+import app.main
+elapsed = time.perf_counter() - started
+heavy = sorted(name for name in ("msal", "opentelemetry", "google") if name in sys.modules)
+print(elapsed, ",".join(heavy))
+"""
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def measure_import(env: dict) -> tuple:
+    output = subprocess.run(
+        [sys.executable, "-c", IMPORT_SNIPPET], env=env, capture_output=True, text=True, check=True
+    ).stdout.split()
+    return float(output[0]), output[1] if len(output) > 1 else ""
+
+
+def measure_first_request(env: dict, timeout: float) -> float:
+    port = free_port()
+    started = time.perf_counter()
+    server = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "app.main:app", "--port", str(port), "--log-level", "warning"],
+        env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
+    )
+    try:
+        with httpx.Client() as client:
+            while time.perf_counter() - started < timeout:
+                try:
+                    if client.get(f"http://127.0.0.1:{port}/health/live").status_code == 200:
+                        return time.perf_counter() - started
+                except httpx.TransportError:
+                    pass
+                time.sleep(0.005)
+        raise RuntimeError(f"Server did not answer within {timeout}s")
+    finally:
+        server.terminate()
+        server.wait()
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--create-all", action="store_true", help="run Base.metadata.create_all at startup")
+    parser.add_argument("--timeout", type=float, default=30.0)
+    parser.add_argument("--budget-ms", type=float, default=3000.0, help="maximum tolerated median time to first request")
+    args = parser.parse_args()
+
+    env = {**os.environ, "DB_CREATE_ALL": "true" if args.create_all else "false"}
+    imports, first_requests, heavy = [], [], ""
+    for _ in range(args.runs):
+        elapsed, heavy = measure_import(env)
+        imports.append(elapsed)
+        first_requests.append(measure_first_request(env, args.timeout))
+
+    result = {
+        "runs": args.runs,
+        "create_all": args.create_all,
+        "import_median_ms": round(statistics.median(imports) * 1000, 1),
+        "import_max_ms": round(max(imports) * 1000, 1),
+        "first_request_median_ms": round(statistics.median(first_requests) * 1000, 1),
+        "first_request_max_ms": round(max(first_requests) * 1000, 1),
+        "integration_sdks_imported": heavy.split(",") if heavy else [],
+    }
+    print(json.dumps(result, indent=2))
+
+    if result["first_request_median_ms"] > args.budget_ms:
+        print(f"FAIL: first request after {result['first_request_median_ms']} ms (budget {args.budget_ms} ms)")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
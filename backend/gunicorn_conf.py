@@ -0,0 +1,56 @@
+"""Production server: gunicorn managing uvicorn workers.
+
+    gunicorn -c gunicorn_conf.py app.main:app
+
+Every value comes from Settings (environment / .env).
+"""
+import glob
+import os
+import tempfile
+from app.config import settings
+from app.server import worker_count
+
+# Metrics from all workers are aggregated through this directory (see app/utils/metrics.py);
+# it must be set before the app, and with it prometheus_client, is preloaded
+os.environ.setdefault("PROMETHEUS_MULTIPROC_DIR", os.path.join(tempfile.gettempdir(), "blink_prometheus"))
+os.makedirs(os.environ["PROMETHEUS_MULTIPROC_DIR"], exist_ok=True)
+
+bind = f"{settings.SERVER_HOST}:{settings.SERVER_PORT}"
+workers = worker_count()
+worker_class = "app.server.UvicornWorker"
+
+# Import the app once in the master: workers fork ready to serve and share its memory pages
+preload_app = True
+
+keepalive = settings.SERVER_KEEPALIVE_SECONDS
+backlog = settings.SERVER_BACKLOG
+timeout = settings.SERVER_TIMEOUT_SECONDS
+# Leaves uvicorn time to cancel leftover requests and run the lifespan shutdown before SIGKILL
+graceful_timeout = settings.SERVER_GRACEFUL_TIMEOUT_SECONDS + 15
+max_requests = settings.SERVER_MAX_REQUESTS
+max_requests_jitter = settings.SERVER_MAX_REQUESTS // 10
+forwarded_allow_ips = settings.SERVER_FORWARDED_ALLOW_IPS
+
+accesslog = "-"
+errorlog = "-"
+
+
+def on_starting(server):
+    # Samples left by a previous run would otherwise be added to this one's
+    # (workers open their own files after the fork)
+    path = os.environ["PROMETHEUS_MULTIPROC_DIR"]
+    for sample_file in glob.glob(os.path.join(path, "*.db")):
+        os.remove(sample_file)
+
+
+def post_fork(server, worker):
+    from app.database import engine
+
+    # Never reuse pooled connections inherited from the master
+    engine.dispose(close=False)
+
+
+def child_exit(server, worker):
+    from prometheus_client import multiprocess
+
+    multiprocess.mark_process_dead(worker.pid)
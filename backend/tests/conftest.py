@@ -0,0 +1,42 @@
+import os
+import tempfile
+
+# Before any app import: the engine is created from this at import time
+os.environ["DATABASE_URL"] = f"sqlite:///{tempfile.mkdtemp()}/test.db"
+os.environ.setdefault("RATE_LIMIT_ENABLED", "false")
+
+import pytest
+from fastapi.testclient import TestClient
+from app.database import Base, SessionLocal, engine
+from app.main import app
+from app.models.user import User, UserRole
+from app.utils.security import create_access_token
+
+
+@pytest.fixture
+def db():
+    Base.metadata.create_all(bind=engine)
+    session = SessionLocal()
+    try:
+        yield session
+    finally:
+        session.close()
+        Base.metadata.drop_all(bind=engine)
+
+
+@pytest.fixture
+def client():
+    return TestClient(app)
+
+
+@pytest.fixture
+def admin(db):
+    user = User(email="admin@test.com", hashed_password="x", full_name="Test Admin", role=UserRole.ADMIN)
+    db.add(user)
+    db.commit()
+    return user
+
+
+@pytest.fixture
+def admin_headers(admin):
+    return {"Authorization": f"Bearer {create_access_token(data={'sub': str(admin.id)})}"}
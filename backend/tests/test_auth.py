@@ -0,0 +1,18 @@
+def test_import_users_creates_new_and_skips_registered(db, client, admin, admin_headers):
+    rows = [
+        {"email": admin.email, "full_name": "Already There"},
+        {"email": "client@test.com", "full_name": "With Password", "password": "s3cret-pass"},
+        {"email": "invited@test.com", "full_name": "Invited"},
+    ]
+    response = client.post("/auth/import", json=rows, headers=admin_headers)
+
+    assert response.status_code == 201
+    body = response.json()
+    created = {user["email"]: user for user in body["created"]}
+    assert set(created) == {"client@test.com", "invited@test.com"}
+    assert created["client@test.com"]["invite_token"] is None
+    assert created["invited@test.com"]["invite_token"]
+    assert [(s["row"], s["reason"]) for s in body["skipped"]] == [(1, "Email already registered")]
+
+    login = client.post("/auth/login", data={"username": "client@test.com", "password": "s3cret-pass"})
+    assert login.status_code == 200
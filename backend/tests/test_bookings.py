@@ -0,0 +1,53 @@
+from datetime import datetime, timedelta, timezone
+from app.models.booking import AvailabilitySlot, Booking, BookingStatus
+from app.services.google_calendar import google_calendar_service
+
+
+def _booking(db, user_id, start, event_id):
+    slot = AvailabilitySlot(start_time=start, end_time=start + timedelta(hours=1), is_available=False)
+    db.add(slot)
+    db.flush()
+    booking = Booking(
+        user_id=user_id, slot_id=slot.id, title="Meeting", start_time=slot.start_time,
+        end_time=slot.end_time, status=BookingStatus.CONFIRMED, google_event_id=event_id
+    )
+    db.add(booking)
+    return booking, slot
+
+
+def test_bulk_reschedule_leaves_bookings_whose_event_failed(db, client, admin, admin_headers, monkeypatch):
+    start = datetime.now(timezone.utc).replace(microsecond=0) + timedelta(days=1)
+    moved, moved_from = _booking(db, admin.id, start, "evt-ok")
+    kept, kept_from = _booking(db, admin.id, start + timedelta(hours=2), "evt-fail")
+    targets = [
+        AvailabilitySlot(start_time=start + timedelta(days=1, hours=h), end_time=start + timedelta(days=1, hours=h + 1))
+        for h in range(2)
+    ]
+    db.add_all(targets)
+    db.commit()
+
+    async def reschedule_events(changes):
+        return {"evt-ok": None, "evt-fail": "Failed to update calendar event: 503 Backend Error"}
+
+    monkeypatch.setattr(google_calendar_service, "reschedule_events", reschedule_events)
+    response = client.post(
+        "/bookings/bulk-reschedule",
+        json={"items": [
+            {"booking_id": moved.id, "slot_id": targets[0].id},
+            {"booking_id": kept.id, "slot_id": targets[1].id},
+        ]},
+        headers=admin_headers
+    )
+
+    assert response.status_code == 200
+    results = {item["booking_id"]: item for item in response.json()["results"]}
+    assert results[moved.id]["success"] is True
+    assert results[kept.id]["success"] is False
+    assert "503" in results[kept.id]["calendar_error"]
+
+    db.expire_all()
+    assert db.get(Booking, moved.id).slot_id == targets[0].id
+    assert db.get(AvailabilitySlot, moved_from.id).is_available is True
+    assert db.get(Booking, kept.id).slot_id == kept_from.id
+    assert db.get(AvailabilitySlot, kept_from.id).is_available is False
+    assert db.get(AvailabilitySlot, targets[1].id).is_available is True
@@ -0,0 +1,38 @@
+from app.models.dashboard import ProjectSummary
+from app.models.file import File
+from app.models.project import Project
+from app.models.request import Request, RequestStatus, RequestType
+from app.services.dashboard import COUNTERS, dashboard_service
+
+
+def _counters(db, project_id):
+    db.expire_all()
+    summary = db.get(ProjectSummary, project_id)
+    return {counter: getattr(summary, counter) for counter in COUNTERS}
+
+
+def test_summary_deltas_match_a_rebuild(db, admin):
+    first, second = Project(name="First"), Project(name="Second")
+    db.add_all([first, second])
+    db.commit()
+
+    files = [File(project_id=first.id, name=f"File {i}", file_size_bytes=100 * (i + 1)) for i in range(3)]
+    request = Request(user_id=admin.id, project_id=first.id, title="Help", description="d", type=RequestType.QUESTION)
+    db.add_all([*files, request])
+    db.commit()
+
+    # Attributes are expired after each commit: the old values must still be taken back
+    request.status = RequestStatus.IN_PROGRESS
+    files[0].project_id = second.id
+    files[1].file_size_bytes = 50
+    db.delete(files[2])
+    db.commit()
+
+    incremental = {project.id: _counters(db, project.id) for project in (first, second)}
+    dashboard_service.rebuild(db)
+    db.commit()
+    assert incremental == {project.id: _counters(db, project.id) for project in (first, second)}
+    assert incremental[first.id] == {
+        "file_count": 1, "recording_count": 0, "total_bytes": 50,
+        "open_request_count": 0, "in_progress_request_count": 1,
+    }
@@ -0,0 +1,22 @@
+from app.models.project import Project
+from app.services.sharepoint import sharepoint_service
+
+
+def test_delete_project_skips_sharepoint_when_not_configured(db, client, admin_headers, monkeypatch):
+    project = Project(name="Old project")
+    db.add(project)
+    db.commit()
+    project_id = project.id
+    deleted = []
+
+    async def delete_project_folders(project_id):
+        deleted.append(project_id)
+
+    monkeypatch.setattr(sharepoint_service, "is_configured", lambda: False)
+    monkeypatch.setattr(sharepoint_service, "delete_project_folders", delete_project_folders)
+    response = client.delete(f"/projects/{project_id}", headers=admin_headers)
+
+    assert response.status_code == 204
+    assert deleted == []
+    db.expunge_all()
+    assert db.get(Project, project_id) is None
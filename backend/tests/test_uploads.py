@@ -0,0 +1,42 @@
+from app.models.file import File
+from app.models.project import Project
+from app.models.user import User, UserRole
+from app.services.sharepoint import sharepoint_service
+from app.utils.security import create_access_token
+
+
+def test_idempotency_keys_are_scoped_to_the_uploader(db, client, admin, admin_headers, monkeypatch):
+    other = User(email="other-admin@test.com", hashed_password="x", full_name="Other Admin", role=UserRole.ADMIN)
+    project = Project(name="Uploads")
+    db.add_all([other, project])
+    db.commit()
+    other_headers = {"Authorization": f"Bearer {create_access_token(data={'sub': str(other.id)})}"}
+    uploaded = []
+
+    async def upload_file(file_content, file_name, folder_path):
+        uploaded.append(file_name)
+        return {"id": f"item-{len(uploaded)}", "webUrl": f"https://sharepoint.test/{len(uploaded)}"}
+
+    monkeypatch.setattr(sharepoint_service, "upload_file", upload_file)
+
+    def upload(headers, content):
+        return client.post(
+            "/files",
+            params={"project_id": project.id, "name": "Report"},
+            files={"file": ("report.pdf", content, "application/pdf")},
+            headers={**headers, "Idempotency-Key": "same-key"}
+        )
+
+    first = upload(admin_headers, b"first")
+    replay = upload(admin_headers, b"first")
+    other_user = upload(other_headers, b"second")
+
+    assert first.status_code == 201
+    assert replay.status_code == 201
+    assert replay.headers["Idempotent-Replayed"] == "true"
+    assert replay.json()["id"] == first.json()["id"]
+    assert other_user.status_code == 201
+    assert "Idempotent-Replayed" not in other_user.headers
+    assert other_user.json()["id"] != first.json()["id"]
+    assert len(uploaded) == 2
+    assert db.query(File).filter(File.idempotency_key == "same-key").count() == 2